@@ -0,0 +1,191 @@
+import json
+import sqlite3
+import colorsys
+import threading
+from datetime import datetime
+
+
+class AlmacenPaletas:
+    """Favoritos e historial de paletas en una base SQLite local
+
+    Sustituye a las listas ``favoritos``, ``historial_paletas`` e
+    ``historial_temas`` de config.json: añadir una paleta es un INSERT y
+    las consultas por tema, fecha o tono dominante usan índices.
+    """
+
+    def __init__(self, ruta_db):
+        self.ruta_db = ruta_db
+        self._lock = threading.Lock()
+        self.conexion = sqlite3.connect(ruta_db, check_same_thread=False)
+        self.conexion.row_factory = sqlite3.Row
+        # WAL permite leer desde la GUI mientras la CLI escribe
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self._crear_esquema()
+
+    def _crear_esquema(self):
+        with self._lock, self.conexion:
+            self.conexion.executescript("""
+                CREATE TABLE IF NOT EXISTS paletas (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tipo TEXT NOT NULL,
+                    tema TEXT,
+                    estilo TEXT,
+                    fecha TEXT NOT NULL,
+                    tono_dominante INTEGER,
+                    num_colores INTEGER,
+                    datos TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_paletas_tema ON paletas (tipo, tema);
+                CREATE INDEX IF NOT EXISTS idx_paletas_fecha ON paletas (tipo, fecha);
+                CREATE INDEX IF NOT EXISTS idx_paletas_tono ON paletas (tipo, tono_dominante);
+
+                CREATE TABLE IF NOT EXISTS historial_temas (
+                    tema TEXT PRIMARY KEY,
+                    fecha TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_temas_fecha ON historial_temas (fecha);
+            """)
+
+    # ===== PALETAS =====
+
+    @staticmethod
+    def tono_dominante(paleta_data):
+        """Tono (0-359) del color con más peso, o del más saturado si no hay pesos"""
+        colores = paleta_data.get('colores') or []
+        if not colores:
+            return None
+
+        def peso(color):
+            if 'porcentaje' in color:
+                return color['porcentaje']
+            r, g, b = [c / 255 for c in color['rgb']]
+            _, _, s = colorsys.rgb_to_hls(r, g, b)
+            return s
+
+        r, g, b = [c / 255 for c in max(colores, key=peso)['rgb']]
+        h, _, _ = colorsys.rgb_to_hls(r, g, b)
+        return int(round(h * 360)) % 360
+
+    def _agregar(self, tipo, paleta_data):
+        fila = (
+            tipo,
+            paleta_data.get('tema'),
+            paleta_data.get('estilo'),
+            paleta_data.get('timestamp') or datetime.now().isoformat(),
+            self.tono_dominante(paleta_data),
+            len(paleta_data.get('colores') or []),
+            json.dumps(paleta_data, ensure_ascii=False)
+        )
+        with self._lock, self.conexion:
+            cursor = self.conexion.execute(
+                "INSERT INTO paletas (tipo, tema, estilo, fecha, tono_dominante, num_colores, datos) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", fila)
+            return cursor.lastrowid
+
+    def agregar_favorito(self, paleta_data):
+        """Añade una paleta a favoritos y devuelve su id"""
+        return self._agregar('favorito', paleta_data)
+
+    def agregar_historial(self, paleta_data):
+        """Añade una paleta al historial y devuelve su id"""
+        return self._agregar('historial', paleta_data)
+
+    def contar(self, tipo):
+        with self._lock:
+            return self.conexion.execute(
+                "SELECT COUNT(*) FROM paletas WHERE tipo = ?", (tipo,)).fetchone()[0]
+
+    def _consultar(self, sql, parametros):
+        # El id va aparte: dentro de la paleta se guardaría con ella si se
+        # vuelve a añadir (p. ej. al marcar como favorita una del historial)
+        with self._lock:
+            filas = self.conexion.execute(sql, parametros).fetchall()
+        return [(fila['id'], json.loads(fila['datos'])) for fila in filas]
+
+    def listar(self, tipo, limite=50, desplazamiento=0):
+        """Paletas de un tipo de la más reciente a la más antigua
+
+        Esta consulta y las de búsqueda devuelven ``[(id, paleta_data), ...]``.
+        """
+        return self._consultar(
+            "SELECT id, datos FROM paletas WHERE tipo = ? ORDER BY fecha DESC, id DESC "
+            "LIMIT ? OFFSET ?", (tipo, limite, desplazamiento))
+
+    def buscar_por_tema(self, tipo, tema, limite=50):
+        """Paletas cuyo tema empieza por ``tema``"""
+        return self._consultar(
+            "SELECT id, datos FROM paletas WHERE tipo = ? AND tema >= ? AND tema < ? "
+            "ORDER BY tema LIMIT ?", (tipo, tema, tema + '\uffff', limite))
+
+    def buscar_por_tono(self, tipo, tono_min, tono_max, limite=50):
+        """Paletas cuyo tono dominante está en [tono_min, tono_max] grados"""
+        return self._consultar(
+            "SELECT id, datos FROM paletas WHERE tipo = ? AND tono_dominante BETWEEN ? AND ? "
+            "ORDER BY tono_dominante LIMIT ?", (tipo, tono_min, tono_max, limite))
+
+    def iterar_todas(self, bloque=1000):
+        """Recorre todas las paletas como ``(tipo, id, tema, paleta_data)``
+
+        Lee de ``bloque`` en ``bloque`` filas paginando por id, así que la
+        memoria no crece con la biblioteca y el lock no se retiene mientras
+        quien itera procesa cada bloque.
+        """
+        ultimo = -1
+        while True:
+            with self._lock:
+                filas = self.conexion.execute(
+                    "SELECT id, tipo, tema, datos FROM paletas WHERE id > ? ORDER BY id LIMIT ?",
+                    (ultimo, bloque)).fetchall()
+            if not filas:
+                return
+            ultimo = filas[-1]['id']
+            for fila in filas:
+                yield fila['tipo'], fila['id'], fila['tema'], json.loads(fila['datos'])
+
+    def eliminar(self, id_paleta):
+        with self._lock, self.conexion:
+            return self.conexion.execute("DELETE FROM paletas WHERE id = ?",
+                                         (id_paleta,)).rowcount > 0
+
+    # ===== TEMAS =====
+
+    def registrar_tema(self, tema):
+        """Guarda (o refresca) un tema en el historial"""
+        with self._lock, self.conexion:
+            self.conexion.execute(
+                "INSERT INTO historial_temas (tema, fecha) VALUES (?, ?) "
+                "ON CONFLICT(tema) DO UPDATE SET fecha = excluded.fecha",
+                (tema, datetime.now().isoformat()))
+
+    def temas_recientes(self, limite=20):
+        with self._lock:
+            filas = self.conexion.execute(
+                "SELECT tema FROM historial_temas ORDER BY fecha DESC LIMIT ?", (limite,)).fetchall()
+        return [fila['tema'] for fila in filas]
+
+    # ===== MIGRACIÓN =====
+
+    def migrar_desde_config(self, config):
+        """Mueve las listas antiguas de config.json a la base y las quita del dict
+
+        Devuelve True si ``config`` tenía alguna de esas claves.
+        """
+        habia_listas = any(clave in config for clave in ('favoritos', 'historial_paletas',
+                                                          'historial_temas'))
+        favoritos = config.pop('favoritos', None) or []
+        historial = config.pop('historial_paletas', None) or []
+        temas = config.pop('historial_temas', None) or []
+
+        for paleta_data in favoritos:
+            self.agregar_favorito(paleta_data)
+        for paleta_data in historial:
+            self.agregar_historial(paleta_data)
+        for tema in temas:
+            self.registrar_tema(tema)
+
+        return habia_listas
+
+    def cerrar(self):
+        with self._lock:
+            self.conexion.close()
@@ -0,0 +1,166 @@
+import numpy as np
+
+from espacio_color import rgb_a_lab, hex_a_rgb
+from paleta import Paleta, ColeccionPaletas
+
+# Umbrales de brillo (media de R, G y B) para el balance tonal
+UMBRAL_CLARO = 150
+UMBRAL_OSCURO = 80
+
+# Umbrales de la variedad cromática (diferencia RGB media entre pares)
+UMBRAL_VARIEDAD_ALTA = 200
+UMBRAL_VARIEDAD_MEDIA = 100
+
+# Paletas por bloque en el análisis por lotes, para acotar la memoria de
+# las matrices de pares (bloque x N x N x 3)
+TAMANO_BLOQUE = 4096
+
+
+def _rgb_color(color):
+    if isinstance(color, dict):
+        return color['rgb'] if 'rgb' in color else hex_a_rgb(color['hex'])
+    if isinstance(color, str):
+        return hex_a_rgb(color)
+    return color
+
+
+def a_matriz(paleta_data):
+    """Colores de una paleta (dict con 'colores', lista o ``Paleta``) como array (N x 3) uint8"""
+    if isinstance(paleta_data, Paleta):
+        return paleta_data.rgb
+    colores = (paleta_data.get('colores') or []) if isinstance(paleta_data, dict) else paleta_data
+    return np.array([_rgb_color(color) for color in colores], dtype=np.uint8).reshape(-1, 3)
+
+
+def a_lote(paletas):
+    """Varias paletas como array (M x N x 3) y máscara (M x N) de colores válidos
+
+    N es el número de colores de la paleta más larga; las posiciones sobrantes
+    quedan a cero y fuera de la máscara.
+    """
+    matrices = [a_matriz(paleta) for paleta in paletas]
+    max_colores = max((len(m) for m in matrices), default=0)
+    rgb = np.zeros((len(matrices), max_colores, 3), dtype=np.uint8)
+    mascara = np.zeros((len(matrices), max_colores), dtype=bool)
+    for i, matriz in enumerate(matrices):
+        rgb[i, :len(matriz)] = matriz
+        mascara[i, :len(matriz)] = True
+    return rgb, mascara
+
+
+def _analizar_bloque(rgb, mascara):
+    """Métricas de un bloque (M x N x 3) ya convertido a float32"""
+    validos = mascara.sum(axis=1)
+    divisor = np.maximum(validos, 1)
+
+    # Saturación HSV de cada color, en %
+    maximo = rgb.max(axis=-1)
+    minimo = rgb.min(axis=-1)
+    saturacion = np.divide((maximo - minimo) * 100, maximo,
+                           out=np.zeros_like(maximo), where=maximo > 0)
+    saturacion_media = (saturacion * mascara).sum(axis=1) / divisor
+
+    # Balance tonal por brillo medio
+    brillo = rgb.mean(axis=-1)
+    claros = ((brillo > UMBRAL_CLARO) & mascara).sum(axis=1)
+    oscuros = ((brillo < UMBRAL_OSCURO) & mascara).sum(axis=1)
+    medios = validos - claros - oscuros
+
+    # Rango por canal ignorando las posiciones vacías
+    rango_min = np.where(mascara[..., None], rgb, 255).min(axis=1, initial=255)
+    rango_max = np.where(mascara[..., None], rgb, 0).max(axis=1, initial=0)
+
+    # Pares i < j de colores válidos
+    num_colores = rgb.shape[1]
+    superior = np.triu(np.ones((num_colores, num_colores), dtype=bool), k=1)
+    pares = mascara[:, :, None] & mascara[:, None, :] & superior
+    num_pares = pares.sum(axis=(1, 2))
+    divisor_pares = np.maximum(num_pares, 1)
+
+    diferencia_rgb = np.abs(rgb[:, :, None, :] - rgb[:, None, :, :]).sum(axis=-1)
+    variedad = (diferencia_rgb * pares).sum(axis=(1, 2)) / divisor_pares
+
+    lab = rgb_a_lab(rgb)
+    delta_e = np.sqrt(((lab[:, :, None, :] - lab[:, None, :, :]) ** 2).sum(axis=-1))
+    delta_e_medio = (delta_e * pares).sum(axis=(1, 2)) / divisor_pares
+    delta_e_minimo = np.where(pares, delta_e, np.inf).min(axis=(1, 2), initial=np.inf)
+    delta_e_minimo[num_pares == 0] = 0
+
+    return {
+        'num_colores': validos,
+        'saturacion_media': saturacion_media,
+        'claros': claros,
+        'medios': medios,
+        'oscuros': oscuros,
+        'rango_min': rango_min.astype(np.uint8),
+        'rango_max': rango_max.astype(np.uint8),
+        'variedad_rgb': variedad,
+        'delta_e_medio': delta_e_medio,
+        'delta_e_minimo': delta_e_minimo,
+        'delta_e': delta_e,
+    }
+
+
+def analizar(rgb, mascara=None):
+    """Calcula todas las métricas de una paleta (N x 3) o de un lote (M x N x 3)
+
+    Devuelve un dict de arrays: ``saturacion_media`` (%), ``claros``,
+    ``medios``, ``oscuros``, ``rango_min`` y ``rango_max`` por canal,
+    ``variedad_rgb`` (diferencia RGB media entre pares), ``delta_e_medio``,
+    ``delta_e_minimo`` y la matriz ``delta_e`` de pares (N x N). Con una sola
+    paleta se quita la dimensión del lote. ``mascara`` (M x N) marca los
+    colores válidos de cada paleta del lote; por defecto todos.
+    """
+    rgb = np.asarray(rgb)
+    individual = rgb.ndim == 2
+    if individual:
+        rgb = rgb[None]
+    if mascara is None:
+        mascara = np.ones(rgb.shape[:2], dtype=bool)
+    elif individual:
+        mascara = np.asarray(mascara)[None]
+
+    rgb = rgb.astype(np.float32)
+    if len(rgb) <= TAMANO_BLOQUE:
+        resultado = _analizar_bloque(rgb, mascara)
+    else:
+        bloques = [_analizar_bloque(rgb[i:i + TAMANO_BLOQUE], mascara[i:i + TAMANO_BLOQUE])
+                   for i in range(0, len(rgb), TAMANO_BLOQUE)]
+        resultado = {clave: np.concatenate([bloque[clave] for bloque in bloques])
+                     for clave in bloques[0]}
+
+    if individual:
+        resultado = {clave: valor[0] for clave, valor in resultado.items()}
+    return resultado
+
+
+def analizar_paletas(paletas):
+    """Analiza una lista de paletas (dicts o ``Paleta``) o una ``ColeccionPaletas`` en una sola llamada"""
+    if isinstance(paletas, ColeccionPaletas):
+        rgb, mascara = paletas.a_lote()
+    else:
+        rgb, mascara = a_lote(paletas)
+    return analizar(rgb, mascara)
+
+
+# ===== TEXTOS PARA LA INTERFAZ =====
+
+def describir_rango(metricas):
+    minimo, maximo = metricas['rango_min'], metricas['rango_max']
+    return (f"R({minimo[0]}-{maximo[0]}), G({minimo[1]}-{maximo[1]}), "
+            f"B({minimo[2]}-{maximo[2]})")
+
+
+def describir_balance(metricas):
+    return f"Claros: {metricas['claros']}, Medios: {metricas['medios']}, Oscuros: {metricas['oscuros']}"
+
+
+def describir_variedad(metricas):
+    if metricas['num_colores'] < 2:
+        return "Mínima (solo un color)"
+    if metricas['variedad_rgb'] > UMBRAL_VARIEDAD_ALTA:
+        return "Alta (colores muy distintos)"
+    elif metricas['variedad_rgb'] > UMBRAL_VARIEDAD_MEDIA:
+        return "Media (buen contraste)"
+    else:
+        return "Baja (colores similares)"
@@ -0,0 +1,118 @@
+import os
+from datetime import datetime
+
+import numpy as np
+from PIL import Image
+
+from nombres_color import obtener_nombrador
+
+
+class AnalizadorImagen:
+    """Extrae la paleta dominante de una imagen con K-means sobre una muestra de píxeles
+
+    La imagen se reduce antes de decodificarla por completo (``draft`` en JPEG)
+    y nunca se procesan más de ``lado_maximo``² píxeles, así que el coste y la
+    memoria no dependen del tamaño original.
+    """
+
+    def __init__(self, num_colores=6, lado_maximo=256, max_muestras=20000, semilla=0):
+        self.num_colores = num_colores
+        self.lado_maximo = lado_maximo
+        self.max_muestras = max_muestras
+        self.semilla = semilla
+
+    def cargar_pixeles(self, imagen):
+        """Devuelve los píxeles RGB reducidos como array (N x 3) de uint8"""
+        if not isinstance(imagen, Image.Image):
+            imagen = Image.open(imagen)
+
+        # En JPEG el decodificador escala por potencias de 2 sin leer la
+        # imagen completa; en el resto de formatos no tiene efecto
+        imagen.draft('RGB', (self.lado_maximo, self.lado_maximo))
+        imagen = imagen.convert('RGB')
+        imagen.thumbnail((self.lado_maximo, self.lado_maximo), Image.Resampling.BILINEAR,
+                         reducing_gap=2.0)
+
+        return np.asarray(imagen, dtype=np.uint8).reshape(-1, 3)
+
+    def _muestrear(self, pixeles, rng):
+        if len(pixeles) <= self.max_muestras:
+            return pixeles
+        indices = rng.choice(len(pixeles), self.max_muestras, replace=False)
+        return pixeles[indices]
+
+    def _agrupar(self, muestra, num_colores, rng):
+        """Calcula los centros con MiniBatchKMeans o, si no hay sklearn, con NumPy"""
+        try:
+            from sklearn.cluster import MiniBatchKMeans
+        except ImportError:
+            return self._kmeans_numpy(muestra, num_colores, rng)
+
+        modelo = MiniBatchKMeans(n_clusters=num_colores, batch_size=2048, n_init=3,
+                                 random_state=self.semilla)
+        modelo.fit(muestra)
+        return modelo.cluster_centers_
+
+    @staticmethod
+    def _asignar(pixeles, centros):
+        """Índice del centro más cercano para cada píxel (||x||² - 2x·c + ||c||²)"""
+        distancias = (-2.0 * pixeles @ centros.T) + (centros ** 2).sum(axis=1)
+        return distancias.argmin(axis=1)
+
+    def _kmeans_numpy(self, muestra, num_colores, rng, iteraciones=20):
+        centros = muestra[rng.choice(len(muestra), num_colores, replace=False)].copy()
+        for _ in range(iteraciones):
+            etiquetas = self._asignar(muestra, centros)
+            nuevos = centros.copy()
+            for k in range(num_colores):
+                miembros = muestra[etiquetas == k]
+                if len(miembros):
+                    nuevos[k] = miembros.mean(axis=0)
+            if np.allclose(nuevos, centros):
+                break
+            centros = nuevos
+        return centros
+
+    def extraer_colores(self, imagen, num_colores=None):
+        """Devuelve los colores dominantes ordenados por proporción de píxeles"""
+        num_colores = num_colores or self.num_colores
+        rng = np.random.default_rng(self.semilla)
+
+        pixeles = self.cargar_pixeles(imagen).astype(np.float32)
+        muestra = self._muestrear(pixeles, rng)
+
+        # No se pueden pedir más grupos que colores distintos haya en la
+        # muestra (que cubre toda la imagen, no solo sus primeras filas)
+        num_colores = max(1, min(num_colores, len(np.unique(muestra, axis=0))))
+        centros = np.asarray(self._agrupar(muestra, num_colores, rng), dtype=np.float32)
+
+        # El peso de cada grupo se mide sobre todos los píxeles reducidos
+        conteos = np.bincount(self._asignar(pixeles, centros), minlength=len(centros))
+        orden = np.argsort(conteos)[::-1]
+        total = int(conteos.sum())
+
+        centros_rgb = np.clip(np.rint(centros), 0, 255).astype(np.uint8)
+        nombres = obtener_nombrador().nombrar(centros_rgb)
+
+        colores = []
+        for k in orden:
+            if conteos[k] == 0:
+                continue
+            rgb = [int(v) for v in centros_rgb[k]]
+            colores.append({
+                'hex': '#{:02x}{:02x}{:02x}'.format(*rgb),
+                'rgb': rgb,
+                'nombre': nombres[k],
+                'porcentaje': round(int(conteos[k]) / total * 100, 2)
+            })
+        return colores
+
+    def analizar(self, ruta_imagen, num_colores=None):
+        """Genera una paleta completa a partir de una imagen"""
+        return {
+            'tema': os.path.splitext(os.path.basename(ruta_imagen))[0],
+            'estilo': 'imagen',
+            'origen': ruta_imagen,
+            'colores': self.extraer_colores(ruta_imagen, num_colores),
+            'timestamp': datetime.now().isoformat()
+        }
@@ -1,15 +1,35 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
-from PIL import Image, ImageTk
 import json
 import os
-from datetime import datetime
-from src.generador_paletas import GeneradorPaletasIA
-from src.utils import guardar_datos_paleta, generar_texto_redes_sociales
+import queue
 import threading
+from datetime import datetime
 from app_config import AppConfig
+from cache_paletas import CachePaletas
+from cache_miniaturas import CacheMiniaturas
+from planificador_tareas import PlanificadorTareas
+from carga_diferida import modulo_diferido, objeto_diferido
+from widgets_paleta import (LienzoPaleta, RejillaColores, PanelTexto, ExploradorPaletas,
+                            FONDO_OSCURO, FONDO_CLARO)
+
+# Módulos pesados (PIL, NumPy, sklearn, el generador): se importan la primera
+# vez que se usan para que la ventana aparezca cuanto antes
+Image = modulo_diferido('PIL.Image')
+ImageTk = modulo_diferido('PIL.ImageTk')
+analisis_paletas = modulo_diferido('analisis_paletas')
+GeneradorPaletasIA = objeto_diferido('src.generador_paletas', 'GeneradorPaletasIA')
+AnalizadorImagen = objeto_diferido('analizador_imagen', 'AnalizadorImagen')
+guardar_datos_paleta = objeto_diferido('src.utils', 'guardar_datos_paleta')
+generar_texto_redes_sociales = objeto_diferido('src.utils', 'generar_texto_redes_sociales')
 
 class GeneradorPaletasApp:
+    # Cada cuánto (ms) el bucle de Tk vacía la cola de mensajes de los hilos
+    INTERVALO_COLA_UI = 50
+    
+    # Tamaño máximo de la imagen en la pestaña de visualización
+    TAMANO_VISUALIZACION = (800, 500)
+    
     def __init__(self, root):
         self.root = root
         self.root.title("🎨 Generador de Paletas IA - Professional")
@@ -19,12 +39,24 @@ class GeneradorPaletasApp:
         # Configuración
         self.config = AppConfig()
         
-        # Configuración del generador
-        self.generador = GeneradorPaletasIA()
+        # Configuración del generador (se crea al primer uso, ver ``generador``)
+        self._generador = None
+        self._lock_generador = threading.Lock()
+        self.cache_paletas = CachePaletas(os.path.join(self.config.config_dir, 'cache_paletas'))
+        self.cache_miniaturas = CacheMiniaturas(os.path.join(self.config.config_dir, 'cache_miniaturas'))
         self.paleta_actual = None
+        self._metricas = (None, None)
         self.historial_paletas = []
         self.proyecto_actual = None
         
+        # Los hilos de trabajo nunca tocan widgets: dejan mensajes en esta cola
+        # y el hilo de Tk los aplica desde procesar_cola_ui
+        self.cola_ui = queue.Queue()
+        
+        # Pool fijo para las generaciones: la última petición interactiva gana
+        self.planificador = PlanificadorTareas(num_workers=2, max_pendientes=16)
+        self.tareas_en_cola = 0
+        
         # Variables de tema
         self.tema_oscuro = tk.BooleanVar(value=self.config.config.get('tema_oscuro', True))
         
@@ -36,6 +68,21 @@ class GeneradorPaletasApp:
         
         # Cargar historial
         self.cargar_historial()
+        self.actualizar_estadisticas()
+        
+        self.root.after(self.INTERVALO_COLA_UI, self.procesar_cola_ui)
+        
+        # Con la ventana ya visible, el generador se carga en segundo plano
+        self.planificador.enviar(lambda: self.generador, prioridad=100)
+        
+    @property
+    def generador(self):
+        """Generador de paletas, importado y creado la primera vez que se pide"""
+        if self._generador is None:
+            with self._lock_generador:
+                if self._generador is None:
+                    self._generador = GeneradorPaletasIA()
+        return self._generador
         
     def setup_styles(self):
         """Configura los estilos de la aplicación"""
@@ -96,6 +143,9 @@ class GeneradorPaletasApp:
         self.stats_label = ttk.Label(header_frame, text="Paletas: 0 | Favoritos: 0", style='Subtitle.TLabel')
         self.stats_label.pack(side=tk.RIGHT)
         
+        self.cola_label = ttk.Label(header_frame, text="", style='Subtitle.TLabel')
+        self.cola_label.pack(side=tk.RIGHT, padx=(0, 15))
+        
         # Sección de entrada (lado izquierdo)
         input_frame = ttk.LabelFrame(main_frame, text="⚙️ CONFIGURACIÓN", padding="15")
         input_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N), pady=(0, 15), padx=(0, 10))
@@ -199,12 +249,31 @@ class GeneradorPaletasApp:
         self.analysis_frame = ttk.Frame(self.notebook, padding="10")
         self.notebook.add(self.analysis_frame, text="📈 ANÁLISIS")
         
+        # Pestaña de biblioteca (historial y favoritos)
+        self.library_frame = ttk.Frame(self.notebook, padding="10")
+        self.notebook.add(self.library_frame, text="📚 BIBLIOTECA")
+        
         # Configurar pesos para expansión
         self.viz_frame.columnconfigure(0, weight=1)
         self.viz_frame.rowconfigure(0, weight=1)
         self.colors_frame.columnconfigure(0, weight=1)
         self.colors_frame.rowconfigure(0, weight=1)
         
+        # Widgets de cada pestaña: se crean una vez y se actualizan en sitio
+        self.lienzo_paleta = LienzoPaleta(self.viz_frame, fondo=self.color_fondo())
+        self.rejilla_colores = RejillaColores(self.colors_frame, self.copiar_portapapeles,
+                                              fondo=self.color_fondo())
+        self.panel_datos = PanelTexto(self.data_frame, font=('Consolas', 10), wrap=tk.WORD)
+        self.panel_analisis = PanelTexto(self.analysis_frame, font=('Arial', 11), wrap=tk.WORD,
+                                         spacing1=2, spacing2=1, spacing3=2)
+        self.explorador = ExploradorPaletas(self.library_frame, self.config.almacen,
+                                            al_elegir=self.abrir_paleta_guardada,
+                                            fondo=self.color_fondo())
+        self.toolbar_frame = None
+        
+    def color_fondo(self):
+        return FONDO_OSCURO if self.tema_oscuro.get() else FONDO_CLARO
+        
     def crear_seccion_consola(self, parent):
         """Crea la sección de consola/log"""
         console_frame = ttk.LabelFrame(parent, text="📝 ACTIVIDAD", padding="10")
@@ -243,10 +312,6 @@ class GeneradorPaletasApp:
             
     def mostrar_visualizacion_mejorada(self):
         """Muestra la visualización de la paleta - VERSIÓN MEJORADA"""
-        # Limpiar frame completamente
-        for widget in self.viz_frame.winfo_children():
-            widget.destroy()
-            
         if not self.paleta_actual or 'visualizacion' not in self.paleta_actual:
             self.crear_visualizacion_fallback()
             return
@@ -259,42 +324,15 @@ class GeneradorPaletasApp:
                 self.crear_visualizacion_fallback()
                 return
                 
-            # Cargar y mostrar imagen
-            imagen = Image.open(imagen_path)
-            
-            # Calcular tamaño para mostrar (80% del ancho disponible)
-            ancho_max = 800
-            alto_max = 500
+            # Miniatura ya escalada de la caché (solo se decodifica el
+            # original la primera vez o si el archivo ha cambiado)
+            ancho_max, alto_max = self.TAMANO_VISUALIZACION
+            imagen = self.cache_miniaturas.obtener(imagen_path, ancho_max, alto_max)
             
-            # Redimensionar manteniendo aspect ratio
-            imagen.thumbnail((ancho_max, alto_max), Image.Resampling.LANCZOS)
-            
-            # Convertir para Tkinter
+            # Convertir para Tkinter y mostrarla en el canvas existente
             photo = ImageTk.PhotoImage(imagen)
-            
-            # Crear frame para imagen con scrollbars si es necesario
-            canvas_frame = ttk.Frame(self.viz_frame)
-            canvas_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-            canvas_frame.columnconfigure(0, weight=1)
-            canvas_frame.rowconfigure(0, weight=1)
-            
-            # Canvas para la imagen
-            canvas = tk.Canvas(canvas_frame, bg='#2c3e50' if self.tema_oscuro.get() else '#f8f9fa')
-            canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-            
-            # Mostrar imagen en el canvas
-            canvas.create_image(0, 0, anchor=tk.NW, image=photo)
-            canvas.image = photo  # Mantener referencia
-            
-            # Configurar scrollbars si la imagen es más grande que el canvas
-            if imagen.width > ancho_max or imagen.height > alto_max:
-                h_scroll = ttk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=canvas.xview)
-                v_scroll = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=canvas.yview)
-                h_scroll.grid(row=1, column=0, sticky=(tk.W, tk.E))
-                v_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
-                
-                canvas.configure(xscrollcommand=h_scroll.set, yscrollcommand=v_scroll.set,
-                               scrollregion=(0, 0, imagen.width, imagen.height))
+            desbordada = imagen.width > ancho_max or imagen.height > alto_max
+            self.lienzo_paleta.mostrar_imagen(photo, desbordada, fondo=self.color_fondo())
             
             self.log("✅ Visualización cargada correctamente")
             
@@ -303,180 +341,39 @@ class GeneradorPaletasApp:
             self.crear_visualizacion_fallback()
             
     def crear_visualizacion_fallback(self):
-        """Crea una visualización de fallback cuando no hay imagen"""
-        fallback_frame = ttk.Frame(self.viz_frame)
-        fallback_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        fallback_frame.columnconfigure(0, weight=1)
-        fallback_frame.rowconfigure(0, weight=1)
-        
-        # Canvas para dibujar la paleta
-        canvas = tk.Canvas(fallback_frame, bg='white', width=600, height=300)
-        canvas.grid(row=0, column=0, padx=20, pady=20)
-        
-        if not self.paleta_actual or 'colores' not in self.paleta_actual:
-            canvas.create_text(300, 150, text="No hay paleta para mostrar", 
-                             font=('Arial', 14), fill='gray')
-            return
-            
-        colores = self.paleta_actual['colores']
-        n_colores = len(colores)
-        
-        if n_colores == 0:
-            canvas.create_text(300, 150, text="No hay colores en la paleta", 
-                             font=('Arial', 14), fill='gray')
-            return
-            
-        # Dibujar barras de colores
-        bar_width = 580 / n_colores
-        x = 10
-        
-        for i, color_info in enumerate(colores):
-            color_hex = color_info['hex']
-            
-            # Dibujar rectángulo de color
-            canvas.create_rectangle(x, 50, x + bar_width, 200, fill=color_hex, outline='')
-            
-            # Añadir código HEX
-            canvas.create_text(x + bar_width/2, 220, text=color_hex, 
-                             font=('Arial', 9, 'bold'), fill='#333333')
-            
-            # Añadir nombre del color
-            nombre = color_info.get('nombre', f'Color {i+1}')
-            canvas.create_text(x + bar_width/2, 240, text=nombre, 
-                             font=('Arial', 8), fill='#666666')
-            
-            x += bar_width
-            
-        # Título de la paleta
-        titulo = self.paleta_actual.get('tema', 'Paleta de colores')
-        canvas.create_text(300, 30, text=titulo, font=('Arial', 16, 'bold'), fill='#333333')
-        
-        self.log("✅ Visualización de fallback creada")
+        """Dibuja la paleta como barras cuando no hay imagen"""
+        self.lienzo_paleta.mostrar_barras(self.paleta_actual, fondo=self.color_fondo())
+        if self.paleta_actual and self.paleta_actual.get('colores'):
+            self.log("✅ Visualización de fallback creada")
         
     def mostrar_colores_mejorados(self):
-        """Muestra los colores de forma mejorada y organizada"""
-        # Limpiar frame completamente
-        for widget in self.colors_frame.winfo_children():
-            widget.destroy()
-            
+        """Muestra los colores como tarjetas reutilizadas en una rejilla de 3 columnas"""
         if not self.paleta_actual or 'colores' not in self.paleta_actual:
-            ttk.Label(self.colors_frame, text="No hay colores para mostrar", 
-                     font=('Arial', 12)).pack(pady=50)
+            self.rejilla_colores.vaciar("No hay colores para mostrar")
             return
             
         colores = self.paleta_actual['colores']
-        
-        # Frame principal con scrollbar
-        main_container = ttk.Frame(self.colors_frame)
-        main_container.pack(fill=tk.BOTH, expand=True)
-        
-        # Canvas y scrollbar para colores
-        canvas = tk.Canvas(main_container, bg='#2c3e50' if self.tema_oscuro.get() else '#f8f9fa')
-        scrollbar = ttk.Scrollbar(main_container, orient=tk.VERTICAL, command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Empaquetar canvas y scrollbar
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Crear grid de colores (3 columnas)
-        for i, color_info in enumerate(colores):
-            row = i // 3
-            col = i % 3
-            
-            self.crear_tarjeta_color(scrollable_frame, color_info, row, col)
-            
+        self.rejilla_colores.actualizar(colores, fondo=self.color_fondo())
         self.log(f"✅ Mostrando {len(colores)} colores organizados")
         
-    def crear_tarjeta_color(self, parent, color_info, row, col):
-        """Crea una tarjeta individual para cada color"""
-        # Frame de la tarjeta
-        card_frame = ttk.Frame(parent, relief='solid', borderwidth=1, padding="10")
-        card_frame.grid(row=row, column=col, sticky=(tk.W, tk.E, tk.N, tk.S), 
-                       padx=8, pady=8, ipadx=5, ipady=5)
-        
-        # Configurar pesos para expansión
-        parent.columnconfigure(col, weight=1)
-        parent.rowconfigure(row, weight=0)
-        
-        # Muestra de color grande
-        color_canvas = tk.Canvas(card_frame, width=120, height=80, 
-                                bg=color_info['hex'], highlightthickness=0)
-        color_canvas.grid(row=0, column=0, columnspan=2, pady=(0, 10), sticky=(tk.W, tk.E))
-        
-        # Información del color
-        nombre_label = ttk.Label(card_frame, text=color_info['nombre'], 
-                                font=('Arial', 11, 'bold'))
-        nombre_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
-        
-        hex_label = ttk.Label(card_frame, text=color_info['hex'], 
-                             font=('Courier', 10, 'bold'))
-        hex_label.grid(row=2, column=0, sticky=tk.W, pady=(0, 2))
-        
-        rgb_text = f"RGB{tuple(color_info['rgb'])}"
-        rgb_label = ttk.Label(card_frame, text=rgb_text, 
-                             font=('Courier', 8))
-        rgb_label.grid(row=3, column=0, sticky=tk.W, pady=(0, 10))
-        
-        # Botones de acción
-        btn_frame = ttk.Frame(card_frame)
-        btn_frame.grid(row=2, column=1, rowspan=2, sticky=(tk.E, tk.S))
-        
-        btn_copiar = ttk.Button(btn_frame, text="📋", width=3,
-                              command=lambda hex=color_info['hex']: self.copiar_portapapeles(hex))
-        btn_copiar.pack(side=tk.LEFT, padx=(5, 0))
-        
     def mostrar_datos(self):
         """Muestra los datos JSON de la paleta"""
-        for widget in self.data_frame.winfo_children():
-            widget.destroy()
-            
         if not self.paleta_actual:
-            ttk.Label(self.data_frame, text="No hay datos para mostrar", 
-                     font=('Arial', 12)).pack(pady=50)
+            self.panel_datos.vaciar("No hay datos para mostrar")
             return
             
         # Mostrar JSON formateado
         datos_json = json.dumps(self.paleta_actual, indent=2, ensure_ascii=False)
-        
-        text_frame = ttk.Frame(self.data_frame)
-        text_frame.pack(fill=tk.BOTH, expand=True)
-        
-        text_widget = scrolledtext.ScrolledText(text_frame, font=('Consolas', 10), 
-                                              wrap=tk.WORD)
-        text_widget.insert(tk.INSERT, datos_json)
-        text_widget.config(state=tk.DISABLED)
-        text_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.panel_datos.actualizar(datos_json)
         
     def mostrar_analisis(self):
         """Muestra análisis de la paleta"""
-        for widget in self.analysis_frame.winfo_children():
-            widget.destroy()
-            
         if not self.paleta_actual:
-            ttk.Label(self.analysis_frame, text="No hay datos para analizar", 
-                     font=('Arial', 12)).pack(pady=50)
+            self.panel_analisis.vaciar("No hay datos para analizar")
             return
             
         # Crear contenido de análisis mejorado
-        analisis_text = self.generar_analisis_completo()
-        
-        text_frame = ttk.Frame(self.analysis_frame)
-        text_frame.pack(fill=tk.BOTH, expand=True)
-        
-        text_widget = scrolledtext.ScrolledText(text_frame, font=('Arial', 11), 
-                                              wrap=tk.WORD, spacing1=2, spacing2=1, spacing3=2)
-        text_widget.insert(tk.INSERT, analisis_text)
-        text_widget.config(state=tk.DISABLED)
-        text_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.panel_analisis.actualizar(self.generar_analisis_completo())
         
     def generar_analisis_completo(self):
         """Genera un análisis completo de la paleta"""
@@ -515,29 +412,10 @@ class GeneradorPaletasApp:
         if not self.paleta_actual:
             return "N/A"
             
-        colores = [color['rgb'] for color in self.paleta_actual['colores']]
-        if len(colores) < 2:
-            return "Mínima (solo un color)"
-            
-        # Calcular diferencias entre colores
-        diferencias = []
-        for i in range(len(colores)):
-            for j in range(i+1, len(colores)):
-                diff = sum(abs(a - b) for a, b in zip(colores[i], colores[j]))
-                diferencias.append(diff)
-                
-        promedio_diff = sum(diferencias) / len(diferencias) if diferencias else 0
-        
-        if promedio_diff > 200:
-            return "Alta (colores muy distintos)"
-        elif promedio_diff > 100:
-            return "Media (buen contraste)"
-        else:
-            return "Baja (colores similares)"
+        return analisis_paletas.describir_variedad(self.metricas_paleta())
             
     def generar_recomendaciones_detalladas(self):
         """Genera recomendaciones detalladas basadas en la paleta"""
-        colores = [color['rgb'] for color in self.paleta_actual['colores']]
         saturacion_promedio = self.calcular_saturacion_promedio()
         variedad = self.calcular_variedad_cromatica()
         
@@ -584,13 +462,10 @@ class GeneradorPaletasApp:
         
     def habilitar_botones_exportacion(self):
         """Habilita los botones de exportación en una barra de herramientas"""
-        # Crear barra de herramientas si no existe
-        toolbar = getattr(self, 'toolbar_frame', None)
-        if toolbar is not None:
-            try:
-                toolbar.destroy()
-            except Exception:
-                pass
+        # La barra se crea la primera vez y después solo se vuelve a mostrar
+        if self.toolbar_frame is not None:
+            self.toolbar_frame.grid()
+            return
             
         self.toolbar_frame = ttk.Frame(self.viz_frame)
         self.toolbar_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
@@ -612,13 +487,55 @@ class GeneradorPaletasApp:
     # ===== MÉTODOS EXISTENTES (simplificados para el ejemplo) =====
     
     def log(self, mensaje):
-        """Añade un mensaje a la consola"""
-        self.consola.config(state=tk.NORMAL)
+        """Añade un mensaje a la consola (seguro desde cualquier hilo)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.consola.insert(tk.END, f"[{timestamp}] {mensaje}\n")
+        self.cola_ui.put(('log', f"[{timestamp}] {mensaje}\n"))
+        
+    def en_ui(self, funcion, *args):
+        """Programa una llamada para que se ejecute en el hilo de Tk"""
+        self.cola_ui.put(('llamada', funcion, args))
+        
+    def procesar_cola_ui(self):
+        """Vacía la cola de mensajes de los hilos de trabajo desde el bucle de Tk"""
+        lineas = []
+        try:
+            # Límite por ciclo para que una ráfaga no bloquee la ventana
+            for _ in range(500):
+                mensaje = self.cola_ui.get_nowait()
+                if mensaje[0] == 'log':
+                    lineas.append(mensaje[1])
+                    continue
+                    
+                # Las líneas pendientes se escriben antes para conservar el orden
+                self.escribir_consola(lineas)
+                lineas = []
+                _, funcion, args = mensaje
+                try:
+                    funcion(*args)
+                except Exception as e:
+                    lineas.append(f"❌ Error actualizando la interfaz: {e}\n")
+        except queue.Empty:
+            pass
+            
+        self.escribir_consola(lineas)
+        self.actualizar_cola_tareas()
+        self.root.after(self.INTERVALO_COLA_UI, self.procesar_cola_ui)
+        
+    def actualizar_cola_tareas(self):
+        """Muestra en el header cuántas generaciones quedan pendientes"""
+        pendientes = self.planificador.pendientes()
+        if pendientes != self.tareas_en_cola:
+            self.tareas_en_cola = pendientes
+            self.cola_label.config(text=f"⏳ En cola: {pendientes}" if pendientes else "")
+        
+    def escribir_consola(self, lineas):
+        """Inserta de una vez un bloque de líneas en la consola"""
+        if not lineas:
+            return
+        self.consola.config(state=tk.NORMAL)
+        self.consola.insert(tk.END, "".join(lineas))
         self.consola.see(tk.END)
         self.consola.config(state=tk.DISABLED)
-        self.root.update_idletasks()
         
     def generar_paleta_thread(self):
         """Inicia la generación en un hilo separado"""
@@ -627,45 +544,77 @@ class GeneradorPaletasApp:
             messagebox.showwarning("Advertencia", "Por favor ingresa un tema")
             return
             
-        self.btn_generar.config(state="disabled")
         self.log("🔄 Iniciando generación de paleta...")
+        self.encolar_generacion(self.generar_paleta, tema, self.estilo_var.get())
         
-        thread = threading.Thread(target=self.generar_paleta)
-        thread.daemon = True
-        thread.start()
-        
-    def generar_paleta(self):
-        """Genera la paleta de colores"""
+    def encolar_generacion(self, funcion, *args):
+        """Envía una generación interactiva al planificador (gana la última)"""
         try:
-            tema = self.tema_var.get().strip()
-            estilo = self.estilo_var.get()
-            
-            self.log(f"🎨 Generando paleta para: {tema}")
+            # Una petición nueva cancela la que estuviera en cola o en curso
+            self.planificador.enviar(funcion, *args, prioridad=0, canal='interactiva',
+                                     al_terminar=self.generacion_terminada)
+        except queue.Full:
+            self.log("⚠️ Demasiadas tareas en cola, espera un momento")
+            
+    def generacion_terminada(self, tarea, paleta, error):
+        """Callback del planificador (hilo de trabajo): pasa el resultado a Tk"""
+        if error:
+            self.log(f"❌ Error: {str(error)}")
+        self.en_ui(self.aplicar_paleta_generada, tarea, paleta)
+        
+    def generar_paleta(self, tema, estilo):
+        """Genera la paleta de colores (se ejecuta en un hilo de trabajo)"""
+        self.log(f"🎨 Generando paleta para: {tema}")
+        
+        # Generar paleta (los temas repetidos salen de la caché)
+        paleta = self.cache_paletas.obtener_o_generar(self.generador, tema, estilo)
+        
+        if paleta:
+            self.log("✅ Paleta generada exitosamente")
+            self.precalentar_miniatura(paleta)
+        else:
+            self.log("❌ Error al generar la paleta")
+        return paleta
             
-            # Generar paleta
-            self.paleta_actual = self.generador.generar_paleta_completa(tema, estilo)
+    def precalentar_miniatura(self, paleta):
+        """Escala la visualización en el hilo de trabajo para no hacerlo en el de Tk"""
+        ruta = paleta.get('visualizacion')
+        if ruta and os.path.exists(ruta):
+            try:
+                self.cache_miniaturas.obtener(ruta, *self.TAMANO_VISUALIZACION)
+            except Exception as e:
+                self.log(f"⚠️ No se pudo preparar la miniatura: {e}")
+            
+    def aplicar_paleta_generada(self, tarea, paleta):
+        """Muestra una paleta terminada si no se ha cancelado entretanto (hilo de Tk)"""
+        if tarea.cancelada.is_set():
+            self.log("⏭️ Resultado descartado: hay una petición más reciente")
+            return
             
-            if self.paleta_actual:
-                self.log("✅ Paleta generada exitosamente")
-                self.mostrar_resultados()
-                self.actualizar_estadisticas()
-            else:
-                self.log("❌ Error al generar la paleta")
-                
-        except Exception as e:
-            self.log(f"❌ Error: {str(e)}")
-        finally:
-            self.btn_generar.config(state="normal")
+        if paleta:
+            self.paleta_actual = paleta
+            self.config.almacen.agregar_historial(paleta)
+            if paleta.get('estilo') != 'imagen':
+                self.config.actualizar_historial(paleta['tema'])
+            self.mostrar_resultados()
+            self.actualizar_estadisticas()
             
     def actualizar_estadisticas(self):
         """Actualiza las estadísticas en el header"""
-        historial_count = len(self.config.config.get('historial_paletas', []))
-        favoritos_count = len(self.config.config.get('favoritos', []))
+        historial_count = self.config.almacen.contar('historial')
+        favoritos_count = self.config.almacen.contar('favorito')
         self.stats_label.config(text=f"Paletas: {historial_count} | Favoritos: {favoritos_count}")
+        self.explorador.refrescar()
+        
+    def abrir_paleta_guardada(self, paleta):
+        """Muestra una paleta elegida en la biblioteca"""
+        self.paleta_actual = paleta
+        self.mostrar_resultados()
+        self.notebook.select(self.viz_frame)
         
     def cargar_historial(self):
         """Carga el historial de temas"""
-        historial_temas = self.config.config.get('historial_temas', [])
+        historial_temas = self.config.almacen.temas_recientes()
         # No usamos combobox en esta versión simplificada
         
     def copiar_portapapeles(self, texto):
@@ -681,6 +630,9 @@ class GeneradorPaletasApp:
             self.configurar_tema_oscuro()
         else:
             self.configurar_tema_claro()
+        self.lienzo_paleta.cambiar_fondo(self.color_fondo())
+        self.rejilla_colores.canvas.configure(bg=self.color_fondo())
+        self.explorador.canvas.configure(bg=self.color_fondo())
         
         self.config.config['tema_oscuro'] = self.tema_oscuro.get()
         self.config.guardar_config()
@@ -701,16 +653,27 @@ class GeneradorPaletasApp:
         
     def analizar_imagen(self):
         """Analiza una imagen para extraer colores"""
-        messagebox.showinfo("Análisis de Imagen", 
-                           "Esta funcionalidad estará disponible en la próxima versión")
+        ruta_imagen = filedialog.askopenfilename(
+            title="Selecciona una imagen",
+            filetypes=[("Imágenes", "*.png *.jpg *.jpeg *.bmp *.gif *.webp"), ("Todos", "*.*")])
+        if not ruta_imagen:
+            return
+            
+        self.log(f"🖼️ Analizando imagen: {os.path.basename(ruta_imagen)}")
+        self.encolar_generacion(self.extraer_paleta_imagen, ruta_imagen, self.colores_var.get())
+        
+    def extraer_paleta_imagen(self, ruta_imagen, num_colores):
+        """Extrae la paleta dominante de una imagen con K-means (hilo de trabajo)"""
+        analizador = AnalizadorImagen(num_colores=num_colores)
+        paleta = analizador.analizar(ruta_imagen)
+        
+        self.log(f"✅ {len(paleta['colores'])} colores extraídos de la imagen")
+        return paleta
         
     def marcar_favorito(self):
         """Marca la paleta actual como favorita"""
         if self.paleta_actual:
-            favoritos = self.config.config.get('favoritos', [])
-            favoritos.append(self.paleta_actual)
-            self.config.config['favoritos'] = favoritos
-            self.config.guardar_config()
+            self.config.almacen.agregar_favorito(self.paleta_actual)
             self.log("⭐ Paleta añadida a favoritos")
             self.actualizar_estadisticas()
             
@@ -768,61 +731,41 @@ class GeneradorPaletasApp:
         """Crea un nuevo proyecto"""
         self.paleta_actual = None
         self.tema_var.set("")
-        for widget in self.viz_frame.winfo_children():
-            widget.destroy()
-        for widget in self.colors_frame.winfo_children():
-            widget.destroy()
-        for widget in self.data_frame.winfo_children():
-            widget.destroy()
-        for widget in self.analysis_frame.winfo_children():
-            widget.destroy()
+        self.lienzo_paleta.vaciar()
+        self.rejilla_colores.vaciar()
+        self.panel_datos.vaciar()
+        self.panel_analisis.vaciar()
+        if self.toolbar_frame is not None:
+            self.toolbar_frame.grid_remove()
             
         self.log("🆕 Nuevo proyecto listo")
         
-    # ===== MÉTODOS DE ANÁLISIS (mantenidos del código anterior) =====
+    # ===== MÉTODOS DE ANÁLISIS (cálculo en analisis_paletas) =====
     
+    def metricas_paleta(self):
+        """Métricas de la paleta actual, calculadas una vez por paleta"""
+        if self._metricas[0] is not self.paleta_actual:
+            matriz = analisis_paletas.a_matriz(self.paleta_actual)
+            self._metricas = (self.paleta_actual, analisis_paletas.analizar(matriz))
+        return self._metricas[1]
+        
     def calcular_rango_colores(self):
         """Calcula el rango de colores en la paleta"""
-        if not self.paleta_actual:
+        if not self.paleta_actual or not self.paleta_actual['colores']:
             return "N/A"
-            
-        colores = [color['rgb'] for color in self.paleta_actual['colores']]
-        rojos = [c[0] for c in colores]
-        verdes = [c[1] for c in colores]
-        azules = [c[2] for c in colores]
-        
-        return f"R({min(rojos)}-{max(rojos)}), G({min(verdes)}-{max(verdes)}), B({min(azules)}-{max(azules)})"
+        return analisis_paletas.describir_rango(self.metricas_paleta())
         
     def calcular_saturacion_promedio(self):
         """Calcula la saturación promedio de los colores"""
-        if not self.paleta_actual:
+        if not self.paleta_actual or not self.paleta_actual['colores']:
             return 0
-            
-        saturaciones = []
-        for color in self.paleta_actual['colores']:
-            r, g, b = color['rgb']
-            max_val = max(r, g, b)
-            min_val = min(r, g, b)
-            if max_val == 0:
-                saturaciones.append(0)
-            else:
-                saturaciones.append((max_val - min_val) / max_val * 100)
-                
-        return sum(saturaciones) / len(saturaciones) if saturaciones else 0
+        return float(self.metricas_paleta()['saturacion_media'])
         
     def analizar_balance_colores(self):
         """Analiza el balance de colores en la paleta"""
         if not self.paleta_actual:
             return "N/A"
-            
-        colores = [color['rgb'] for color in self.paleta_actual['colores']]
-        promedios = [sum(color) / 3 for color in colores]
-        
-        claro = sum(1 for p in promedios if p > 150)
-        medio = sum(1 for p in promedios if 80 <= p <= 150)
-        oscuro = sum(1 for p in promedios if p < 80)
-        
-        return f"Claros: {claro}, Medios: {medio}, Oscuros: {oscuro}"
+        return analisis_paletas.describir_balance(self.metricas_paleta())
         
     def generar_distribucion_colores(self):
         """Genera una representación visual de la distribución"""
@@ -842,6 +785,8 @@ def main():
     root = tk.Tk()
     app = GeneradorPaletasApp(root)
     root.mainloop()
+    app.planificador.cerrar()
+    app.config.cerrar()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
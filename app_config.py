@@ -1,10 +1,22 @@
 import os
 import json
+import atexit
+import tempfile
+import threading
+import time
 from datetime import datetime
+from almacen_paletas import AlmacenPaletas
+from indice_proyectos import IndiceProyectos
+from instrumentacion import tramo
 
 class AppConfig:
     """Configuración avanzada de la aplicación"""
     
+    # Segundos durante los que se agrupan los cambios antes de escribir config.json
+    RETARDO_GUARDADO = 0.5
+    # Segundos máximos que un cambio puede esperar aunque sigan llegando otros
+    ESPERA_MAXIMA_GUARDADO = 5.0
+    
     def __init__(self):
         self.config_dir = os.path.expanduser('~/.generador_paletas')
         self.config_file = os.path.join(self.config_dir, 'config.json')
@@ -16,7 +28,26 @@ class AppConfig:
         os.makedirs(self.proyectos_dir, exist_ok=True)
         os.makedirs(self.exportaciones_dir, exist_ok=True)
         
+        # Escritura diferida: guardar_config solo programa la escritura y las
+        # llamadas seguidas se agrupan en una sola
+        self._lock_guardado = threading.Lock()
+        self._pendiente = None
+        self._pendiente_desde = None
+        self._temporizador = None
+        self.escrituras = 0
+        atexit.register(self.cerrar)
+        
+        # Favoritos e historiales viven en SQLite para que config.json sea pequeño
+        self.almacen = AlmacenPaletas(os.path.join(self.config_dir, 'biblioteca.db'))
+        self.indice_proyectos = IndiceProyectos(os.path.join(self.config_dir, 'biblioteca.db'),
+                                                self.proyectos_dir)
+        
         self.config = self.cargar_config()
+        if self.almacen.migrar_desde_config(self.config):
+            # Sin esperar al temporizador: si el proceso acabara antes, el
+            # config.json viejo conservaría las listas y se migrarían otra vez
+            self.guardar_config()
+            self.guardar_pendiente()
         
     def cargar_config(self):
         """Carga la configuración desde archivo"""
@@ -26,9 +57,6 @@ class AppConfig:
             'num_colores': 6,
             'directorio_guardado': os.path.expanduser('~/PaletasGeneradas'),
             'tema_oscuro': True,
-            'historial_temas': [],
-            'historial_paletas': [],
-            'favoritos': [],
             'proyectos_recientes': [],
             'configuracion_exportacion': {
                 'css': True,
@@ -45,7 +73,7 @@ class AppConfig:
         
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
+                with tramo('app_config.cargar_config'), open(self.config_file, 'r', encoding='utf-8') as f:
                     loaded_config = json.load(f)
                     # Actualizar configuración por defecto con la cargada
                     config_default.update(loaded_config)
@@ -58,23 +86,78 @@ class AppConfig:
             return config_default
             
     def guardar_config(self, config=None):
-        """Guarda la configuración en archivo"""
+        """Programa el guardado de la configuración
+        
+        El contenido se serializa en el momento de la llamada, pero el disco
+        solo se toca cuando pasan RETARDO_GUARDADO segundos sin cambios nuevos
+        (o al cerrar). Así una ráfaga de cambios produce una única escritura.
+        Un flujo continuo de cambios no la aplaza más de ESPERA_MAXIMA_GUARDADO
+        segundos desde el primer cambio sin escribir.
+        """
         if config is None:
             config = self.config
             
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            contenido = json.dumps(config, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"Error guardando configuración: {e}")
+            return
+            
+        with self._lock_guardado:
+            ahora = time.monotonic()
+            if self._pendiente is None:
+                self._pendiente_desde = ahora
+            self._pendiente = contenido
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+            restante = self._pendiente_desde + self.ESPERA_MAXIMA_GUARDADO - ahora
+            retardo = max(0.0, min(self.RETARDO_GUARDADO, restante))
+            self._temporizador = threading.Timer(retardo, self.guardar_pendiente)
+            self._temporizador.daemon = True
+            self._temporizador.start()
+            
+    def guardar_pendiente(self):
+        """Escribe ya la configuración pendiente, si la hay"""
+        with self._lock_guardado:
+            contenido, self._pendiente = self._pendiente, None
+            self._pendiente_desde = None
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            if contenido is None:
+                return
+            
+            try:
+                self._escribir_atomico(self.config_file, contenido)
+                self.escrituras += 1
+            except Exception as e:
+                print(f"Error guardando configuración: {e}")
+                
+    @staticmethod
+    def _escribir_atomico(ruta, contenido):
+        """Escribe en un temporal del mismo directorio y lo renombra sobre ``ruta``
+        
+        os.replace es atómico: un corte a mitad deja el archivo anterior intacto.
+        """
+        fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+        try:
+            with tramo('app_config.escribir'), os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(contenido)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+            
+    def cerrar(self):
+        """Vuelca los cambios pendientes (se llama también al salir del proceso)"""
+        self.guardar_pendiente()
             
     def actualizar_historial(self, tema):
         """Actualiza el historial de temas"""
-        if tema not in self.config['historial_temas']:
-            self.config['historial_temas'].append(tema)
-            # Mantener solo los últimos 20 temas
-            self.config['historial_temas'] = self.config['historial_temas'][-20:]
-            self.guardar_config()
+        self.almacen.registrar_tema(tema)
             
     def guardar_proyecto(self, proyecto_data):
         """Guarda un proyecto en archivo separado"""
@@ -82,8 +165,9 @@ class AppConfig:
             nombre_archivo = f"{proyecto_data['nombre']}.json"
             archivo_path = os.path.join(self.proyectos_dir, nombre_archivo)
             
-            with open(archivo_path, 'w', encoding='utf-8') as f:
-                json.dump(proyecto_data, f, indent=2, ensure_ascii=False)
+            self._escribir_atomico(archivo_path,
+                                   json.dumps(proyecto_data, indent=2, ensure_ascii=False))
+            self.indice_proyectos.actualizar(archivo_path, proyecto_data)
                 
             # Actualizar proyectos recientes
             if archivo_path not in self.config['proyectos_recientes']:
@@ -100,12 +184,16 @@ class AppConfig:
     def cargar_proyecto(self, archivo_path):
         """Carga un proyecto desde archivo"""
         try:
-            with open(archivo_path, 'r', encoding='utf-8') as f:
+            with tramo('app_config.cargar_proyecto'), open(archivo_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
             print(f"Error cargando proyecto: {e}")
             return None
             
+    def buscar_proyectos(self, texto, campo='nombre', limite=50):
+        """Busca proyectos por nombre o tema en el índice, sin abrir los archivos"""
+        return self.indice_proyectos.buscar(texto, campo, limite)
+        
     def get_proyectos_recientes(self):
         """Obtiene la lista de proyectos recientes"""
         return [os.path.basename(path) for path in self.config['proyectos_recientes']]
\ No newline at end of file
@@ -0,0 +1,425 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DIRECTORIO)
+
+from carga_diferida import disponible
+
+try:
+    import resource
+except ImportError:
+    # Windows: sin getrusage, el pico de memoria se omite
+    resource = None
+
+# Base con la que se comparan los resultados si no se indica otra
+BASE_POR_DEFECTO = os.path.join(DIRECTORIO, 'benchmark_base.json')
+
+# Una medida es una regresión si su p50 supera al de la base en este factor
+TOLERANCIA = 0.25
+
+# Tamaños de biblioteca (paletas guardadas) para AppConfig y el análisis por lotes
+TAMANOS_BIBLIOTECA = (100, 1000, 10000)
+
+# Cada caso se ejecuta en un proceso propio para que el pico de memoria sea
+# solo suyo; la función recibe el modo rápido y devuelve una lista de medidas
+CASOS = {}
+
+
+def caso(nombre):
+    def registrar(funcion):
+        CASOS[nombre] = funcion
+        return funcion
+    return registrar
+
+
+# ===== MEDICIÓN =====
+
+def percentil(valores, p):
+    """Percentil con interpolación lineal sobre una lista ordenada"""
+    if len(valores) == 1:
+        return valores[0]
+    posicion = (len(valores) - 1) * p / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(valores) - 1)
+    return valores[inferior] + (valores[superior] - valores[inferior]) * (posicion - inferior)
+
+
+def medir(nombre, funcion, repeticiones, calentamiento=1, preparar=None):
+    """Ejecuta ``funcion`` varias veces y resume su latencia
+
+    ``preparar`` (opcional) se llama antes de cada repetición, fuera del
+    tiempo medido. ``por_segundo`` es la inversa de la latencia media.
+    """
+    for _ in range(calentamiento):
+        if preparar:
+            preparar()
+        funcion()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tiempos.sort()
+    total = sum(tiempos)
+    return {
+        'nombre': nombre,
+        'repeticiones': repeticiones,
+        'p50_ms': round(percentil(tiempos, 50) * 1000, 4),
+        'p95_ms': round(percentil(tiempos, 95) * 1000, 4),
+        'por_segundo': round(repeticiones / total, 2) if total else None,
+    }
+
+
+def omitido(nombre, motivo):
+    """Medida que no se puede tomar aquí a propósito (falta una dependencia)"""
+    return {'nombre': nombre, 'omitido': motivo}
+
+
+def fallido(nombre, mensaje):
+    """Medida que debía tomarse y falló: hace fallar la ejecución"""
+    return {'nombre': nombre, 'error': mensaje}
+
+
+def rss_pico_mb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KiB y macOS en bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(pico / divisor, 1)
+
+
+# ===== DATOS SINTÉTICOS =====
+
+def paleta_sintetica(semilla, num_colores=6):
+    rng = random.Random(semilla)
+    colores = []
+    for j in range(num_colores):
+        rgb = [rng.randrange(256) for _ in range(3)]
+        colores.append({
+            'hex': '#{:02x}{:02x}{:02x}'.format(*rgb),
+            'rgb': rgb,
+            'nombre': f'Color {j + 1}',
+            'porcentaje': round(100 / num_colores, 2)
+        })
+    return {
+        'tema': f'tema de prueba {semilla}',
+        'estilo': 'vibrante',
+        'colores': colores,
+        'timestamp': datetime(2024, 1, 1).isoformat()
+    }
+
+
+# ===== CASOS =====
+
+@caso('generacion')
+def caso_generacion(rapido):
+    if not disponible('src.generador_paletas'):
+        return [omitido('generar_paleta_completa', 'src.generador_paletas no disponible')]
+
+    from src.generador_paletas import GeneradorPaletasIA
+    generador = GeneradorPaletasIA()
+    temas = iter(f"bosque de prueba {i}" for i in range(10 ** 6))
+    return [medir('generar_paleta_completa', lambda: generador.generar_paleta_completa(next(temas)),
+                  repeticiones=3 if rapido else 10)]
+
+
+@caso('guardado')
+def caso_guardado(rapido):
+    if not disponible('src.utils'):
+        return [omitido('guardar_datos_paleta', 'src.utils no disponible')]
+
+    from src.utils import guardar_datos_paleta
+    paletas = iter(paleta_sintetica(i) for i in range(10 ** 6))
+    return [medir('guardar_datos_paleta', lambda: guardar_datos_paleta(next(paletas)),
+                  repeticiones=10 if rapido else 50)]
+
+
+def _medir_slides(backend, rapido):
+    from visualizador_redes import VisualizadorRedesSociales
+
+    visualizador = VisualizadorRedesSociales(backend=backend,
+                                             directorio_cache=os.path.join(os.getcwd(), 'cache_render'))
+    paleta = paleta_sintetica(0)
+    repeticiones = 3 if rapido else (10 if backend == 'matplotlib' else 30)
+
+    medidas = [medir('banner_proyecto',
+                     lambda: visualizador.crear_banner_proyecto(usar_cache=False),
+                     repeticiones)]
+    for metodo, args in visualizador._tareas_carousel(paleta, backend=backend):
+        medidas.append(medir(metodo.lstrip('_'), lambda: getattr(visualizador, metodo)(*args),
+                             repeticiones))
+    return medidas
+
+
+@caso('render_pillow')
+def caso_render_pillow(rapido):
+    return _medir_slides('pillow', rapido)
+
+
+@caso('render_matplotlib')
+def caso_render_matplotlib(rapido):
+    import matplotlib
+    matplotlib.use('Agg')
+    return _medir_slides('matplotlib', rapido)
+
+
+@caso('analisis')
+def caso_analisis(rapido):
+    import numpy as np
+    import analisis_paletas
+
+    paleta = paleta_sintetica(0)
+    medidas = [
+        medir('analizar_paleta',
+              lambda: analisis_paletas.analizar(analisis_paletas.a_matriz(paleta)),
+              repeticiones=200 if rapido else 2000),
+    ]
+
+    rng = np.random.default_rng(0)
+    for tamano in TAMANOS_BIBLIOTECA:
+        lote = rng.integers(0, 256, (tamano, 6, 3), dtype=np.uint8)
+        medidas.append(medir(f'analizar_lote_{tamano}', lambda: analisis_paletas.analizar(lote),
+                             repeticiones=3 if rapido else 10))
+    return medidas
+
+
+@caso('paleta')
+def caso_paleta(rapido):
+    from paleta import Paleta, ColeccionPaletas
+
+    paleta_data = paleta_sintetica(0)
+    medidas = [
+        medir('desde_dict', lambda: Paleta.desde_dict(paleta_data), repeticiones=500 if rapido else 5000),
+        medir('a_dict', lambda: Paleta.desde_dict(paleta_data).a_dict(),
+              repeticiones=500 if rapido else 5000),
+    ]
+
+    paletas = [paleta_sintetica(i) for i in range(TAMANOS_BIBLIOTECA[-1])]
+    medidas.append(medir(f'coleccion_{len(paletas)}', lambda: ColeccionPaletas.desde_paletas(paletas),
+                         repeticiones=2 if rapido else 5))
+    coleccion = ColeccionPaletas.desde_paletas(paletas)
+    medidas.append(medir(f'a_lote_coleccion_{len(paletas)}', lambda: coleccion.a_lote(),
+                         repeticiones=3 if rapido else 10))
+    return medidas
+
+
+@caso('config')
+def caso_config(rapido):
+    # AppConfig trabaja en ~/.generador_paletas: se apunta HOME al directorio temporal
+    os.environ['HOME'] = os.environ['USERPROFILE'] = os.getcwd()
+    from app_config import AppConfig
+
+    medidas = []
+    tamanos = TAMANOS_BIBLIOTECA[:2] if rapido else TAMANOS_BIBLIOTECA
+    anterior = 0
+    for tamano in tamanos:
+        config = AppConfig()
+        for i in range(anterior, tamano):
+            config.almacen.agregar_historial(paleta_sintetica(i))
+        anterior = tamano
+
+        def guardar():
+            config.config['ultimo_benchmark'] = time.time()
+            config.guardar_config()
+            config.guardar_pendiente()
+
+        medidas += [
+            medir(f'cargar_{tamano}', lambda: AppConfig().cerrar(), repeticiones=5 if rapido else 20),
+            medir(f'guardar_{tamano}', guardar, repeticiones=10 if rapido else 50),
+            medir(f'listar_historial_{tamano}', lambda: config.almacen.listar('historial', 50),
+                  repeticiones=20 if rapido else 200),
+        ]
+        config.cerrar()
+    return medidas
+
+
+# ===== EJECUCIÓN =====
+
+def ejecutar_caso(nombre, rapido):
+    """Ejecuta un caso en este proceso, dentro de un directorio temporal"""
+    with tempfile.TemporaryDirectory(prefix='bench_paletas_') as directorio:
+        os.chdir(directorio)
+        try:
+            medidas = CASOS[nombre](rapido)
+        except Exception as e:
+            medidas = [fallido(nombre, f"{type(e).__name__}: {e}")]
+        finally:
+            os.chdir(DIRECTORIO)
+
+    rss = rss_pico_mb()
+    resultados = {}
+    for medida in medidas:
+        medida['rss_pico_mb'] = rss
+        resultados[f"{nombre}/{medida.pop('nombre')}"] = medida
+    return resultados
+
+
+def ejecutar_en_subproceso(nombre, rapido):
+    argumentos = [sys.executable, os.path.abspath(__file__), '--caso-interno', nombre]
+    if rapido:
+        argumentos.append('--rapido')
+    proceso = subprocess.run(argumentos, capture_output=True, text=True)
+    if proceso.returncode != 0:
+        mensaje = proceso.stderr.strip()[-500:] or f"código de salida {proceso.returncode}"
+        return {f"{nombre}/proceso": fallido(nombre, mensaje)}
+    # La última línea es el JSON; lo anterior son mensajes del código medido
+    try:
+        return json.loads(proceso.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return {f"{nombre}/proceso": fallido(nombre, "el caso no devolvió resultados JSON")}
+
+
+def errores(resultados):
+    return [clave for clave, medida in resultados.items() if 'error' in medida]
+
+
+def faltantes(resultados, base, casos):
+    """Medidas con tiempo en la base que esta ejecución no ha tomado
+
+    Solo cuentan las de los ``casos`` ejecutados; una medida que ahora sale
+    omitida o con error también falta.
+    """
+    return [clave for clave, anterior in base.items()
+            if clave.split('/', 1)[0] in casos and 'p50_ms' in anterior
+            and 'p50_ms' not in resultados.get(clave, {})]
+
+
+def comparar(resultados, base, tolerancia=TOLERANCIA):
+    """Devuelve las medidas cuyo p50 empeora más que ``tolerancia`` frente a la base"""
+    regresiones = []
+    for clave, medida in resultados.items():
+        anterior = base.get(clave)
+        if not anterior or 'p50_ms' not in medida or 'p50_ms' not in anterior:
+            continue
+        if anterior['p50_ms'] > 0:
+            factor = medida['p50_ms'] / anterior['p50_ms']
+            medida['factor_base'] = round(factor, 3)
+            if factor > 1 + tolerancia:
+                regresiones.append(clave)
+    return regresiones
+
+
+def imprimir_tabla(resultados, regresiones, salida=sys.stderr):
+    print(f"{'medida':<48} {'p50 ms':>10} {'p95 ms':>10} {'ops/s':>10} {'RSS MB':>8} {'x base':>7}",
+          file=salida)
+    for clave, medida in resultados.items():
+        if 'omitido' in medida:
+            print(f"{clave:<48} ⏭️ {medida['omitido']}", file=salida)
+            continue
+        if 'error' in medida:
+            print(f"{clave:<48} ❌ {medida['error']}", file=salida)
+            continue
+        factor = medida.get('factor_base')
+        marca = ' ❌' if clave in regresiones else ''
+        print(f"{clave:<48} {medida['p50_ms']:>10.3f} {medida['p95_ms']:>10.3f} "
+              f"{medida['por_segundo'] or 0:>10.1f} {medida['rss_pico_mb'] or 0:>8.1f} "
+              f"{factor if factor is not None else '-':>7}{marca}", file=salida)
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de generación, guardado, render, análisis y configuración")
+    parser.add_argument('casos', nargs='*', help=f"casos a ejecutar (por defecto todos: "
+                                                 f"{', '.join(CASOS)})")
+    parser.add_argument('--rapido', action='store_true', help="menos repeticiones y tamaños")
+    parser.add_argument('--salida', help="archivo JSON de resultados (por defecto, stdout)")
+    parser.add_argument('--base', default=BASE_POR_DEFECTO, help="JSON de referencia para comparar")
+    parser.add_argument('--guardar-base', action='store_true',
+                        help="guarda estos resultados como nueva base")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help="empeoramiento relativo del p50 que cuenta como regresión")
+    parser.add_argument('--caso-interno', help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+
+    if args.caso_interno:
+        print(json.dumps(ejecutar_caso(args.caso_interno, args.rapido)))
+        return 0
+
+    desconocidos = [nombre for nombre in args.casos if nombre not in CASOS]
+    if desconocidos:
+        print(f"❌ Casos desconocidos: {', '.join(desconocidos)}", file=sys.stderr)
+        return 2
+
+    casos = args.casos or list(CASOS)
+    resultados = {}
+    for nombre in casos:
+        print(f"⏱️ {nombre}...", file=sys.stderr)
+        resultados.update(ejecutar_en_subproceso(nombre, args.rapido))
+
+    con_error = errores(resultados)
+    regresiones = []
+    sin_medir = []
+    if os.path.exists(args.base) and not args.guardar_base:
+        with open(args.base, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        regresiones = comparar(resultados, base['resultados'], args.tolerancia)
+        # El modo rápido mide menos tamaños: solo se exigen todas las medidas
+        # de la base si se tomó en el mismo modo
+        if base.get('rapido') == args.rapido:
+            sin_medir = faltantes(resultados, base['resultados'], casos)
+        else:
+            print("⚠️ La base es de otro modo (--rapido): no se comprueban medidas que falten",
+                  file=sys.stderr)
+
+    informe = {
+        'fecha': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'rapido': args.rapido,
+        'resultados': resultados,
+        'regresiones': regresiones,
+        'errores': con_error,
+        'faltantes': sin_medir,
+    }
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+
+    if args.guardar_base and con_error:
+        print("❌ Hay casos con errores: no se guarda la base", file=sys.stderr)
+    elif args.guardar_base:
+        with open(args.base, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        print(f"💾 Base guardada en {args.base}", file=sys.stderr)
+
+    imprimir_tabla(resultados, regresiones)
+    for clave in sin_medir:
+        print(f"{clave:<48} ❌ está en la base pero no se ha medido", file=sys.stderr)
+    if con_error:
+        print(f"❌ {len(con_error)} medidas con errores", file=sys.stderr)
+    if sin_medir:
+        print(f"❌ {len(sin_medir)} medidas de la base sin medir", file=sys.stderr)
+    if regresiones:
+        print(f"❌ {len(regresiones)} regresiones respecto a la base", file=sys.stderr)
+    return 1 if con_error or sin_medir or regresiones else 0
+
+
+if __name__ == "__main__":
+    # python benchmark.py                      -> todos los casos, JSON por stdout
+    # python benchmark.py render_pillow --rapido
+    # python benchmark.py --guardar-base       -> fija la base de esta máquina
+    # python benchmark.py --salida res.json    -> compara con la base y sale con 1 si empeora,
+    #                                             falla algún caso o falta alguna medida
+    sys.exit(main())
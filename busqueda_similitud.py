@@ -0,0 +1,169 @@
+import numpy as np
+
+from espacio_color import rgb_a_lab, hex_a_rgb
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+# ΔE que cuesta cada color sin pareja (de la consulta o de la paleta) cuando
+# tienen distinto número de colores; 100 es la distancia de negro a blanco
+COSTE_SIN_PAREJA = 100.0
+
+
+def _a_rgb(color):
+    """Acepta '#hex', [r, g, b] o un dict de color de paleta"""
+    if isinstance(color, dict):
+        return color['rgb'] if 'rgb' in color else hex_a_rgb(color['hex'])
+    if isinstance(color, str):
+        return hex_a_rgb(color)
+    return list(color)
+
+
+def _asignar(costes):
+    """Emparejamiento de coste mínimo; sin scipy se usa uno voraz"""
+    if linear_sum_assignment is not None:
+        filas, columnas = linear_sum_assignment(costes)
+        return costes[filas, columnas]
+
+    costes = costes.copy()
+    elegidos = []
+    for _ in range(min(costes.shape)):
+        i, j = np.unravel_index(np.argmin(costes), costes.shape)
+        elegidos.append(costes[i, j])
+        costes[i, :] = np.inf
+        costes[:, j] = np.inf
+    return np.array(elegidos)
+
+
+class IndiceSimilitud:
+    """Búsqueda de paletas parecidas en CIELAB con NumPy vectorizado
+
+    Las paletas se guardan en una matriz (M x N x 3) de Lab en float32 con una
+    máscara para las que tienen menos de N colores. La búsqueda por color es
+    fuerza bruta vectorizada; la búsqueda por paleta filtra candidatos por el
+    color medio y ordena los candidatos con un emparejamiento de colores de
+    coste mínimo: distancia media ΔE por color, donde cada color que se queda
+    sin pareja cuenta ``COSTE_SIN_PAREJA``.
+    """
+
+    def __init__(self, lab, mascara, referencias):
+        self.lab = lab
+        self.mascara = mascara
+        self.referencias = referencias
+
+        # Lab medio de cada paleta para el filtro previo
+        conteos = np.maximum(mascara.sum(axis=1, keepdims=True), 1)
+        self.media = (lab * mascara[..., None]).sum(axis=1) / conteos
+
+        # Un array contiguo por canal, con los huecos muy lejos de cualquier
+        # color real: la búsqueda por color no necesita aplicar la máscara.
+        # Se guardan traspuestos (N x M) para recorrer cada posición de color
+        # de todas las paletas como un vector contiguo
+        relleno = np.where(mascara[..., None], lab, np.float32(1e4))
+        self._canales = [np.ascontiguousarray(relleno[..., c].T) for c in range(3)]
+        self._vacias = ~mascara.any(axis=1)
+
+    def __len__(self):
+        return len(self.referencias)
+
+    @classmethod
+    def construir(cls, paletas, referencias=None):
+        """Crea el índice a partir de paletas (dicts con 'colores' o listas de colores)"""
+        listas = []
+        for paleta in paletas:
+            colores = paleta.get('colores', []) if isinstance(paleta, dict) else paleta
+            listas.append([_a_rgb(color) for color in colores])
+
+        max_colores = max((len(colores) for colores in listas), default=1) or 1
+        rgb = np.zeros((len(listas), max_colores, 3), dtype=np.uint8)
+        mascara = np.zeros((len(listas), max_colores), dtype=bool)
+        for i, colores in enumerate(listas):
+            if colores:
+                rgb[i, :len(colores)] = colores
+                mascara[i, :len(colores)] = True
+
+        if referencias is None:
+            referencias = list(range(len(listas)))
+        return cls(rgb_a_lab(rgb), mascara, list(referencias))
+
+    @classmethod
+    def desde_biblioteca(cls, app_config):
+        """Indexa favoritos, historial y proyectos de una ``AppConfig``"""
+        paletas, referencias = [], []
+
+        for tipo, id_paleta, tema, paleta_data in app_config.almacen.iterar_todas():
+            paletas.append(paleta_data)
+            referencias.append((tipo, id_paleta, tema))
+
+        for ruta, nombre, hex_colores in app_config.indice_proyectos.iterar_colores():
+            paletas.append(hex_colores)
+            referencias.append(('proyecto', ruta, nombre))
+
+        return cls.construir(paletas, referencias)
+
+    def buscar_color(self, color, k=10):
+        """Paletas que contienen el color más cercano a ``color``
+
+        Devuelve ``[(referencia, ΔE), ...]`` de menor a mayor distancia.
+        """
+        consulta = rgb_a_lab(_a_rgb(color))
+
+        # Mínimo acumulado posición a posición con buffers reutilizados
+        num_paletas = len(self)
+        minimas = np.full(num_paletas, np.inf, dtype=np.float32)
+        distancias = np.empty(num_paletas, dtype=np.float32)
+        temporal = np.empty(num_paletas, dtype=np.float32)
+        for posicion in range(self.lab.shape[1]):
+            np.subtract(self._canales[0][posicion], consulta[0], out=distancias)
+            np.square(distancias, out=distancias)
+            for c in (1, 2):
+                np.subtract(self._canales[c][posicion], consulta[c], out=temporal)
+                np.square(temporal, out=temporal)
+                distancias += temporal
+            np.minimum(minimas, distancias, out=minimas)
+
+        minimas[self._vacias] = np.inf
+        return self._mejores(np.sqrt(minimas), k)
+
+    def buscar_paleta(self, paleta, k=10, candidatos=None):
+        """Paletas más parecidas a ``paleta`` según el emparejamiento de colores"""
+        colores = paleta.get('colores', []) if isinstance(paleta, dict) else paleta
+        consulta = rgb_a_lab([_a_rgb(color) for color in colores])
+        if len(self) == 0 or len(consulta) == 0:
+            return []
+
+        # Filtro previo barato: distancia entre colores medios
+        if candidatos is None:
+            candidatos = max(k * 20, 200)
+        media = consulta.mean(axis=0)
+        cercania = ((self.media - media) ** 2).sum(axis=1)
+        if candidatos < len(self):
+            elegidos = np.argpartition(cercania, candidatos)[:candidatos]
+        else:
+            elegidos = np.arange(len(self))
+
+        # Matriz de costes (candidatos x colores consulta x colores paleta) de una vez
+        costes = np.sqrt(((consulta[None, :, None, :] - self.lab[elegidos][:, None, :, :]) ** 2).sum(axis=-1))
+
+        distancias = np.full(len(self), np.inf, dtype=np.float32)
+        for fila, indice in enumerate(elegidos):
+            validos = self.mascara[indice]
+            num_validos = int(validos.sum())
+            if num_validos:
+                # Los colores sobrantes de cualquiera de los dos lados penalizan:
+                # una paleta de un color no gana a otra completa y parecida
+                emparejados = _asignar(costes[fila][:, validos]).sum()
+                sin_pareja = abs(len(consulta) - num_validos) * COSTE_SIN_PAREJA
+                distancias[indice] = (emparejados + sin_pareja) / max(len(consulta), num_validos)
+        return self._mejores(distancias, k)
+
+    def _mejores(self, distancias, k):
+        k = min(k, len(distancias))
+        if k == 0:
+            return []
+        mejores = np.argpartition(distancias, k - 1)[:k]
+        mejores = mejores[np.argsort(distancias[mejores])]
+        return [(self.referencias[i], float(distancias[i])) for i in mejores
+                if np.isfinite(distancias[i])]
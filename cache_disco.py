@@ -0,0 +1,132 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class CacheDisco:
+    """Base de las cachés en disco con un archivo por clave
+
+    Los archivos se reparten en subdirectorios por los dos primeros
+    caracteres de la clave; su mtime marca el último uso y, al pasar de
+    ``max_entradas``, se borran los usados hace más tiempo. Delante del disco
+    hay una LRU en memoria de ``max_memoria`` valores ya decodificados. Las
+    subclases deciden cómo se codifica cada valor.
+    """
+
+    EXTENSION = ''
+
+    def __init__(self, directorio, max_entradas, max_memoria):
+        self.directorio = directorio
+        self.max_entradas = max_entradas
+        self.max_memoria = max_memoria
+
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directorio, exist_ok=True)
+        self._num_en_disco = sum(1 for _ in self._archivos())
+
+    def _ruta(self, clave):
+        # Dos niveles para no acumular miles de ficheros en un solo directorio
+        return os.path.join(self.directorio, clave[:2], f"{clave}{self.EXTENSION}")
+
+    def _archivos(self):
+        for subdir in os.scandir(self.directorio):
+            if subdir.is_dir():
+                for entrada in os.scandir(subdir.path):
+                    if entrada.name.endswith(self.EXTENSION):
+                        yield entrada
+
+    # ===== MEMORIA =====
+
+    def _en_memoria(self, clave):
+        """Valor recordado para ``clave`` (y lo marca como reciente) o None"""
+        with self._lock:
+            valor = self._memoria.get(clave)
+            if valor is not None:
+                self._memoria.move_to_end(clave)
+            return valor
+
+    def _recordar(self, clave, valor):
+        with self._lock:
+            self._memoria[clave] = valor
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.max_memoria:
+                self._memoria.popitem(last=False)
+
+    # ===== DISCO =====
+
+    @staticmethod
+    def _tocar(ruta):
+        """Marca el archivo como usado ahora para la expulsión LRU"""
+        try:
+            os.utime(ruta, None)
+        except OSError:
+            pass
+
+    def _escribir(self, clave, escribir):
+        """Escribe el archivo de ``clave`` de forma atómica
+
+        ``escribir(f)`` recibe el archivo temporal abierto en binario; el
+        rename solo ocurre si termina sin errores, que se propagan.
+        """
+        ruta = self._ruta(clave)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        nueva = not os.path.exists(ruta)
+
+        fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                escribir(f)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+        if nueva:
+            with self._lock:
+                self._num_en_disco += 1
+                lleno = self._num_en_disco > self.max_entradas
+            if lleno:
+                self._expulsar()
+
+    def _expulsar(self):
+        """Elimina las entradas usadas hace más tiempo hasta bajar del límite"""
+        archivos = sorted(self._archivos(), key=lambda e: e.stat().st_mtime)
+        # Se libera un 10% extra para no repetir el recorrido en cada escritura
+        objetivo = int(self.max_entradas * 0.9)
+        sobrantes = archivos[:max(0, len(archivos) - objetivo)]
+        for entrada in sobrantes:
+            try:
+                os.remove(entrada.path)
+            except OSError:
+                pass
+            with self._lock:
+                self._memoria.pop(entrada.name[:-len(self.EXTENSION)], None)
+        with self._lock:
+            self._num_en_disco = len(archivos) - len(sobrantes)
+
+    def _eliminar(self, clave):
+        """Borra la entrada de ``clave``; devuelve True si existía en disco"""
+        with self._lock:
+            self._memoria.pop(clave, None)
+        try:
+            os.remove(self._ruta(clave))
+        except OSError:
+            return False
+        with self._lock:
+            self._num_en_disco -= 1
+        return True
+
+    def limpiar(self):
+        """Vacía la caché por completo"""
+        for entrada in list(self._archivos()):
+            try:
+                os.remove(entrada.path)
+            except OSError:
+                pass
+        with self._lock:
+            self._memoria.clear()
+            self._num_en_disco = 0
@@ -0,0 +1,79 @@
+import os
+import json
+import hashlib
+
+from cache_disco import CacheDisco
+from carga_diferida import modulo_diferido
+
+# PIL se importa al escalar o leer la primera miniatura, no al arrancar la GUI
+Image = modulo_diferido('PIL.Image')
+
+# Subir al cambiar cómo se escalan las miniaturas para invalidar las guardadas
+VERSION_MINIATURAS = '1'
+
+
+class CacheMiniaturas(CacheDisco):
+    """Miniaturas ya escaladas de las visualizaciones de paletas
+
+    La clave combina la ruta de la imagen original, su mtime y tamaño y el
+    tamaño máximo de la miniatura, así que una imagen regenerada nunca
+    devuelve una miniatura vieja. Delante de los PNG en disco hay una LRU en
+    memoria con las imágenes ya decodificadas.
+    """
+
+    EXTENSION = '.png'
+
+    def __init__(self, directorio=None, max_entradas=2000, max_memoria=64):
+        if directorio is None:
+            directorio = os.path.join(os.path.expanduser('~/.generador_paletas'), 'cache_miniaturas')
+        super().__init__(directorio, max_entradas, max_memoria)
+
+    # ===== CLAVES =====
+
+    @staticmethod
+    def clave(ruta_imagen, ancho_max, alto_max):
+        """Clave de la miniatura; lanza OSError si la imagen no existe"""
+        info = os.stat(ruta_imagen)
+        datos = json.dumps([os.path.abspath(ruta_imagen), info.st_mtime_ns, info.st_size,
+                            ancho_max, alto_max, VERSION_MINIATURAS])
+        return hashlib.sha256(datos.encode('utf-8')).hexdigest()
+
+    # ===== LECTURA / ESCRITURA =====
+
+    def obtener(self, ruta_imagen, ancho_max, alto_max):
+        """Devuelve la miniatura (``PIL.Image``) de ``ruta_imagen``
+
+        Orden de búsqueda: memoria, disco y, solo si falla todo, decodificar
+        y escalar el original. Lanza OSError si la imagen no existe.
+        """
+        clave = self.clave(ruta_imagen, ancho_max, alto_max)
+
+        miniatura = self._en_memoria(clave)
+        if miniatura is not None:
+            return miniatura
+
+        ruta = self._ruta(clave)
+        try:
+            with Image.open(ruta) as guardada:
+                miniatura = guardada.copy()
+            self._tocar(ruta)
+        except (OSError, ValueError):
+            miniatura = self._escalar(ruta_imagen, ancho_max, alto_max)
+            self._guardar(clave, miniatura)
+
+        self._recordar(clave, miniatura)
+        return miniatura
+
+    @staticmethod
+    def _escalar(ruta_imagen, ancho_max, alto_max):
+        with Image.open(ruta_imagen) as original:
+            original.draft('RGB', (ancho_max, alto_max))
+            # reducing_gap reduce primero por bloques y deja LANCZOS para el final
+            original.thumbnail((ancho_max, alto_max), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            return original.copy()
+
+    def _guardar(self, clave, miniatura):
+        try:
+            self._escribir(clave, lambda f: miniatura.save(f, format='PNG', compress_level=1))
+        except Exception as e:
+            print(f"Error guardando miniatura: {e}")
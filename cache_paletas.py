@@ -0,0 +1,144 @@
+import os
+import json
+import copy
+import inspect
+import hashlib
+
+from cache_disco import CacheDisco
+from instrumentacion import tramo, contar
+
+# Subir este valor invalida todas las entradas guardadas cuando cambia el
+# formato de la caché o el generador no expone su propia versión
+VERSION_CACHE = '1'
+
+
+class CachePaletas(CacheDisco):
+    """Caché persistente de paletas generadas, compartida por la GUI y la CLI
+
+    Cada entrada se guarda en un JSON propio cuyo nombre es el hash de
+    (tema, estilo, número de colores, versión del generador). Delante del
+    disco hay una LRU en memoria para que las repeticiones no toquen disco.
+    """
+
+    EXTENSION = '.json'
+
+    def __init__(self, directorio=None, max_entradas=5000, max_memoria=256):
+        if directorio is None:
+            directorio = os.path.join(os.path.expanduser('~/.generador_paletas'), 'cache_paletas')
+        super().__init__(directorio, max_entradas, max_memoria)
+
+    # ===== CLAVES =====
+
+    @staticmethod
+    def clave(tema, estilo=None, num_colores=None, version=VERSION_CACHE):
+        """Calcula la clave de contenido de una petición
+
+        ``estilo`` y ``num_colores`` a None entran tal cual: son otra
+        entrada distinta de cualquier valor explícito.
+        """
+        estilo = estilo.strip().lower() if estilo is not None else None
+        num_colores = int(num_colores) if num_colores is not None else None
+        datos = json.dumps([tema.strip().lower(), estilo, num_colores, str(version)],
+                           ensure_ascii=False)
+        return hashlib.sha256(datos.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def version_de(generador):
+        """Versión con la que se guardan las paletas de ``generador``"""
+        return str(getattr(generador, 'VERSION', VERSION_CACHE))
+
+    @staticmethod
+    def valores_por_defecto(generador):
+        """``(estilo, num_colores)`` que usa ``generador`` si no se le pasan
+
+        Se leen de la firma de ``generar_paleta_completa`` (el estilo es el
+        parámetro que sigue al tema); lo que no se pueda averiguar queda en
+        None.
+        """
+        try:
+            parametros = list(inspect.signature(generador.generar_paleta_completa).parameters.values())
+        except (AttributeError, TypeError, ValueError):
+            return None, None
+
+        def defecto(parametro):
+            if parametro is None or parametro.default is inspect.Parameter.empty:
+                return None
+            return parametro.default
+
+        estilo = defecto(parametros[1] if len(parametros) > 1 else None)
+        num_colores = defecto(next((p for p in parametros if p.name == 'num_colores'), None))
+        return estilo, num_colores
+
+    def clave_para(self, generador, tema, estilo=None, num_colores=None):
+        """Clave de una petición a ``generador``, con sus valores por defecto aplicados
+
+        Así "sin estilo" (CLI) y el estilo explícito por defecto (GUI) son la
+        misma entrada, sin copiar aquí los valores del generador.
+        """
+        estilo_defecto, num_colores_defecto = self.valores_por_defecto(generador)
+        if estilo is None:
+            estilo = estilo_defecto
+        if num_colores is None:
+            num_colores = num_colores_defecto
+        return self.clave(tema, estilo, num_colores, self.version_de(generador))
+
+    # ===== LECTURA / ESCRITURA =====
+
+    def obtener(self, clave):
+        """Devuelve una copia de la paleta guardada o None"""
+        paleta_data = self._en_memoria(clave)
+        if paleta_data is not None:
+            return copy.deepcopy(paleta_data)
+
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                paleta_data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._tocar(ruta)
+
+        self._recordar(clave, paleta_data)
+        return copy.deepcopy(paleta_data)
+
+    def guardar(self, clave, paleta_data):
+        """Guarda una paleta de forma atómica"""
+        contenido = json.dumps(paleta_data, ensure_ascii=False).encode('utf-8')
+        try:
+            self._escribir(clave, lambda f: f.write(contenido))
+        except Exception as e:
+            print(f"Error guardando en caché: {e}")
+            return
+        self._recordar(clave, copy.deepcopy(paleta_data))
+
+    # ===== API DE ALTO NIVEL =====
+
+    def obtener_o_generar(self, generador, tema, estilo=None, num_colores=None):
+        """Devuelve la paleta de la caché o la genera y la guarda"""
+        clave = self.clave_para(generador, tema, estilo, num_colores)
+
+        paleta_data = self.obtener(clave)
+        if paleta_data is not None:
+            contar('cache_paletas.aciertos')
+            return paleta_data
+        contar('cache_paletas.fallos')
+
+        argumentos = [tema] if estilo is None else [tema, estilo]
+        with tramo('generar_paleta_completa'):
+            if num_colores is not None:
+                paleta_data = generador.generar_paleta_completa(*argumentos, num_colores=num_colores)
+            else:
+                paleta_data = generador.generar_paleta_completa(*argumentos)
+
+        if paleta_data:
+            self.guardar(clave, paleta_data)
+        return paleta_data
+
+    def invalidar(self, tema, estilo=None, num_colores=None, generador=None):
+        """Elimina la entrada de una petición concreta
+
+        Con ``generador`` se usan su versión y sus valores por defecto, igual
+        que en ``obtener_o_generar``.
+        """
+        clave = self.clave_para(generador, tema, estilo, num_colores)
+        return self._eliminar(clave)
@@ -0,0 +1,68 @@
+import sys
+import importlib
+import importlib.util
+import threading
+
+
+class ModuloDiferido:
+    """Módulo que se importa la primera vez que se accede a uno de sus atributos
+
+    Permite declarar ``plt = ModuloDiferido('matplotlib.pyplot')`` arriba del
+    archivo sin pagar el import al arrancar.
+    """
+
+    def __init__(self, nombre):
+        self.__dict__['_nombre'] = nombre
+        self.__dict__['_modulo'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _cargar(self):
+        modulo = self.__dict__['_modulo']
+        if modulo is None:
+            with self.__dict__['_lock']:
+                modulo = self.__dict__['_modulo']
+                if modulo is None:
+                    modulo = importlib.import_module(self.__dict__['_nombre'])
+                    self.__dict__['_modulo'] = modulo
+        return modulo
+
+    def __getattr__(self, atributo):
+        return getattr(self._cargar(), atributo)
+
+    def __setattr__(self, atributo, valor):
+        setattr(self._cargar(), atributo, valor)
+
+    def __repr__(self):
+        estado = 'cargado' if self.__dict__['_modulo'] is not None else 'sin cargar'
+        return f"<ModuloDiferido {self.__dict__['_nombre']} ({estado})>"
+
+
+def modulo_diferido(nombre):
+    """Devuelve el módulo si ya está importado o un ``ModuloDiferido`` si no"""
+    modulo = sys.modules.get(nombre)
+    return modulo if modulo is not None else ModuloDiferido(nombre)
+
+
+def objeto_diferido(nombre_modulo, atributo):
+    """Función o clase de un módulo que se importa al llamarla por primera vez
+
+    Sirve para mantener los nombres importados (``GeneradorPaletasIA()``,
+    ``guardar_datos_paleta(...)``) sin importar su módulo al arrancar.
+    """
+    modulo = ModuloDiferido(nombre_modulo)
+
+    def llamar(*args, **kwargs):
+        return getattr(modulo, atributo)(*args, **kwargs)
+
+    llamar.__name__ = atributo
+    llamar.__qualname__ = atributo
+    llamar.__doc__ = f"Carga diferida de {nombre_modulo}.{atributo}"
+    return llamar
+
+
+def disponible(nombre):
+    """True si el módulo se puede importar, sin llegar a importarlo"""
+    try:
+        return importlib.util.find_spec(nombre) is not None
+    except (ImportError, ValueError):
+        return False
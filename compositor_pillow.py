@@ -0,0 +1,102 @@
+import io
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Fuentes candidatas por estilo: primero Windows (instalador.bat), luego Linux/macOS
+FUENTES = {
+    'normal': ['arial.ttf', 'DejaVuSans.ttf', 'Arial.ttf'],
+    'negrita': ['arialbd.ttf', 'DejaVuSans-Bold.ttf', 'Arial Bold.ttf'],
+    'cursiva': ['ariali.ttf', 'DejaVuSans-Oblique.ttf', 'Arial Italic.ttf'],
+    'mono': ['consola.ttf', 'cour.ttf', 'DejaVuSansMono.ttf', 'Courier New.ttf']
+}
+
+# Alineaciones de matplotlib traducidas a anclas de Pillow
+_ANCLA_H = {'left': 'l', 'center': 'm', 'right': 'r'}
+_ANCLA_V = {'top': 'a', 'center': 'm', 'bottom': 'd'}
+
+
+@lru_cache(maxsize=64)
+def cargar_fuente(tamano, estilo='normal'):
+    """Devuelve una fuente TrueType del tamaño en píxeles indicado"""
+    for nombre in FUENTES.get(estilo, FUENTES['normal']):
+        try:
+            return ImageFont.truetype(nombre, tamano)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=tamano)
+    except TypeError:
+        # Pillow < 10.1 solo trae la fuente bitmap sin escalado
+        return ImageFont.load_default()
+
+
+class LienzoPillow:
+    """Lienzo con la resolución exacta de la plataforma y coordenadas tipo matplotlib
+
+    Las posiciones se dan como fracciones (0-1) con el origen abajo a la
+    izquierda, igual que ``transform=ax.transAxes``, y los tamaños de letra en
+    puntos a 100 dpi, para que los diseños de matplotlib se traduzcan tal cual.
+    """
+
+    def __init__(self, ancho, alto, fondo):
+        self.ancho = ancho
+        self.alto = alto
+        self.imagen = Image.new('RGB', (ancho, alto), fondo)
+        self.draw = ImageDraw.Draw(self.imagen)
+        self.zona = (0.0, 0.0, 1.0, 1.0)
+
+    def copia(self):
+        """Nuevo lienzo que parte de una copia de este (para usarlo como plantilla)"""
+        lienzo = LienzoPillow.__new__(LienzoPillow)
+        lienzo.ancho = self.ancho
+        lienzo.alto = self.alto
+        lienzo.imagen = self.imagen.copy()
+        lienzo.draw = ImageDraw.Draw(lienzo.imagen)
+        lienzo.zona = self.zona
+        return lienzo
+
+    def usar_zona(self, x0=0.0, y0=0.0, x1=1.0, y1=1.0):
+        """Restringe las coordenadas a una parte del lienzo (como un subplot)"""
+        self.zona = (x0, y0, x1, y1)
+
+    def _a_pixeles(self, x, y):
+        x0, y0, x1, y1 = self.zona
+        px = (x0 + x * (x1 - x0)) * self.ancho
+        py = (1 - (y0 + y * (y1 - y0))) * self.alto
+        return px, py
+
+    @staticmethod
+    def _puntos_a_pixeles(puntos):
+        return max(1, round(puntos * 100 / 72))
+
+    def texto(self, x, y, texto, tamano, color, ha='left', va='center', estilo='normal',
+              interlineado=1.2):
+        fuente = cargar_fuente(self._puntos_a_pixeles(tamano), estilo)
+        ancla = _ANCLA_H[ha] + _ANCLA_V[va]
+        posicion = self._a_pixeles(x, y)
+
+        if '\n' in texto:
+            espaciado = round(fuente.size * (interlineado - 1)) if hasattr(fuente, 'size') else 4
+            self.draw.multiline_text(posicion, texto, font=fuente, fill=color, anchor=ancla,
+                                     align=ha, spacing=espaciado)
+        else:
+            self.draw.text(posicion, texto, font=fuente, fill=color, anchor=ancla)
+
+    def rectangulo(self, x, y, ancho, alto, color):
+        """Rectángulo relleno con esquina inferior izquierda en (x, y)"""
+        izq, abajo = self._a_pixeles(x, y)
+        der, arriba = self._a_pixeles(x + ancho, y + alto)
+        self.draw.rectangle([round(izq), round(arriba), round(der) - 1, round(abajo) - 1],
+                            fill=tuple(color) if not isinstance(color, str) else color)
+
+    def guardar(self, ruta):
+        # PNG con compresión baja: la codificación domina el tiempo de render
+        self.imagen.save(ruta, format='PNG', compress_level=1)
+        return ruta
+
+    def a_png(self):
+        """Devuelve el lienzo codificado como PNG en memoria"""
+        buffer = io.BytesIO()
+        self.imagen.save(buffer, format='PNG', compress_level=1)
+        return buffer.getvalue()
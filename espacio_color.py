@@ -0,0 +1,65 @@
+import numpy as np
+
+# Blanco de referencia D65 (sRGB)
+BLANCO_D65 = np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+
+_RGB_A_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041]
+], dtype=np.float32)
+
+
+def hex_a_rgb(hex_color):
+    """'#1a1a2e' -> [26, 26, 46]"""
+    hex_color = hex_color.lstrip('#')
+    if len(hex_color) == 3:
+        hex_color = ''.join(c * 2 for c in hex_color)
+    return [int(hex_color[i:i + 2], 16) for i in (0, 2, 4)]
+
+
+def rgb_a_hex(rgb):
+    """Colores (N x 3) en 0-255 -> lista de '#rrggbb'"""
+    return ['#{:02x}{:02x}{:02x}'.format(*color) for color in np.asarray(rgb, dtype=np.uint8).tolist()]
+
+
+def rgb_a_hsl(rgb):
+    """Convierte colores sRGB 0-255 (..., 3) a HSL: tono en grados, S y L en 0-1"""
+    rgb = np.asarray(rgb, dtype=np.float32) / 255.0
+    maximo = rgb.max(axis=-1)
+    minimo = rgb.min(axis=-1)
+    rango = maximo - minimo
+    luz = (maximo + minimo) / 2
+
+    hsl = np.zeros(rgb.shape, dtype=np.float32)
+    hsl[..., 2] = luz
+    cromatico = rango > 0
+    hsl[..., 1] = np.divide(rango, 1 - np.abs(2 * luz - 1),
+                            out=np.zeros_like(rango), where=cromatico & (np.abs(2 * luz - 1) < 1))
+
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    seguro = np.where(cromatico, rango, 1)
+    tono = np.where(maximo == r, ((g - b) / seguro) % 6,
+                    np.where(maximo == g, (b - r) / seguro + 2, (r - g) / seguro + 4))
+    hsl[..., 0] = np.where(cromatico, tono * 60, 0)
+    return hsl
+
+
+def rgb_a_lab(rgb):
+    """Convierte colores sRGB 0-255 con forma (..., 3) a CIELAB (float32)"""
+    rgb = np.asarray(rgb, dtype=np.float32) / 255.0
+    lineal = np.where(rgb > 0.04045, ((rgb + 0.055) / 1.055) ** 2.4, rgb / 12.92)
+
+    xyz = (lineal @ _RGB_A_XYZ.T) / BLANCO_D65
+    f = np.where(xyz > 0.008856, np.cbrt(xyz), 7.787 * xyz + 16 / 116)
+
+    lab = np.empty_like(f)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def delta_e(lab_a, lab_b):
+    """Distancia CIE76 (euclídea en Lab) con broadcasting"""
+    return np.sqrt(((np.asarray(lab_a) - np.asarray(lab_b)) ** 2).sum(axis=-1))
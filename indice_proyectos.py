@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import sqlite3
+import threading
+
+
+class IndiceProyectos:
+    """Índice SQLite de los proyectos guardados en ``proyectos_dir``
+
+    Guarda nombre, tema, número de colores, lista de hex y mtime de cada
+    JSON para listar y buscar sin abrir los archivos. Se actualiza al
+    guardar cada proyecto y se puede reconstruir escaneando el directorio.
+    """
+
+    def __init__(self, ruta_db, proyectos_dir):
+        self.proyectos_dir = proyectos_dir
+        self._lock = threading.Lock()
+        self.conexion = sqlite3.connect(ruta_db, check_same_thread=False)
+        self.conexion.row_factory = sqlite3.Row
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self.conexion:
+            self.conexion.executescript("""
+                CREATE TABLE IF NOT EXISTS proyectos (
+                    ruta TEXT PRIMARY KEY,
+                    nombre TEXT COLLATE NOCASE,
+                    tema TEXT COLLATE NOCASE,
+                    num_colores INTEGER,
+                    hex TEXT,
+                    mtime REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_proyectos_nombre ON proyectos (nombre);
+                CREATE INDEX IF NOT EXISTS idx_proyectos_tema ON proyectos (tema);
+                CREATE INDEX IF NOT EXISTS idx_proyectos_mtime ON proyectos (mtime);
+            """)
+
+    @staticmethod
+    def _resumir(proyecto_data):
+        """Extrae tema y colores de un proyecto, tenga una paleta o varias"""
+        paletas = proyecto_data.get('paletas')
+        if paletas is None:
+            paletas = [proyecto_data.get('paleta') or proyecto_data]
+
+        colores = [color for paleta in paletas for color in (paleta.get('colores') or [])]
+        tema = proyecto_data.get('tema') or next((p.get('tema') for p in paletas if p.get('tema')), None)
+        return tema, [color.get('hex', '') for color in colores]
+
+    def actualizar(self, ruta, proyecto_data=None):
+        """Añade o refresca la entrada de un proyecto"""
+        try:
+            if proyecto_data is None:
+                with open(ruta, 'r', encoding='utf-8') as f:
+                    proyecto_data = json.load(f)
+            mtime = os.path.getmtime(ruta)
+        except (OSError, ValueError) as e:
+            print(f"Error indexando proyecto {ruta}: {e}")
+            return False
+
+        tema, hex_colores = self._resumir(proyecto_data)
+        nombre = proyecto_data.get('nombre') or os.path.splitext(os.path.basename(ruta))[0]
+        with self._lock, self.conexion:
+            self.conexion.execute(
+                "INSERT OR REPLACE INTO proyectos (ruta, nombre, tema, num_colores, hex, mtime) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (ruta, nombre, tema, len(hex_colores), ','.join(hex_colores), mtime))
+        return True
+
+    def eliminar(self, ruta):
+        with self._lock, self.conexion:
+            self.conexion.execute("DELETE FROM proyectos WHERE ruta = ?", (ruta,))
+
+    def reconstruir(self, completo=False):
+        """Sincroniza el índice con el directorio de proyectos
+
+        Solo se vuelven a leer los archivos cuyo mtime ha cambiado, salvo con
+        ``completo=True``, que vacía el índice y lo rehace desde cero.
+        Devuelve el número de archivos leídos.
+        """
+        with self._lock:
+            if completo:
+                with self.conexion:
+                    self.conexion.execute("DELETE FROM proyectos")
+            conocidos = dict(self.conexion.execute("SELECT ruta, mtime FROM proyectos").fetchall())
+
+        leidos = 0
+        presentes = set()
+        for entrada in os.scandir(self.proyectos_dir):
+            if not entrada.name.endswith('.json'):
+                continue
+            presentes.add(entrada.path)
+            if conocidos.get(entrada.path) == entrada.stat().st_mtime:
+                continue
+            if self.actualizar(entrada.path):
+                leidos += 1
+
+        with self._lock, self.conexion:
+            self.conexion.executemany("DELETE FROM proyectos WHERE ruta = ?",
+                                      [(ruta,) for ruta in conocidos if ruta not in presentes])
+        return leidos
+
+    @staticmethod
+    def _a_dict(fila):
+        datos = dict(fila)
+        datos['hex'] = datos['hex'].split(',') if datos['hex'] else []
+        return datos
+
+    def listar(self, limite=50, desplazamiento=0):
+        """Proyectos del más reciente al más antiguo"""
+        with self._lock:
+            filas = self.conexion.execute(
+                "SELECT * FROM proyectos ORDER BY mtime DESC LIMIT ? OFFSET ?",
+                (limite, desplazamiento)).fetchall()
+        return [self._a_dict(fila) for fila in filas]
+
+    def buscar(self, texto, campo='nombre', limite=50):
+        """Proyectos cuyo nombre (o tema) empieza por ``texto``, sin distinguir mayúsculas"""
+        if campo not in ('nombre', 'tema'):
+            raise ValueError(f"Campo de búsqueda no válido: {campo}")
+        # Rango sobre la columna NOCASE para que SQLite use el índice
+        with self._lock:
+            filas = self.conexion.execute(
+                f"SELECT * FROM proyectos WHERE {campo} >= ? AND {campo} < ? ORDER BY {campo} LIMIT ?",
+                (texto, texto + '\uffff', limite)).fetchall()
+        return [self._a_dict(fila) for fila in filas]
+
+    def iterar_colores(self):
+        """Recorre los proyectos indexados como ``(ruta, nombre, [hex, ...])``"""
+        with self._lock:
+            filas = self.conexion.execute(
+                "SELECT ruta, nombre, hex FROM proyectos WHERE hex != ''").fetchall()
+        for fila in filas:
+            yield fila['ruta'], fila['nombre'], fila['hex'].split(',')
+
+    def contar(self):
+        with self._lock:
+            return self.conexion.execute("SELECT COUNT(*) FROM proyectos").fetchone()[0]
+
+
+if __name__ == "__main__":
+    # python indice_proyectos.py reconstruir  ->  rehace el índice desde cero
+    from app_config import AppConfig
+
+    config = AppConfig()
+    if len(sys.argv) > 1 and sys.argv[1] == 'reconstruir':
+        leidos = config.indice_proyectos.reconstruir(completo=True)
+        print(f"✅ Índice reconstruido: {leidos} proyectos")
+    else:
+        leidos = config.indice_proyectos.reconstruir()
+        print(f"✅ Índice sincronizado: {leidos} proyectos actualizados, "
+              f"{config.indice_proyectos.contar()} en total")
@@ -0,0 +1,218 @@
+import os
+import sys
+import time
+import atexit
+import functools
+import threading
+import multiprocessing
+
+# Se activa con PALETAS_INSTRUMENTACION=1 (o llamando a activar()). Con
+# PALETAS_PERFIL=ruta además se perfila el proceso principal con cProfile.
+VARIABLE_ACTIVAR = 'PALETAS_INSTRUMENTACION'
+VARIABLE_PERFIL = 'PALETAS_PERFIL'
+
+ACTIVA = False
+
+_tramos = {}        # nombre -> [llamadas, segundos totales, máximo]
+_contadores = {}    # nombre -> valor
+_lock = threading.Lock()
+_perfil = None
+_ruta_perfil = None
+_finalizador_registrado = False
+
+
+class _TramoNulo:
+    """Context manager vacío que se devuelve cuando la instrumentación está apagada"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+_NULO = _TramoNulo()
+
+
+class _Tramo:
+    __slots__ = ('nombre', 'inicio')
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        _registrar(self.nombre, time.perf_counter() - self.inicio)
+        return False
+
+
+def _registrar(nombre, segundos):
+    with _lock:
+        datos = _tramos.get(nombre)
+        if datos is None:
+            _tramos[nombre] = [1, segundos, segundos]
+        else:
+            datos[0] += 1
+            datos[1] += segundos
+            if segundos > datos[2]:
+                datos[2] = segundos
+
+
+# ===== API =====
+
+def tramo(nombre):
+    """``with tramo('etapa'):`` mide el bloque; apagada no hace nada"""
+    if not ACTIVA:
+        return _NULO
+    return _Tramo(nombre)
+
+
+def instrumentado(nombre=None):
+    """Decorador que mide cada llamada a la función como un tramo"""
+    def decorar(funcion):
+        etiqueta = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not ACTIVA:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _registrar(etiqueta, time.perf_counter() - inicio)
+        return envoltura
+    return decorar
+
+
+def contar(nombre, cantidad=1):
+    """Suma ``cantidad`` al contador ``nombre``"""
+    if not ACTIVA:
+        return
+    with _lock:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+
+def _es_proceso_principal():
+    # current_process().name ya es el del hijo al importar módulos con spawn,
+    # antes de que parent_process() esté disponible
+    return multiprocessing.current_process().name == 'MainProcess'
+
+
+def activar(perfil=None):
+    """Enciende la instrumentación en este proceso y en los que cree después
+
+    Con ``perfil`` (ruta de archivo) el proceso principal se ejecuta además
+    bajo cProfile y vuelca las estadísticas al salir, en el formato de
+    ``pstats`` (snakeviz, gprof2dot...). Los trabajadores no se perfilan: sus
+    tramos llegan al principal con ``extraer``/``fusionar``; para verlos por
+    dentro se puede usar ``py-spy record --subprocesses``.
+    """
+    global ACTIVA, _finalizador_registrado
+    ACTIVA = True
+    # Los procesos hijos heredan el entorno y se activan al importar el módulo
+    os.environ[VARIABLE_ACTIVAR] = '1'
+    if not _es_proceso_principal():
+        return
+
+    if perfil:
+        os.environ[VARIABLE_PERFIL] = perfil
+        _iniciar_perfil(perfil)
+    if not _finalizador_registrado:
+        _finalizador_registrado = True
+        atexit.register(finalizar)
+
+
+def _iniciar_perfil(ruta):
+    global _perfil, _ruta_perfil
+    if _perfil is not None:
+        return
+    import cProfile
+    _ruta_perfil = ruta
+    _perfil = cProfile.Profile()
+    _perfil.enable()
+
+
+def _tras_fork():
+    """En un hijo creado con fork no se arrastran métricas ni perfil del padre"""
+    global _perfil
+    with _lock:
+        _tramos.clear()
+        _contadores.clear()
+    if _perfil is not None:
+        _perfil.disable()
+        _perfil = None
+
+
+def extraer():
+    """Devuelve y reinicia las métricas de este proceso (para enviarlas al padre)"""
+    if not ACTIVA:
+        return None
+    with _lock:
+        metricas = {'tramos': dict(_tramos), 'contadores': dict(_contadores)}
+        _tramos.clear()
+        _contadores.clear()
+    return metricas
+
+
+def fusionar(metricas):
+    """Suma métricas extraídas en otro proceso a las de este"""
+    if not metricas:
+        return
+    with _lock:
+        for nombre, (llamadas, total, maximo) in metricas['tramos'].items():
+            datos = _tramos.setdefault(nombre, [0, 0.0, 0.0])
+            datos[0] += llamadas
+            datos[1] += total
+            datos[2] = max(datos[2], maximo)
+        for nombre, valor in metricas['contadores'].items():
+            _contadores[nombre] = _contadores.get(nombre, 0) + valor
+
+
+def resumen():
+    """Tabla de tramos (de más a menos tiempo total) y contadores"""
+    with _lock:
+        tramos = sorted(_tramos.items(), key=lambda item: item[1][1], reverse=True)
+        contadores = sorted(_contadores.items())
+
+    lineas = [f"{'tramo':<44} {'llamadas':>9} {'total s':>9} {'media ms':>10} {'máx ms':>10}"]
+    for nombre, (llamadas, total, maximo) in tramos:
+        lineas.append(f"{nombre:<44} {llamadas:>9} {total:>9.3f} "
+                      f"{total / llamadas * 1000:>10.2f} {maximo * 1000:>10.2f}")
+    if contadores:
+        lineas.append("")
+        lineas.append(f"{'contador':<44} {'valor':>9}")
+        for nombre, valor in contadores:
+            lineas.append(f"{nombre:<44} {valor:>9}")
+    return "\n".join(lineas)
+
+
+def finalizar():
+    """Vuelca el perfil y, en el proceso principal, imprime el resumen
+
+    Todo va a stderr para no mezclarse con salidas por stdout como el JSONL
+    de ``main_cli``.
+    """
+    global _perfil
+    if not _es_proceso_principal():
+        return
+    if _perfil is not None:
+        _perfil.disable()
+        _perfil.dump_stats(_ruta_perfil)
+        print(f"🔬 Perfil guardado en {_ruta_perfil}", file=sys.stderr)
+        _perfil = None
+
+    if _tramos or _contadores:
+        print("\n⏱️ TIEMPOS POR ETAPA", file=sys.stderr)
+        print("=" * 50, file=sys.stderr)
+        print(resumen(), file=sys.stderr)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_tras_fork)
+
+if os.environ.get(VARIABLE_ACTIVAR) == '1' or os.environ.get(VARIABLE_PERFIL):
+    activar(os.environ.get(VARIABLE_PERFIL))
@@ -1,48 +1,71 @@
+import argparse
 from config import Config
-from src.generador_paletas import GeneradorPaletasIA
-from src.utils import guardar_datos_paleta, generar_texto_redes_sociales, mostrar_resumen_paleta
-import time
+from procesador_lotes import generar_lote, resumen_lote
+from carga_diferida import objeto_diferido
+import instrumentacion
 
-def main():
+# src.utils arrastra el generador y sus dependencias: se carga al usarlo
+generar_texto_redes_sociales = objeto_diferido('src.utils', 'generar_texto_redes_sociales')
+mostrar_resumen_paleta = objeto_diferido('src.utils', 'mostrar_resumen_paleta')
+
+TEMAS_POR_DEFECTO = [
+    "atardecer en la playa tropical",
+    "bosque mágico otoñal", 
+    "ciudad cyberpunk nocturna",
+    "jardín de flores silvestres"
+]
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="Genera paletas de colores para varios temas y las guarda en 'outputs'")
+    parser.add_argument('temas', nargs='*', default=TEMAS_POR_DEFECTO,
+                        help="temas a generar (por defecto, una lista de ejemplo)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="procesos en paralelo (por defecto, uno por CPU)")
+    parser.add_argument('--instrumentar', action='store_true',
+                        help="mide el tiempo de cada etapa y muestra un resumen al terminar")
+    parser.add_argument('--perfil', metavar='RUTA', default=None,
+                        help="perfila el proceso con cProfile y guarda las estadísticas en RUTA "
+                             "(implica --instrumentar)")
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.instrumentar or args.perfil:
+        instrumentacion.activar(args.perfil)
     try:
         # Validar configuración
         Config.validate_config()
         
-        # Inicializar generador (sin dependencias externas)
-        generador = GeneradorPaletasIA()
-        
         # Lista de temas para generar
-        temas = [
-            "atardecer en la playa tropical",
-            "bosque mágico otoñal", 
-            "ciudad cyberpunk nocturna",
-            "jardín de flores silvestres"
-        ]
+        temas = args.temas
         
         print("🚀 GENERADOR DE PALETAS - VERSIÓN LOCAL")
         print("=" * 50)
         print("💡 No se requieren APIs externas - 100% funcional")
         
+        # Generar y guardar todas las paletas en paralelo (sin dependencias externas)
+        resultados = generar_lote(temas, workers=args.workers)
         paletas_generadas = []
         
-        for i, tema in enumerate(temas, 1):
-            print(f"\n[{i}/{len(temas)}] Procesando: {tema}")
+        for i, resultado in enumerate(resultados, 1):
+            print(f"\n[{i}/{len(temas)}] Procesando: {resultado['tema']}")
+            
+            if resultado['error']:
+                print(f"❌ Error en '{resultado['tema']}': {resultado['error']}")
+                continue
             
-            # Generar paleta
-            paleta_data = generador.generar_paleta_completa(tema)
+            # Mostrar resumen
+            mostrar_resumen_paleta(resultado['paleta'])
             
-            if paleta_data:
-                # Guardar datos
-                guardar_datos_paleta(paleta_data)
-                
-                # Mostrar resumen
-                mostrar_resumen_paleta(paleta_data)
-                
-                # Guardar para uso posterior
-                paletas_generadas.append(paleta_data)
+            # Guardar para uso posterior
+            paletas_generadas.append(resultado['paleta'])
         
         # Mostrar resumen final
-        print(f"\n🎉 ¡Generación completada! {len(paletas_generadas)} paletas creadas")
+        resumen = resumen_lote(resultados)
+        print(f"\n🎉 ¡Generación completada! {resumen['exitos']} paletas creadas")
+        if resumen['errores']:
+            print(f"⚠️ {resumen['errores']} temas fallaron")
         print("📍 Revisa la carpeta 'outputs' para ver los resultados")
         
         # Generar contenido para redes sociales
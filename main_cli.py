@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+import argparse
+from collections import deque
+from procesador_lotes import generar_en_flujo
+import instrumentacion
+
+# Interfaz sin ventanas: no importa tkinter ni nada de la GUI, así que
+# funciona en contenedores y servidores sin pantalla.
+#
+#   cat temas.txt | python main_cli.py --estilo minimalista --formatos hex,css > paletas.jsonl
+#   python main_cli.py temas.jsonl --workers 8 --colores 5
+
+
+def _hex(paleta):
+    return [color['hex'] for color in paleta['colores']]
+
+
+def _css(paleta):
+    variables = "\n".join(f"  --color-{i}: {color['hex']};"
+                          for i, color in enumerate(paleta['colores'], 1))
+    return f":root {{\n{variables}\n}}\n"
+
+
+def _gpl(paleta):
+    lineas = ["GIMP Palette", f"Name: {paleta['tema']}", "#"]
+    for color in paleta['colores']:
+        r, g, b = color['rgb']
+        lineas.append(f"{r:3d} {g:3d} {b:3d}\t{color.get('nombre', color['hex'])}")
+    return "\n".join(lineas) + "\n"
+
+
+# Cada formato añade una clave con ese nombre a la línea JSON de la paleta
+FORMATOS = {
+    'json': lambda paleta: paleta,
+    'hex': _hex,
+    'css': _css,
+    'gpl': _gpl,
+}
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="Genera paletas sin interfaz gráfica: lee temas de un archivo o de stdin "
+                    "y escribe una línea JSON por tema en stdout")
+    parser.add_argument('entrada', nargs='?', default='-',
+                        help="archivo de temas, uno por línea o JSONL con {\"tema\", \"estilo\", "
+                             "\"num_colores\", \"id\"} ('-' o vacío: stdin)")
+    parser.add_argument('--estilo', default=None,
+                        help="estilo para los temas que no traigan el suyo")
+    parser.add_argument('--colores', type=int, default=None, metavar='N',
+                        help="número de colores para los temas que no traigan el suyo")
+    parser.add_argument('--formatos', default='json',
+                        help=f"formatos separados por comas ({', '.join(FORMATOS)}); por defecto json")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="procesos en paralelo (por defecto, uno por CPU)")
+    parser.add_argument('--max-pendientes', type=int, default=None, metavar='N',
+                        help="temas en vuelo como máximo (por defecto, el doble de workers)")
+    parser.add_argument('--guardar', action='store_true',
+                        help="guarda además cada paleta en 'outputs' como main.py")
+    parser.add_argument('--sin-cache', action='store_true',
+                        help="no lee ni escribe la caché de paletas")
+    parser.add_argument('--salida', default=None, metavar='RUTA',
+                        help="escribe el JSONL en RUTA en vez de en stdout")
+    parser.add_argument('--instrumentar', action='store_true',
+                        help="mide el tiempo de cada etapa y muestra un resumen en stderr")
+    parser.add_argument('--perfil', metavar='RUTA', default=None,
+                        help="perfila el proceso con cProfile y guarda las estadísticas en RUTA")
+    return parser
+
+
+def leer_temas(lineas, errores):
+    """Convierte las líneas de entrada en temas para ``generar_en_flujo``
+
+    Admite texto plano (una línea, un tema) y JSONL (un objeto con al menos
+    ``tema``, o una cadena JSON) mezclados. Las líneas vacías y las que
+    empiezan por ``#`` se ignoran; las que no se entienden se anotan en
+    ``errores`` como ``(número de línea, mensaje)`` y se saltan.
+    """
+    for numero, linea in enumerate(lineas, 1):
+        linea = linea.strip()
+        if not linea or linea.startswith('#'):
+            continue
+        if linea[0] not in '{"':
+            yield linea
+            continue
+        try:
+            tema = json.loads(linea)
+        except ValueError as e:
+            errores.append((numero, f"JSON no válido: {e}"))
+            continue
+        if isinstance(tema, dict) and isinstance(tema.get('tema'), str) and tema['tema'].strip():
+            yield tema
+        elif isinstance(tema, str) and tema.strip():
+            yield tema.strip()
+        else:
+            errores.append((numero, "falta el campo 'tema'"))
+
+
+def formatear(resultado, formatos, identificador=None):
+    """Línea de salida (dict) de un resultado de ``generar_en_flujo``"""
+    registro = {'tema': resultado['tema']}
+    if identificador is not None:
+        registro['id'] = identificador
+    registro['error'] = resultado['error']
+    if resultado['error'] is None:
+        for formato in formatos:
+            registro[formato] = FORMATOS[formato](resultado['paleta'])
+    return registro
+
+
+def _separar_stdout():
+    """Reserva el stdout real para el JSONL y manda a stderr todo lo demás
+
+    El generador y ``guardar_datos_paleta`` escriben mensajes con print, y
+    los procesos trabajadores heredan el descriptor 1: redirigiéndolo a
+    stderr esos mensajes no se mezclan con las líneas JSON.
+    """
+    sys.stdout.flush()
+    salida = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return salida
+
+
+def _ids(temas, pendientes):
+    # Los identificadores no viajan a los trabajadores: se guardan en orden
+    # y se emparejan a la salida (generar_en_flujo respeta el orden)
+    for tema in temas:
+        pendientes.append(tema.get('id') if isinstance(tema, dict) else None)
+        yield tema
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+
+    formatos = [f.strip() for f in args.formatos.split(',') if f.strip()]
+    desconocidos = [f for f in formatos if f not in FORMATOS]
+    if desconocidos or not formatos:
+        parser.error(f"formatos no válidos: {', '.join(desconocidos) or '(ninguno)'}")
+    if args.colores is not None and args.colores < 1:
+        parser.error("--colores debe ser mayor que cero")
+
+    if args.instrumentar or args.perfil:
+        instrumentacion.activar(args.perfil)
+
+    if args.salida:
+        salida = open(args.salida, 'w', encoding='utf-8')
+    else:
+        salida = _separar_stdout()
+
+    entrada = sys.stdin if args.entrada == '-' else open(args.entrada, 'r', encoding='utf-8')
+
+    errores_entrada = []
+    ids = deque()
+    total = fallidos = 0
+    try:
+        temas = _ids(leer_temas(entrada, errores_entrada), ids)
+        for resultado in generar_en_flujo(temas, estilo=args.estilo, workers=args.workers,
+                                          guardar=args.guardar, max_pendientes=args.max_pendientes,
+                                          usar_cache=not args.sin_cache, num_colores=args.colores):
+            registro = formatear(resultado, formatos, ids.popleft())
+            salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            # Una línea completa cada vez: quien lee por tubería la procesa ya
+            salida.flush()
+            total += 1
+            if resultado['error'] is not None:
+                fallidos += 1
+                print(f"❌ {resultado['tema']}: {resultado['error']}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("⚠️ Interrumpido", file=sys.stderr)
+        return 130
+    except BrokenPipeError:
+        # El consumidor cerró la tubería (p. ej. ``| head``): no es un error
+        return 0
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        try:
+            salida.close()
+        except BrokenPipeError:
+            pass
+
+    for numero, mensaje in errores_entrada:
+        print(f"⚠️ Línea {numero} ignorada: {mensaje}", file=sys.stderr)
+    print(f"🎉 {total - fallidos}/{total} paletas generadas", file=sys.stderr)
+    return 1 if fallidos or errores_entrada else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,12 @@
-from src.generador_paletas import GeneradorPaletasIA
 from visualizador_redes import VisualizadorRedesSociales
-from src.utils import guardar_datos_paleta
+from procesador_lotes import generar_en_flujo
 import os
 
 def main():
     print("🎨 GENERADOR DE CONTENIDO PARA REDES SOCIALES")
     print("=" * 60)
     
-    # Inicializar generador y visualizador
-    generador = GeneradorPaletasIA()
+    # Inicializar visualizador
     visualizador = VisualizadorRedesSociales()
     
     # Temas para generar (elige los más visuales)
@@ -22,21 +20,22 @@ def main():
     ]
     
     print("🖌️ Generando paletas para redes sociales...")
-    paletas_generadas = []
     
-    for i, tema in enumerate(temas_redes, 1):
-        print(f"\n[{i}/{len(temas_redes)}] Creando: {tema}")
-        
-        paleta_data = generador.generar_paleta_completa(tema)
-        if paleta_data:
-            guardar_datos_paleta(paleta_data)
-            paletas_generadas.append(paleta_data)
-    
-    print(f"\n✅ {len(paletas_generadas)} paletas generadas")
+    def paletas_en_flujo():
+        # Cada paleta llega al kit en cuanto se genera y se guarda
+        for i, resultado in enumerate(generar_en_flujo(temas_redes), 1):
+            print(f"\n[{i}/{len(temas_redes)}] Creando: {resultado['tema']}")
+            
+            if resultado['error']:
+                print(f"❌ Error: {resultado['error']}")
+            else:
+                yield resultado['paleta']
     
     # Generar kit completo para redes sociales
     print("\n📱 CREANDO CONTENIDO PARA REDES SOCIALES...")
-    visualizador.generar_kit_redes(paletas_generadas)
+    total_paletas = visualizador.generar_kit_redes(paletas_en_flujo())
+    
+    print(f"\n✅ {total_paletas} paletas generadas")
     
     # Mostrar resumen
     print(f"\n🎉 ¡CONTENIDO LISTO PARA COMPARTIR!")
@@ -0,0 +1,158 @@
+import json
+from functools import lru_cache
+
+import numpy as np
+
+from espacio_color import rgb_a_lab, hex_a_rgb
+
+# Colores básicos de CSS por si webcolors no está instalado
+COLORES_BASICOS = {
+    'black': '#000000', 'silver': '#c0c0c0', 'gray': '#808080', 'white': '#ffffff',
+    'maroon': '#800000', 'red': '#ff0000', 'purple': '#800080', 'fuchsia': '#ff00ff',
+    'green': '#008000', 'lime': '#00ff00', 'olive': '#808000', 'yellow': '#ffff00',
+    'navy': '#000080', 'blue': '#0000ff', 'teal': '#008080', 'aqua': '#00ffff'
+}
+
+
+def _diccionario_css3():
+    """Nombres CSS3 -> hex de webcolors, con la API antigua o la nueva"""
+    try:
+        import webcolors
+    except ImportError:
+        return dict(COLORES_BASICOS)
+
+    if hasattr(webcolors, 'names'):
+        # webcolors >= 24.6
+        return {nombre: webcolors.name_to_hex(nombre) for nombre in webcolors.names('css3')}
+    return dict(webcolors.CSS3_NAMES_TO_HEX)
+
+
+def cargar_diccionario_json(ruta):
+    """Lee un diccionario ``{"nombre": "#hex", ...}`` de un archivo JSON"""
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Diccionarios disponibles por nombre; cada valor es una función sin
+# argumentos que devuelve ``{nombre: hex}``
+DICCIONARIOS = {
+    'css3': _diccionario_css3,
+    'basicos': lambda: dict(COLORES_BASICOS),
+}
+
+
+# Por debajo de este número de colores se busca sin tabla: una paleta o los
+# centros de una imagen se nombran exactos por casi lo mismo
+MAX_COLORES_EXACTO = 4096
+
+
+def registrar_diccionario(nombre, cargador):
+    """Añade un diccionario de nombres (función que devuelve ``{nombre: hex}``)"""
+    DICCIONARIOS[nombre] = cargador
+    obtener_nombrador.cache_clear()
+
+
+class NombradorColores:
+    """Nombre más cercano de un color, medido en CIELAB
+
+    La tabla de nombres se pasa a Lab una sola vez. Para lotes grandes las
+    consultas usan una tabla de búsqueda de ``resolucion``³ celdas (32³ por
+    defecto) con el nombre más cercano al centro de cada celda, así que
+    nombrar un lote es una indexación de NumPy. La tabla es aproximada: con
+    CSS3 coincide con el nombre más cercano en ~90% de los colores, porque
+    muchas celdas quedan en la frontera entre dos nombres. Con
+    ``exacto=True`` se busca sin cuantizar, con un KD-tree si scipy está
+    disponible; por defecto (``exacto=None``) se busca exacto si hay como
+    mucho ``MAX_COLORES_EXACTO`` colores y con la tabla si hay más.
+    """
+
+    def __init__(self, diccionario='css3', resolucion=32):
+        if isinstance(diccionario, str):
+            diccionario = DICCIONARIOS[diccionario]()
+        if not diccionario:
+            raise ValueError("El diccionario de nombres está vacío")
+
+        # Sinónimos con el mismo color (gray/grey, aqua/cyan): se queda el
+        # primero para que los empates se resuelvan siempre igual
+        por_hex = {}
+        for nombre, hex_color in diccionario.items():
+            por_hex.setdefault(hex_color.lower(), nombre)
+
+        self.nombres = np.array(list(por_hex.values()), dtype=object)
+        self.rgb = np.array([hex_a_rgb(h) for h in por_hex], dtype=np.uint8)
+        self.lab = rgb_a_lab(self.rgb)
+        self.resolucion = resolucion
+
+        self._arbol = self._crear_arbol(self.lab)
+        self._tabla = self._construir_tabla()
+
+    @staticmethod
+    def _crear_arbol(lab):
+        # scipy se importa aquí y no arriba: es lento de cargar
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            return None
+        return cKDTree(lab)
+
+    def _mas_cercanos(self, lab, bloque=65536):
+        """Índice del nombre más cercano para cada fila de ``lab`` (K x 3)"""
+        if self._arbol is not None:
+            return self._arbol.query(lab)[1].astype(np.int32)
+
+        # Sin scipy: fuerza bruta por bloques para acotar la memoria
+        # (en float64: con float32 la expansión ||a||² - 2a·b pierde precisión)
+        resultado = np.empty(len(lab), dtype=np.int32)
+        referencia = self.lab.astype(np.float64)
+        norma = (referencia ** 2).sum(axis=1)
+        for i in range(0, len(lab), bloque):
+            trozo = lab[i:i + bloque].astype(np.float64)
+            distancias = norma - 2 * trozo @ referencia.T
+            resultado[i:i + bloque] = distancias.argmin(axis=1)
+        return resultado
+
+    def _construir_tabla(self):
+        paso = 256 / self.resolucion
+        centros = (np.arange(self.resolucion) + 0.5) * paso - 0.5
+        r, g, b = np.meshgrid(centros, centros, centros, indexing='ij')
+        celdas = np.stack([r, g, b], axis=-1).reshape(-1, 3)
+        tipo = np.uint16 if len(self.nombres) < 65536 else np.int32
+        return self._mas_cercanos(rgb_a_lab(celdas)).astype(tipo)
+
+    def indices(self, rgb, exacto=None):
+        """Índices en ``self.nombres`` para colores (..., 3) en 0-255
+
+        ``exacto``: True busca el más cercano, False usa la tabla (más rápida
+        pero aproximada) y None elige según el tamaño del lote.
+        """
+        rgb = np.asarray(rgb)
+        if exacto is None:
+            exacto = rgb.size // 3 <= MAX_COLORES_EXACTO
+        if exacto:
+            forma = rgb.shape[:-1]
+            return self._mas_cercanos(rgb_a_lab(rgb.reshape(-1, 3))).reshape(forma)
+
+        celda = (rgb.astype(np.uint32) * self.resolucion) >> 8
+        plano = (celda[..., 0] * self.resolucion + celda[..., 1]) * self.resolucion + celda[..., 2]
+        return self._tabla[plano]
+
+    def nombrar(self, rgb, exacto=None):
+        """Nombres para un lote de colores (..., 3); devuelve un array de str"""
+        return self.nombres[self.indices(rgb, exacto)]
+
+    def nombre(self, color, exacto=True):
+        """Nombre de un solo color dado como '#hex' o [r, g, b]"""
+        if isinstance(color, str):
+            color = hex_a_rgb(color)
+        return self.nombres[self.indices(np.array([color]), exacto)[0]]
+
+
+@lru_cache(maxsize=None)
+def obtener_nombrador(diccionario='css3'):
+    """Nombrador compartido por diccionario registrado, creado al primer uso"""
+    return NombradorColores(diccionario)
+
+
+def nombre_color(color, diccionario='css3'):
+    """Atajo: nombre más cercano de un color con el nombrador compartido"""
+    return obtener_nombrador(diccionario).nombre(color)
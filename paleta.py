@@ -0,0 +1,284 @@
+import json
+
+import numpy as np
+
+from espacio_color import rgb_a_lab, rgb_a_hsl, rgb_a_hex, hex_a_rgb
+from nombres_color import obtener_nombrador
+
+
+def _rgb_de_colores(colores):
+    filas = []
+    for color in colores:
+        if isinstance(color, dict):
+            filas.append(color['rgb'] if 'rgb' in color else hex_a_rgb(color['hex']))
+        elif isinstance(color, str):
+            filas.append(hex_a_rgb(color))
+        else:
+            filas.append(color)
+    return np.array(filas, dtype=np.uint8).reshape(-1, 3)
+
+
+class Paleta:
+    """Paleta compacta: los colores son un array (N x 3) de uint8
+
+    Hex, nombres, HSL, Lab y RGB normalizado (0-1, el que usa matplotlib) se
+    calculan la primera vez que se piden y se guardan. ``desde_dict`` y
+    ``a_dict`` convierten desde y hacia el esquema de siempre
+    (``{'tema', 'estilo', 'colores': [{'hex', 'rgb', 'nombre'}...], ...}``);
+    las claves que la clase no conoce se conservan en ``extra``.
+    """
+
+    __slots__ = ('rgb', 'tema', 'estilo', 'porcentajes', 'extra',
+                 '_nombres', '_hex', '_hsl', '_lab', '_normalizado')
+
+    def __init__(self, rgb, tema='', estilo=None, nombres=None, porcentajes=None, extra=None):
+        rgb = np.array(rgb, dtype=np.uint8).reshape(-1, 3)
+        # Las vistas perezosas dependen de rgb: se congela para que no se desincronicen
+        rgb.flags.writeable = False
+        self.rgb = rgb
+        self.tema = tema
+        self.estilo = estilo
+        self.porcentajes = porcentajes
+        self.extra = extra
+        self._nombres = tuple(nombres) if nombres is not None else None
+        self._hex = None
+        self._hsl = None
+        self._lab = None
+        self._normalizado = None
+
+    # ===== CONVERSIÓN =====
+
+    @classmethod
+    def desde_colores(cls, colores, tema='', estilo=None):
+        """Desde una lista de colores: dicts del esquema, '#hex' o [r, g, b]"""
+        nombres = None
+        porcentajes = None
+        if colores and all(isinstance(c, dict) for c in colores):
+            if all('nombre' in c for c in colores):
+                nombres = [c['nombre'] for c in colores]
+            if all('porcentaje' in c for c in colores):
+                porcentajes = [c['porcentaje'] for c in colores]
+        return cls(_rgb_de_colores(colores), tema, estilo, nombres, porcentajes)
+
+    @classmethod
+    def desde_dict(cls, paleta_data):
+        """Desde el diccionario que usan el generador, la GUI y los JSON guardados"""
+        paleta = cls.desde_colores(paleta_data.get('colores') or [],
+                                   paleta_data.get('tema', ''), paleta_data.get('estilo'))
+        extra = {clave: valor for clave, valor in paleta_data.items()
+                 if clave not in ('tema', 'estilo', 'colores')}
+        paleta.extra = extra or None
+        return paleta
+
+    @classmethod
+    def desde_json(cls, texto):
+        return cls.desde_dict(json.loads(texto))
+
+    def a_dict(self):
+        """Diccionario en el esquema de siempre (lo que espera el resto del código)"""
+        colores = []
+        for i, (hex_color, rgb, nombre) in enumerate(zip(self.hex, self.rgb.tolist(), self.nombres)):
+            color = {'hex': hex_color, 'rgb': rgb, 'nombre': nombre}
+            if self.porcentajes is not None:
+                color['porcentaje'] = self.porcentajes[i]
+            colores.append(color)
+
+        paleta_data = {'tema': self.tema}
+        if self.estilo is not None:
+            paleta_data['estilo'] = self.estilo
+        paleta_data['colores'] = colores
+        if self.extra:
+            paleta_data.update(self.extra)
+        return paleta_data
+
+    def a_json(self, **opciones):
+        opciones.setdefault('ensure_ascii', False)
+        return json.dumps(self.a_dict(), **opciones)
+
+    # ===== VISTAS PEREZOSAS =====
+
+    @property
+    def hex(self):
+        if self._hex is None:
+            self._hex = tuple(rgb_a_hex(self.rgb))
+        return self._hex
+
+    @property
+    def nombres(self):
+        """Nombres de los colores; si no vinieron con la paleta, los más cercanos en CSS3"""
+        if self._nombres is None:
+            self._nombres = tuple(obtener_nombrador().nombrar(self.rgb).tolist())
+        return self._nombres
+
+    @property
+    def hsl(self):
+        """(N x 3) float32: tono en grados, saturación y luminosidad en 0-1"""
+        if self._hsl is None:
+            self._hsl = rgb_a_hsl(self.rgb)
+        return self._hsl
+
+    @property
+    def lab(self):
+        """(N x 3) float32 en CIELAB"""
+        if self._lab is None:
+            self._lab = rgb_a_lab(self.rgb)
+        return self._lab
+
+    @property
+    def normalizado(self):
+        """(N x 3) float32 en 0-1, listo para ``facecolor`` de matplotlib"""
+        if self._normalizado is None:
+            self._normalizado = self.rgb.astype(np.float32) / 255.0
+        return self._normalizado
+
+    # ===== PROTOCOLOS =====
+
+    def __len__(self):
+        return len(self.rgb)
+
+    def __eq__(self, otra):
+        if not isinstance(otra, Paleta):
+            return NotImplemented
+        return (self.tema == otra.tema and self.estilo == otra.estilo
+                and np.array_equal(self.rgb, otra.rgb))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Paleta({self.tema!r}, {' '.join(self.hex)})"
+
+    def __getstate__(self):
+        # Al serializar (pickle, procesos) solo viajan los datos, no las vistas
+        return (self.rgb, self.tema, self.estilo, self._nombres, self.porcentajes, self.extra)
+
+    def __setstate__(self, estado):
+        rgb, tema, estilo, nombres, porcentajes, extra = estado
+        Paleta.__init__(self, rgb, tema, estilo, nombres, porcentajes, extra)
+
+
+class ColeccionPaletas:
+    """Muchas paletas en unos pocos arrays contiguos
+
+    Los colores de todas las paletas van seguidos en un array (total x 3) de
+    uint8 y ``_inicios`` marca dónde empieza cada una; los temas se guardan
+    igual, como UTF-8 en un solo bloque de bytes. Un millón de paletas de
+    seis colores ocupa unas decenas de MB, frente a varios GB como lista de
+    diccionarios. ``coleccion[i]`` devuelve una ``Paleta``.
+
+    Los nombres de los colores no se guardan: se recalculan con
+    ``nombres_color`` al pedirlos. Los estilos se guardan como índices en
+    ``estilos``.
+    """
+
+    def __init__(self, capacidad=1024):
+        self._colores = np.empty((max(1, capacidad * 6), 3), dtype=np.uint8)
+        self._num_colores = 0
+        self._inicios = np.zeros(max(1, capacidad) + 1, dtype=np.int64)
+        self._estilo = np.empty(max(1, capacidad), dtype=np.uint16)
+        self._temas = bytearray()
+        self._inicios_tema = np.zeros(max(1, capacidad) + 1, dtype=np.int64)
+        self._num_paletas = 0
+        self.estilos = [None]
+        self._indice_estilos = {None: 0}
+
+    @classmethod
+    def desde_paletas(cls, paletas):
+        """Desde un iterable de ``Paleta`` o diccionarios del esquema de siempre"""
+        coleccion = cls()
+        for paleta in paletas:
+            coleccion.agregar(paleta)
+        return coleccion
+
+    @classmethod
+    def desde_almacen(cls, almacen, tipo=None):
+        """Todas las paletas de un ``AlmacenPaletas`` (o solo las de ``tipo``)"""
+        return cls.desde_paletas(paleta_data for tipo_fila, _, _, paleta_data in almacen.iterar_todas()
+                                 if tipo is None or tipo_fila == tipo)
+
+    @staticmethod
+    def _crecer(array, minimo):
+        if len(array) >= minimo:
+            return array
+        nuevo = np.empty((max(minimo, len(array) * 2),) + array.shape[1:], dtype=array.dtype)
+        nuevo[:len(array)] = array
+        return nuevo
+
+    def agregar(self, paleta):
+        """Añade una ``Paleta`` o un diccionario; devuelve su índice"""
+        if isinstance(paleta, Paleta):
+            rgb, tema, estilo = paleta.rgb, paleta.tema, paleta.estilo
+        else:
+            rgb = _rgb_de_colores(paleta.get('colores') or [])
+            tema, estilo = paleta.get('tema', ''), paleta.get('estilo')
+
+        indice = self._num_paletas
+        fin = self._num_colores + len(rgb)
+        self._colores = self._crecer(self._colores, fin)
+        self._colores[self._num_colores:fin] = rgb
+        self._num_colores = fin
+
+        self._inicios = self._crecer(self._inicios, indice + 2)
+        self._inicios[indice + 1] = fin
+
+        if estilo not in self._indice_estilos:
+            self._indice_estilos[estilo] = len(self.estilos)
+            self.estilos.append(estilo)
+        self._estilo = self._crecer(self._estilo, indice + 1)
+        self._estilo[indice] = self._indice_estilos[estilo]
+
+        self._temas += (tema or '').encode('utf-8')
+        self._inicios_tema = self._crecer(self._inicios_tema, indice + 2)
+        self._inicios_tema[indice + 1] = len(self._temas)
+
+        self._num_paletas += 1
+        return indice
+
+    # ===== ACCESO =====
+
+    def __len__(self):
+        return self._num_paletas
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self._num_paletas
+        if not 0 <= indice < self._num_paletas:
+            raise IndexError(indice)
+        return Paleta(self.colores_de(indice), self.tema(indice),
+                      self.estilos[self._estilo[indice]])
+
+    def __iter__(self):
+        for indice in range(self._num_paletas):
+            yield self[indice]
+
+    def colores_de(self, indice):
+        """Array (N x 3) de la paleta ``indice`` (una vista, sin copiar)"""
+        return self._colores[self._inicios[indice]:self._inicios[indice + 1]]
+
+    def tema(self, indice):
+        return bytes(self._temas[self._inicios_tema[indice]:self._inicios_tema[indice + 1]]).decode('utf-8')
+
+    @property
+    def colores(self):
+        """Todos los colores seguidos, (total x 3) uint8"""
+        return self._colores[:self._num_colores]
+
+    @property
+    def tamanos(self):
+        """Número de colores de cada paleta"""
+        return np.diff(self._inicios[:self._num_paletas + 1])
+
+    def a_lote(self):
+        """``(rgb, mascara)`` (M x N x 3) como ``analisis_paletas.a_lote``, sin pasar por dicts"""
+        tamanos = self.tamanos
+        max_colores = int(tamanos.max()) if len(tamanos) else 0
+        posiciones = np.arange(max_colores)
+        mascara = posiciones[None, :] < tamanos[:, None]
+        rgb = np.zeros((self._num_paletas, max_colores, 3), dtype=np.uint8)
+        rgb[mascara] = self.colores
+        return rgb, mascara
+
+    @property
+    def nbytes(self):
+        """Memoria ocupada por los datos (incluida la capacidad reservada)"""
+        return (self._colores.nbytes + self._inicios.nbytes + self._estilo.nbytes
+                + len(self._temas) + self._inicios_tema.nbytes)
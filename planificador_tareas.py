@@ -0,0 +1,144 @@
+import queue
+import itertools
+import threading
+
+
+class Tarea:
+    """Trabajo enviado al planificador"""
+
+    def __init__(self, id_tarea, funcion, args, prioridad, canal, al_terminar):
+        self.id = id_tarea
+        self.funcion = funcion
+        self.args = args
+        self.prioridad = prioridad
+        self.canal = canal
+        self.al_terminar = al_terminar
+        self.estado = 'pendiente'
+        self.cancelada = threading.Event()
+
+    def cancelar(self):
+        self.cancelada.set()
+
+
+class PlanificadorTareas:
+    """Pool fijo de hilos con cola acotada, prioridades y cancelación
+
+    Las tareas de un mismo ``canal`` siguen la regla "gana la última": al
+    enviar una nueva se cancelan las anteriores de ese canal, estén en cola
+    o ejecutándose (en ese caso su resultado se descarta al terminar).
+    Un número de prioridad menor se atiende antes.
+    """
+
+    def __init__(self, num_workers=2, max_pendientes=16):
+        self.cola = queue.PriorityQueue(maxsize=max_pendientes)
+        self.tareas = {}
+        self._contador = itertools.count(1)
+        self._lock = threading.Lock()
+        self._activo = True
+
+        self.workers = []
+        for i in range(num_workers):
+            worker = threading.Thread(target=self._bucle, name=f"planificador-{i}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def enviar(self, funcion, *args, prioridad=10, canal=None, al_terminar=None):
+        """Encola una tarea y devuelve su id
+
+        ``al_terminar(tarea, resultado, error)`` se llama desde el hilo de
+        trabajo salvo que la tarea se haya cancelado. Lanza ``queue.Full`` si la
+        cola está llena.
+        """
+        with self._lock:
+            if not self._activo:
+                raise RuntimeError("El planificador está cerrado")
+            id_tarea = next(self._contador)
+            tarea = Tarea(id_tarea, funcion, args, prioridad, canal, al_terminar)
+
+            # Primero encolar: si la cola está llena (queue.Full) las tareas
+            # anteriores del canal siguen vivas en lugar de quedarse sin ninguna
+            self.cola.put_nowait((prioridad, id_tarea, tarea))
+
+            if canal is not None:
+                for anterior in self.tareas.values():
+                    if anterior.canal == canal:
+                        anterior.cancelar()
+
+            self.tareas[id_tarea] = tarea
+        return id_tarea
+
+    def cancelar(self, id_tarea):
+        """Cancela una tarea pendiente o en curso"""
+        with self._lock:
+            tarea = self.tareas.get(id_tarea)
+        if tarea is None:
+            return False
+        tarea.cancelar()
+        return True
+
+    def pendientes(self):
+        """Tareas aún no terminadas (en cola o ejecutándose) y no canceladas"""
+        with self._lock:
+            return sum(1 for t in self.tareas.values() if not t.cancelada.is_set())
+
+    def _bucle(self):
+        while True:
+            _, _, tarea = self.cola.get()
+            if tarea is None:
+                break
+
+            try:
+                if tarea.cancelada.is_set():
+                    tarea.estado = 'cancelada'
+                    continue
+
+                tarea.estado = 'ejecutando'
+                resultado, error = None, None
+                try:
+                    resultado = tarea.funcion(*tarea.args)
+                except Exception as e:
+                    error = e
+
+                if tarea.cancelada.is_set():
+                    tarea.estado = 'cancelada'
+                    continue
+
+                tarea.estado = 'error' if error else 'terminada'
+                if tarea.al_terminar:
+                    try:
+                        tarea.al_terminar(tarea, resultado, error)
+                    except Exception as e:
+                        print(f"Error en al_terminar de la tarea {tarea.id}: {e}")
+            finally:
+                with self._lock:
+                    self.tareas.pop(tarea.id, None)
+                self.cola.task_done()
+
+    def cerrar(self):
+        """Cancela lo pendiente y detiene los hilos de trabajo"""
+        with self._lock:
+            self._activo = False
+            for tarea in self.tareas.values():
+                tarea.cancelar()
+
+        # Las tareas en cola ya están canceladas: se sacan para dejar sitio a
+        # los centinelas sin esperar a que los hilos las descarten una a una
+        while True:
+            try:
+                _, _, tarea = self.cola.get_nowait()
+            except queue.Empty:
+                break
+            tarea.estado = 'cancelada'
+            with self._lock:
+                self.tareas.pop(tarea.id, None)
+            self.cola.task_done()
+
+        for worker in self.workers:
+            # Centinela con la peor prioridad posible para que salga el último
+            centinela = (float('inf'), float('inf'), None)
+            try:
+                self.cola.put_nowait(centinela)
+            except queue.Full:
+                # Cola más corta que el número de hilos: solo hay centinelas,
+                # que los hilos van retirando
+                self.cola.put(centinela)
@@ -0,0 +1,156 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from cache_paletas import CachePaletas
+import instrumentacion
+from instrumentacion import tramo
+
+# Cada proceso del pool mantiene su propio generador (y su caché) para no
+# reconstruirlo (ni serializarlo) en cada tema
+_generador = None
+_cache = None
+
+
+def _inicializar_trabajador(usar_cache=True):
+    """Crea el generador del proceso trabajador"""
+    global _generador, _cache
+    from src.generador_paletas import GeneradorPaletasIA
+    _generador = GeneradorPaletasIA()
+    _cache = CachePaletas() if usar_cache else None
+
+
+def _procesar_tema(tarea):
+    """Genera y guarda la paleta de un tema sin propagar errores
+
+    Con la instrumentación activa el resultado lleva además en ``'metricas'``
+    los tiempos medidos en el trabajador, que ``_recoger`` suma a los del
+    proceso principal.
+    """
+    resultado = _generar_tema(*tarea)
+    metricas = instrumentacion.extraer()
+    if metricas is not None:
+        resultado['metricas'] = metricas
+    return resultado
+
+
+def _generar_tema(tema, estilo, guardar, num_colores):
+    try:
+        if _cache is not None:
+            paleta_data = _cache.obtener_o_generar(_generador, tema, estilo, num_colores)
+        else:
+            argumentos = [tema] if estilo is None else [tema, estilo]
+            with tramo('generar_paleta_completa'):
+                if num_colores is not None:
+                    paleta_data = _generador.generar_paleta_completa(*argumentos, num_colores=num_colores)
+                else:
+                    paleta_data = _generador.generar_paleta_completa(*argumentos)
+
+        if not paleta_data:
+            return {'tema': tema, 'paleta': None, 'error': 'El generador no devolvió datos'}
+
+        if guardar:
+            from src.utils import guardar_datos_paleta
+            with tramo('guardar_datos_paleta'):
+                guardar_datos_paleta(paleta_data)
+
+        return {'tema': tema, 'paleta': paleta_data, 'error': None}
+    except Exception as e:
+        return {'tema': tema, 'paleta': None, 'error': f"{type(e).__name__}: {e}"}
+
+
+def _tarea(tema, estilo, guardar, num_colores):
+    """Tupla de trabajo de un tema; un diccionario puede fijar su propio estilo y tamaño"""
+    if isinstance(tema, dict):
+        return (tema['tema'], tema.get('estilo', estilo), guardar,
+                tema.get('num_colores', num_colores))
+    return (tema, estilo, guardar, num_colores)
+
+
+def _recoger(resultado):
+    """Pasa al proceso actual las métricas que traiga el resultado de un tema"""
+    instrumentacion.fusionar(resultado.pop('metricas', None))
+    return resultado
+
+
+def generar_lote(temas, estilo=None, workers=None, guardar=True, chunksize=None, usar_cache=True,
+                 num_colores=None):
+    """Genera las paletas de una lista de temas repartiéndolas en un pool de procesos
+
+    Devuelve una lista en el mismo orden que ``temas`` con un diccionario
+    ``{'tema', 'paleta', 'error'}`` por elemento. Un tema que falla deja su
+    error en ``'error'`` y el resto del lote sigue adelante. Con
+    ``usar_cache`` los temas ya generados se leen de ``CachePaletas``.
+
+    Cada tema puede ser un texto o un diccionario ``{'tema', 'estilo',
+    'num_colores'}`` cuyas claves sustituyen a ``estilo`` y ``num_colores``.
+    """
+    tareas = [_tarea(tema, estilo, guardar, num_colores) for tema in temas]
+    if not tareas:
+        return []
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tareas)))
+
+    # Sin paralelismo no compensa arrancar procesos
+    if workers == 1:
+        _inicializar_trabajador(usar_cache)
+        return [_recoger(_procesar_tema(tarea)) for tarea in tareas]
+
+    # Bloques de varias tareas por envío para amortizar la comunicación
+    # entre procesos cuando el lote tiene miles de temas
+    if chunksize is None:
+        chunksize = max(1, len(tareas) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_trabajador,
+                             initargs=(usar_cache,)) as executor:
+        return [_recoger(resultado)
+                for resultado in executor.map(_procesar_tema, tareas, chunksize=chunksize)]
+
+
+def generar_en_flujo(temas, estilo=None, workers=None, guardar=True, max_pendientes=None,
+                     usar_cache=True, num_colores=None):
+    """Versión en flujo de ``generar_lote``: produce los resultados según terminan
+
+    Los temas se leen de forma perezosa (sirve cualquier iterable, también
+    un fichero abierto o un generador) y nunca hay más de ``max_pendientes``
+    temas en vuelo, así que la memoria no crece con el tamaño de la entrada.
+    Cada paleta se guarda en disco en el propio trabajador en cuanto se
+    genera y los resultados salen en el mismo orden que los temas.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_pendientes is None:
+        max_pendientes = workers * 2
+    max_pendientes = max(1, max_pendientes)
+
+    tareas = (_tarea(tema, estilo, guardar, num_colores) for tema in temas)
+
+    if workers <= 1:
+        _inicializar_trabajador(usar_cache)
+        for tarea in tareas:
+            yield _recoger(_procesar_tema(tarea))
+        return
+
+    # La cola de futuros pendientes hace de cola acotada entre la generación
+    # y el consumidor: no se envía un tema nuevo hasta que sale el más antiguo
+    pendientes = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_trabajador,
+                             initargs=(usar_cache,)) as executor:
+        try:
+            for tarea in tareas:
+                pendientes.append(executor.submit(_procesar_tema, tarea))
+                if len(pendientes) >= max_pendientes:
+                    yield _recoger(pendientes.popleft().result())
+            while pendientes:
+                yield _recoger(pendientes.popleft().result())
+        finally:
+            # Si el consumidor abandona el flujo no se procesa lo que quede
+            for futuro in pendientes:
+                futuro.cancel()
+
+
+def resumen_lote(resultados):
+    """Cuenta los éxitos y errores de un lote"""
+    exitos = sum(1 for r in resultados if r['error'] is None)
+    return {'total': len(resultados), 'exitos': exitos, 'errores': len(resultados) - exitos}
@@ -0,0 +1,533 @@
+import io
+import os
+import sys
+import json
+import shutil
+import signal
+import asyncio
+import hashlib
+import zipfile
+import argparse
+import tempfile
+import multiprocessing
+from http import HTTPStatus
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+from cache_paletas import CachePaletas
+import instrumentacion
+
+# Servicio HTTP local (solo biblioteca estándar) para usar el generador desde
+# otras herramientas sin lanzar main.py:
+#
+#   POST /paletas   {"tema", "estilo"?, "num_colores"?}      -> paleta JSON
+#   POST /imagen    cuerpo = bytes de la imagen (?colores=6)  -> paleta JSON
+#   POST /kit       {"paletas": [...]} o {"temas": [...]},
+#                   "backend"? ("pillow" o "matplotlib")      -> ZIP del kit
+#   GET  /salud                                               -> estado y contadores
+#
+#   python servidor.py --puerto 8765
+#   curl -d '{"tema": "bosque otoñal"}' http://127.0.0.1:8765/paletas
+
+MAX_CUERPO = 20 * 1024 * 1024
+MAX_CABECERAS = 100
+TIEMPO_INACTIVO = 30
+
+
+class ErrorPeticion(Exception):
+    """Error que se devuelve al cliente con su código HTTP"""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+    def __reduce__(self):
+        # Viaja desde los procesos del pool: hay que conservar el estado
+        return (ErrorPeticion, (self.estado, str(self)))
+
+
+# ===== TRABAJADORES (procesos del pool) =====
+
+# Como en procesador_lotes, cada proceso mantiene su generador, su caché de
+# paletas y su visualizador (con sus plantillas ya rasterizadas)
+_generador = None
+_cache = None
+_visualizador = None
+
+
+def _inicializar_trabajador():
+    """Prepara el proceso; si falta el generador, /imagen sigue funcionando"""
+    global _generador, _cache
+    try:
+        from src.generador_paletas import GeneradorPaletasIA
+    except ImportError as e:
+        print(f"⚠️ Generador no disponible en el trabajador: {e}", file=sys.stderr)
+        return
+    _generador = GeneradorPaletasIA()
+    _cache = CachePaletas()
+
+
+def _generar_paleta(tema, estilo, num_colores):
+    if _generador is None:
+        raise ErrorPeticion(HTTPStatus.SERVICE_UNAVAILABLE, "El generador de paletas no está disponible")
+    paleta_data = _cache.obtener_o_generar(_generador, tema, estilo, num_colores)
+    if not paleta_data:
+        raise ErrorPeticion(HTTPStatus.INTERNAL_SERVER_ERROR, "El generador no devolvió datos")
+    return paleta_data
+
+
+def _tarea_imagen(datos, num_colores, nombre):
+    from analizador_imagen import AnalizadorImagen
+    try:
+        colores = AnalizadorImagen(num_colores=num_colores).extraer_colores(io.BytesIO(datos))
+    except (OSError, ValueError) as e:
+        # PIL no reconoce el formato o la imagen está truncada
+        raise ErrorPeticion(HTTPStatus.UNPROCESSABLE_ENTITY, f"Imagen no válida: {e}")
+    return {
+        'tema': nombre,
+        'estilo': 'imagen',
+        'origen': 'subida',
+        'colores': colores,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def _tarea_kit(paletas, temas, backend):
+    """Renderiza el kit en un directorio temporal y lo devuelve como ZIP"""
+    global _visualizador
+    from visualizador_redes import VisualizadorRedesSociales, _inicializar_render
+    if backend == 'matplotlib':
+        _inicializar_render()
+    if _visualizador is None:
+        _visualizador = VisualizadorRedesSociales()
+
+    paletas = list(paletas) + [_generar_paleta(tema, None, None) for tema in temas]
+
+    # El kit escribe en 'redes_sociales' relativo al directorio actual; el
+    # trabajador atiende una tarea cada vez, así que puede cambiarlo
+    anterior = os.getcwd()
+    directorio = tempfile.mkdtemp(prefix='kit_redes_')
+    try:
+        os.chdir(directorio)
+        _visualizador.generar_kit_redes(paletas, backend=backend, workers=1)
+
+        memoria = io.BytesIO()
+        # Los PNG ya van comprimidos: se guardan tal cual
+        with zipfile.ZipFile(memoria, 'w', zipfile.ZIP_STORED) as archivo_zip:
+            for raiz, _, archivos in os.walk('redes_sociales'):
+                for nombre in sorted(archivos):
+                    archivo_zip.write(os.path.join(raiz, nombre))
+        return memoria.getvalue()
+    finally:
+        os.chdir(anterior)
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+# ===== CACHÉ DE RESPUESTAS =====
+
+class CacheRespuestas:
+    """LRU en memoria de respuestas ya codificadas, limitada en bytes"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entradas = OrderedDict()
+
+    def obtener(self, clave):
+        respuesta = self._entradas.get(clave)
+        if respuesta is not None:
+            self._entradas.move_to_end(clave)
+        return respuesta
+
+    def guardar(self, clave, respuesta):
+        tamano = len(respuesta[1])
+        if tamano > self.max_bytes:
+            return
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self.bytes -= len(anterior[1])
+        self._entradas[clave] = respuesta
+        self.bytes += tamano
+        while self.bytes > self.max_bytes:
+            _, expulsada = self._entradas.popitem(last=False)
+            self.bytes -= len(expulsada[1])
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+def _clave(*partes):
+    datos = json.dumps(partes, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha256(datos.encode('utf-8')).hexdigest()
+
+
+# ===== SERVIDOR =====
+
+class ServidorPaletas:
+    """Servidor HTTP/1.1 asyncio delante de un pool de procesos
+
+    El bucle de eventos solo analiza peticiones y escribe respuestas; todo el
+    trabajo de CPU va al pool. Entre ambos hay una cola acotada: si está
+    llena el servidor responde 503 con ``Retry-After`` en vez de acumular
+    trabajo sin límite. Las peticiones idénticas que llegan mientras otra
+    igual está en marcha esperan a ese mismo resultado en lugar de encolarse,
+    y las respuestas correctas se guardan en una caché compartida.
+    """
+
+    def __init__(self, host='127.0.0.1', puerto=8765, workers=None, max_cola=64,
+                 max_cache_mb=64, max_cuerpo=MAX_CUERPO):
+        self.host = host
+        self.puerto = puerto
+        self.workers = workers or os.cpu_count() or 1
+        self.max_cola = max_cola
+        self.max_cuerpo = max_cuerpo
+        self.cache = CacheRespuestas(max_cache_mb * 1024 * 1024)
+
+        self.estadisticas = {'peticiones': 0, 'aciertos': 0, 'fallos': 0,
+                             'fusionadas': 0, 'rechazadas': 0, 'errores': 0}
+        self._en_vuelo = {}
+        self._cola = None
+        self._consumidores = []
+        self._pool = None
+        self._servidor = None
+
+        self.rutas = {
+            ('GET', '/salud'): self._salud,
+            ('POST', '/paletas'): self._paletas,
+            ('POST', '/imagen'): self._imagen,
+            ('POST', '/kit'): self._kit,
+        }
+
+    # ===== CICLO DE VIDA =====
+
+    async def iniciar(self):
+        """Arranca el pool, los consumidores de la cola y el socket
+
+        Con ``puerto=0`` el sistema elige uno libre; queda en ``self.puerto``.
+        """
+        # spawn y no fork: el pool arranca sus procesos al primer envío, cuando
+        # ya hay sockets abiertos, y un hijo creado con fork heredaría el de
+        # escucha y las conexiones aceptadas (el cliente no vería nunca el EOF)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                         mp_context=multiprocessing.get_context('spawn'),
+                                         initializer=_inicializar_trabajador)
+        self._cola = asyncio.Queue(maxsize=self.max_cola)
+        # Un consumidor por proceso: el pool nunca tiene más tareas que
+        # trabajadores y la espera se queda en la cola, donde se puede medir
+        self._consumidores = [asyncio.create_task(self._consumir()) for _ in range(self.workers)]
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+        self.puerto = self._servidor.sockets[0].getsockname()[1]
+        return self
+
+    async def cerrar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        for consumidor in self._consumidores:
+            consumidor.cancel()
+        await asyncio.gather(*self._consumidores, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    async def servir(self):
+        """Atiende peticiones hasta que se cancele la tarea (Ctrl+C, SIGTERM)"""
+        await self.iniciar()
+        print(f"🌐 Servidor de paletas en http://{self.host}:{self.puerto} "
+              f"({self.workers} procesos, cola de {self.max_cola})", file=sys.stderr)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.cerrar()
+
+    # ===== COLA, FUSIÓN Y CACHÉ =====
+
+    async def _consumir(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            funcion, args, futuro = await self._cola.get()
+            try:
+                if not futuro.done():
+                    resultado = await loop.run_in_executor(self._pool, funcion, *args)
+                    if not futuro.done():
+                        futuro.set_result(resultado)
+            except asyncio.CancelledError:
+                if not futuro.done():
+                    futuro.cancel()
+                raise
+            except Exception as e:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            finally:
+                self._cola.task_done()
+
+    async def _resolver(self, clave, codificar, funcion, *args):
+        """Respuesta ``(tipo, cuerpo, origen)`` de la tarea identificada por ``clave``
+
+        Orden: caché, petición igual ya en marcha y, si no hay ninguna, un
+        hueco en la cola. ``codificar`` convierte el resultado del trabajador
+        en ``(tipo, cuerpo)`` en el proceso principal.
+        """
+        respuesta = self.cache.obtener(clave)
+        if respuesta is not None:
+            self.estadisticas['aciertos'] += 1
+            return respuesta + ('acierto',)
+
+        # shield: si un cliente se va, la tarea sigue para los demás que la esperan
+        tarea = self._en_vuelo.get(clave)
+        if tarea is not None:
+            self.estadisticas['fusionadas'] += 1
+            return await asyncio.shield(tarea) + ('fusionada',)
+
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self._cola.put_nowait((funcion, args, futuro))
+        except asyncio.QueueFull:
+            self.estadisticas['rechazadas'] += 1
+            raise ErrorPeticion(HTTPStatus.SERVICE_UNAVAILABLE, "Servidor saturado, reintenta más tarde")
+
+        self.estadisticas['fallos'] += 1
+        tarea = asyncio.create_task(self._completar(clave, codificar, futuro))
+        self._en_vuelo[clave] = tarea
+        return await asyncio.shield(tarea) + ('fallo',)
+
+    async def _completar(self, clave, codificar, futuro):
+        """Espera al trabajador, codifica la respuesta y la deja en la caché
+
+        Todas las peticiones fusionadas comparten esta tarea, así que reciben
+        la misma respuesta o el mismo error.
+        """
+        try:
+            respuesta = codificar(await futuro)
+        finally:
+            self._en_vuelo.pop(clave, None)
+        self.cache.guardar(clave, respuesta)
+        return respuesta
+
+    # ===== RUTAS =====
+
+    @staticmethod
+    def _json(datos):
+        return 'application/json; charset=utf-8', json.dumps(datos, ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def _leer_json(cuerpo):
+        try:
+            datos = json.loads(cuerpo or b'{}')
+        except ValueError as e:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, f"JSON no válido: {e}")
+        if not isinstance(datos, dict):
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Se esperaba un objeto JSON")
+        return datos
+
+    @staticmethod
+    def _entero(valor, nombre, minimo=1, maximo=64):
+        if valor is None:
+            return None
+        try:
+            valor = int(valor)
+        except (TypeError, ValueError):
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, f"'{nombre}' debe ser un entero")
+        if not minimo <= valor <= maximo:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, f"'{nombre}' debe estar entre {minimo} y {maximo}")
+        return valor
+
+    async def _salud(self, consulta, cuerpo):
+        datos = dict(self.estadisticas, estado='ok', workers=self.workers,
+                     cola=self._cola.qsize(), max_cola=self.max_cola,
+                     en_vuelo=len(self._en_vuelo), cache_entradas=len(self.cache),
+                     cache_bytes=self.cache.bytes)
+        return self._json(datos) + ('',)
+
+    async def _paletas(self, consulta, cuerpo):
+        datos = self._leer_json(cuerpo)
+        tema = datos.get('tema')
+        if not isinstance(tema, str) or not tema.strip():
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Falta el campo 'tema'")
+        estilo = datos.get('estilo')
+        num_colores = self._entero(datos.get('num_colores'), 'num_colores')
+
+        clave = _clave('paletas', CachePaletas.clave(tema, estilo, num_colores))
+        return await self._resolver(clave, self._json, _generar_paleta, tema, estilo, num_colores)
+
+    async def _imagen(self, consulta, cuerpo):
+        if not cuerpo:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "El cuerpo debe contener la imagen")
+        num_colores = self._entero(consulta.get('colores', ['6'])[0], 'colores') or 6
+        nombre = consulta.get('nombre', ['imagen'])[0]
+
+        clave = _clave('imagen', hashlib.sha256(cuerpo).hexdigest(), num_colores, nombre)
+        return await self._resolver(clave, self._json, _tarea_imagen, cuerpo, num_colores, nombre)
+
+    async def _kit(self, consulta, cuerpo):
+        datos = self._leer_json(cuerpo)
+        paletas = datos.get('paletas') or []
+        temas = datos.get('temas') or []
+        backend = datos.get('backend', 'pillow')
+        if backend not in ('pillow', 'matplotlib'):
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "'backend' debe ser 'pillow' o 'matplotlib'")
+        if not isinstance(paletas, list) or not isinstance(temas, list) or not (paletas or temas):
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Indica una lista de 'paletas' o de 'temas'")
+        if not all(isinstance(p, dict) and 'tema' in p and 'colores' in p for p in paletas):
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Cada paleta necesita 'tema' y 'colores'")
+        if not all(isinstance(t, str) and t.strip() for t in temas):
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Los temas deben ser textos no vacíos")
+
+        clave = _clave('kit', paletas, temas, backend)
+        return await self._resolver(clave, lambda zip_kit: ('application/zip', zip_kit),
+                                    _tarea_kit, paletas, temas, backend)
+
+    # ===== HTTP =====
+
+    async def _leer_peticion(self, reader):
+        """Devuelve ``(método, destino, cabeceras, cuerpo)`` o None si el cliente cerró"""
+        linea = await asyncio.wait_for(reader.readline(), TIEMPO_INACTIVO)
+        if not linea:
+            return None
+        try:
+            metodo, destino, version = linea.decode('latin-1').split()
+        except ValueError:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Línea de petición no válida")
+        if not version.startswith('HTTP/1.'):
+            raise ErrorPeticion(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED, "Solo HTTP/1.x")
+
+        cabeceras = {}
+        while True:
+            linea = await asyncio.wait_for(reader.readline(), TIEMPO_INACTIVO)
+            if linea in (b'\r\n', b'\n', b''):
+                break
+            if len(cabeceras) >= MAX_CABECERAS:
+                raise ErrorPeticion(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Demasiadas cabeceras")
+            nombre, _, valor = linea.decode('latin-1').partition(':')
+            cabeceras[nombre.strip().lower()] = valor.strip()
+        cabeceras['_version'] = version
+
+        if 'chunked' in cabeceras.get('transfer-encoding', '').lower():
+            raise ErrorPeticion(HTTPStatus.LENGTH_REQUIRED, "Envía Content-Length, no chunked")
+        try:
+            longitud = int(cabeceras.get('content-length', 0))
+        except ValueError:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Content-Length no válido")
+        if longitud > self.max_cuerpo:
+            raise ErrorPeticion(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                f"El cuerpo supera {self.max_cuerpo // (1024 * 1024)} MB")
+        cuerpo = await asyncio.wait_for(reader.readexactly(longitud), TIEMPO_INACTIVO) if longitud else b''
+        return metodo.upper(), destino, cabeceras, cuerpo
+
+    @staticmethod
+    def _escribir(writer, estado, tipo, cuerpo, mantener, extra=None):
+        estado = HTTPStatus(estado)
+        cabeceras = [f"HTTP/1.1 {estado.value} {estado.phrase}",
+                     f"Content-Type: {tipo}",
+                     f"Content-Length: {len(cuerpo)}",
+                     f"Connection: {'keep-alive' if mantener else 'close'}"]
+        for nombre, valor in (extra or {}).items():
+            cabeceras.append(f"{nombre}: {valor}")
+        writer.write(("\r\n".join(cabeceras) + "\r\n\r\n").encode('latin-1') + cuerpo)
+
+    async def _atender(self, reader, writer):
+        """Atiende una conexión (con keep-alive) hasta que el cliente la cierra"""
+        try:
+            while True:
+                try:
+                    peticion = await self._leer_peticion(reader)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except ErrorPeticion as e:
+                    tipo, cuerpo = self._json({'error': str(e)})
+                    self._escribir(writer, e.estado, tipo, cuerpo, mantener=False)
+                    await writer.drain()
+                    break
+                if peticion is None:
+                    break
+
+                metodo, destino, cabeceras, cuerpo = peticion
+                conexion = cabeceras.get('connection', '').lower()
+                mantener = conexion != 'close' and (cabeceras['_version'] != 'HTTP/1.0'
+                                                    or conexion == 'keep-alive')
+
+                estado, tipo, cuerpo_respuesta, extra = await self._responder(metodo, destino, cuerpo)
+                self._escribir(writer, estado, tipo, cuerpo_respuesta, mantener, extra)
+                await writer.drain()
+                if not mantener:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _responder(self, metodo, destino, cuerpo):
+        """Ejecuta la ruta y devuelve ``(estado, tipo, cuerpo, cabeceras extra)``"""
+        self.estadisticas['peticiones'] += 1
+        partes = urlsplit(destino)
+        ruta = partes.path.rstrip('/') or '/'
+        manejador = self.rutas.get((metodo, ruta))
+        try:
+            if manejador is None:
+                if any(r == ruta for _, r in self.rutas):
+                    raise ErrorPeticion(HTTPStatus.METHOD_NOT_ALLOWED, f"{metodo} no admitido en {ruta}")
+                raise ErrorPeticion(HTTPStatus.NOT_FOUND, f"No existe {ruta}")
+            with instrumentacion.tramo(f"servidor.{ruta.strip('/')}"):
+                tipo, cuerpo_respuesta, origen = await manejador(parse_qs(partes.query), cuerpo)
+            extra = {'X-Cache': origen} if origen else {}
+            return HTTPStatus.OK, tipo, cuerpo_respuesta, extra
+        except ErrorPeticion as e:
+            extra = {'Retry-After': '1'} if e.estado == HTTPStatus.SERVICE_UNAVAILABLE else {}
+            return (e.estado,) + self._json({'error': str(e)}) + (extra,)
+        except Exception as e:
+            self.estadisticas['errores'] += 1
+            print(f"❌ Error atendiendo {metodo} {ruta}: {type(e).__name__}: {e}", file=sys.stderr)
+            return (HTTPStatus.INTERNAL_SERVER_ERROR,) + self._json({'error': f"{type(e).__name__}: {e}"}) + ({},)
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de generación de paletas")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="dirección en la que escuchar (por defecto, solo local)")
+    parser.add_argument('--puerto', type=int, default=8765,
+                        help="puerto TCP (0: uno libre cualquiera)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="procesos de trabajo (por defecto, uno por CPU)")
+    parser.add_argument('--max-cola', type=int, default=64,
+                        help="tareas en espera antes de responder 503")
+    parser.add_argument('--max-cache-mb', type=int, default=64,
+                        help="memoria máxima de la caché de respuestas")
+    parser.add_argument('--instrumentar', action='store_true',
+                        help="mide el tiempo de cada ruta y muestra un resumen al parar")
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.instrumentar:
+        instrumentacion.activar()
+
+    servidor = ServidorPaletas(args.host, args.puerto, args.workers, args.max_cola, args.max_cache_mb)
+
+    async def ejecutar():
+        tarea = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(senal, tarea.cancel)
+            except (NotImplementedError, RuntimeError):
+                # Windows: Ctrl+C llega como KeyboardInterrupt
+                pass
+        try:
+            await servidor.servir()
+        except asyncio.CancelledError:
+            pass
+
+    try:
+        asyncio.run(ejecutar())
+    except KeyboardInterrupt:
+        pass
+    print("👋 Servidor detenido", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
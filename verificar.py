@@ -1,16 +1,166 @@
-try:
-    import requests
-    import PIL
-    import numpy as np
-    from sklearn.cluster import KMeans
-    import webcolors
-    import matplotlib.pyplot as plt
-    import os
-    from datetime import datetime
-    
+import os
+import sys
+import time
+import asyncio
+import subprocess
+from carga_diferida import disponible
+
+# Módulo a importar -> paquete de pip que lo instala
+DEPENDENCIAS = {
+    'requests': 'requests',
+    'PIL': 'pillow',
+    'numpy': 'numpy',
+    'sklearn': 'scikit-learn',
+    'webcolors': 'webcolors',
+    'matplotlib': 'matplotlib',
+    'dotenv': 'python-dotenv',
+}
+
+# Segundos máximos de arranque en frío (proceso nuevo, incluido el intérprete)
+PRESUPUESTO_AYUDA_CLI = 0.5
+PRESUPUESTO_VENTANA_GUI = 2.0
+
+# Segundos máximos para que el servidor local complete una respuesta
+TIEMPO_SERVIDOR = 30
+
+# Módulos que no deben cargarse solo por importar la GUI o la CLI
+MODULOS_PESADOS = ['numpy', 'matplotlib', 'sklearn', 'scipy', 'src.generador_paletas']
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+CODIGO_VENTANA = """
+import tkinter as tk
+from app import GeneradorPaletasApp
+root = tk.Tk()
+app = GeneradorPaletasApp(root)
+root.update()
+app.planificador.cerrar()
+root.destroy()
+"""
+
+CODIGO_IMPORTS = """
+import sys
+import app, main
+print(','.join(m for m in %r if m in sys.modules))
+"""
+
+
+def verificar_dependencias():
+    """Comprueba que las dependencias se pueden importar sin llegar a cargarlas"""
+    faltan = [paquete for modulo, paquete in DEPENDENCIAS.items() if not disponible(modulo)]
+    if faltan:
+        print(f"❌ Faltan dependencias: {', '.join(faltan)}")
+        print("💡 Ejecuta: pip install " + ' '.join(DEPENDENCIAS.values()))
+        return False
+
     print("✅ Todas las dependencias están instaladas correctamente!")
     print("🚀 Puedes ejecutar: python main.py")
-    
-except ImportError as e:
-    print(f"❌ Error: {e}")
-    print("💡 Ejecuta: pip install requests pillow numpy scikit-learn matplotlib webcolors python-dotenv")
\ No newline at end of file
+    return True
+
+
+def _medir(argumentos):
+    """Tiempo de pared de un proceso Python nuevo y su resultado"""
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable] + argumentos, cwd=DIRECTORIO,
+                             capture_output=True, text=True)
+    return time.perf_counter() - inicio, proceso
+
+
+def verificar_arranque():
+    """Falla si el arranque en frío supera los presupuestos de tiempo"""
+    correcto = True
+
+    _, proceso = _medir(['-c', CODIGO_IMPORTS % (MODULOS_PESADOS,)])
+    cargados = proceso.stdout.strip()
+    if proceso.returncode != 0:
+        print(f"❌ No se pudieron importar app y main:\n{proceso.stderr}")
+        correcto = False
+    elif cargados:
+        print(f"❌ Importar app/main carga módulos pesados: {cargados}")
+        correcto = False
+    else:
+        print("✅ app y main no cargan módulos pesados al importarse")
+
+    duracion, proceso = _medir(['main.py', '--help'])
+    if proceso.returncode != 0:
+        print(f"❌ main.py --help falló:\n{proceso.stderr}")
+        correcto = False
+    elif duracion > PRESUPUESTO_AYUDA_CLI:
+        print(f"❌ main.py --help: {duracion:.2f}s (máximo {PRESUPUESTO_AYUDA_CLI}s)")
+        correcto = False
+    else:
+        print(f"✅ main.py --help: {duracion:.2f}s")
+
+    duracion, proceso = _medir(['-c', CODIGO_VENTANA])
+    if proceso.returncode != 0 and 'TclError' in proceso.stderr:
+        print("⚠️ Sin pantalla: se omite la medida de la ventana")
+    elif proceso.returncode != 0:
+        print(f"❌ No se pudo abrir la ventana:\n{proceso.stderr}")
+        correcto = False
+    elif duracion > PRESUPUESTO_VENTANA_GUI:
+        print(f"❌ Ventana de la GUI: {duracion:.2f}s (máximo {PRESUPUESTO_VENTANA_GUI}s)")
+        correcto = False
+    else:
+        print(f"✅ Ventana de la GUI: {duracion:.2f}s")
+
+    return correcto
+
+
+async def _peticion_hasta_eof(puerto, metodo, ruta, cuerpo=b''):
+    """Envía una petición con ``Connection: close`` y lee la respuesta hasta el EOF"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', puerto)
+    writer.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n"
+                 f"Content-Length: {len(cuerpo)}\r\n\r\n".encode('latin-1') + cuerpo)
+    await writer.drain()
+    respuesta = await reader.read()
+    writer.close()
+    return respuesta
+
+
+async def _probar_servidor():
+    import io
+    from PIL import Image
+    from servidor import ServidorPaletas
+
+    imagen = io.BytesIO()
+    Image.new('RGB', (32, 32), (20, 180, 90)).save(imagen, 'PNG')
+
+    servidor = await ServidorPaletas(puerto=0, workers=1).iniciar()
+    try:
+        # /imagen pasa por el pool de procesos; /salud solo por el bucle de eventos
+        respuestas = []
+        for metodo, ruta, cuerpo in [('POST', '/imagen?colores=2', imagen.getvalue()),
+                                     ('GET', '/salud', b'')]:
+            respuestas.append(await asyncio.wait_for(
+                _peticion_hasta_eof(servidor.puerto, metodo, ruta, cuerpo), TIEMPO_SERVIDOR))
+        return respuestas
+    finally:
+        await servidor.cerrar()
+
+
+def verificar_servidor():
+    """Levanta servidor.py en localhost y comprueba que las respuestas terminan en EOF"""
+    try:
+        respuestas = asyncio.run(_probar_servidor())
+    except asyncio.TimeoutError:
+        print(f"❌ Servidor: sin EOF tras {TIEMPO_SERVIDOR}s con Connection: close")
+        return False
+
+    for respuesta in respuestas:
+        if not respuesta.startswith(b'HTTP/1.1 200'):
+            print(f"❌ Servidor: respuesta inesperada {respuesta[:60]!r}")
+            return False
+    print(f"✅ Servidor local: {len(respuestas)} respuestas completas hasta EOF")
+    return True
+
+
+if __name__ == "__main__":
+    # python verificar.py            -> dependencias
+    # python verificar.py --arranque -> además, presupuesto de tiempo de arranque
+    # python verificar.py --servidor -> además, prueba de servidor.py en localhost
+    correcto = verificar_dependencias()
+    if '--arranque' in sys.argv[1:]:
+        correcto = verificar_arranque() and correcto
+    if '--servidor' in sys.argv[1:]:
+        correcto = verificar_servidor() and correcto
+    sys.exit(0 if correcto else 1)
@@ -1,13 +1,86 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 from PIL import Image, ImageDraw, ImageFont
-import numpy as np
 import os
 from datetime import datetime
 import json
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from compositor_pillow import LienzoPillow, FUENTES
+from carga_diferida import modulo_diferido
+import instrumentacion
+from instrumentacion import instrumentado, tramo
+
+# matplotlib (y NumPy, a través de paleta) solo se importan si se usa el motor 'matplotlib'
+plt = modulo_diferido('matplotlib.pyplot')
+patches = modulo_diferido('matplotlib.patches')
+modulo_paleta = modulo_diferido('paleta')
+
+# Capas estáticas de los slides ya rasterizadas, por proceso: el visualizador
+# viaja al pool en cada tarea, así que una caché en la instancia no se
+# reutilizaría nunca. Clave: (tipo, ancho, alto, colores de marca)
+_PLANTILLAS = {}
+_PNG_PLANTILLAS = {}
+
+
+def _inicializar_render():
+    """Cada proceso de render usa su propio pyplot con un backend sin ventanas"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _ejecutar_render(visualizador, metodo, args):
+    """Ejecuta un método de render del visualizador dentro de un trabajador
+
+    Devuelve el resultado del método y las métricas de instrumentación del
+    trabajador (None si está apagada) para sumarlas en el proceso principal.
+    """
+    return getattr(visualizador, metodo)(*args), instrumentacion.extraer()
+
 
 class VisualizadorRedesSociales:
-    def __init__(self):
+    # Subir al cambiar el diseño de los banners para invalidar la caché de render
+    VERSION_BANNER = '1'
+    
+    # Textos fijos compartidos por los dos motores de render
+    TITULO_BANNER = 'GENERADOR DE\nPALETAS CON IA'
+    SUBTITULO_BANNER = 'Python + Machine Learning + Creatividad'
+    PIE_BANNER = '@TuUsuario • #ArteGenerativo #Python #IA'
+    
+    CARACTERISTICAS = [
+        "🎨 Paletas únicas desde cualquier tema",
+        "🤖 Algoritmos de color HSL + K-means", 
+        "💻 100% código Python",
+        "🚀 Listo para redes sociales"
+    ]
+    
+    APLICACIONES = [
+        "🎨 Diseño gráfico y branding",
+        "🌐 Diseño web y UI/UX",
+        "📱 Redes sociales y marketing",
+        "🎭 Arte digital e ilustración",
+        "🏠 Decoración de interiores",
+        "👗 Diseño de moda y textiles"
+    ]
+    
+    TECNOLOGIAS = [
+        "🐍 Python 3.x",
+        "🤖 Algoritmo K-means clustering", 
+        "🎨 Modelo de color HSL",
+        "📊 Matplotlib para visualización",
+        "🖼️ PIL (Pillow) para procesamiento",
+        "📈 Scikit-learn para machine learning"
+    ]
+    
+    def __init__(self, backend='matplotlib', directorio_cache=None):
+        # Motor de render por defecto: 'matplotlib' (original) o 'pillow'
+        # (dibujo directo a la resolución exacta, mucho más rápido)
+        self.backend = backend
+        
+        # Banners ya renderizados, reutilizables entre ejecuciones del kit
+        if directorio_cache is None:
+            directorio_cache = os.path.join(os.path.expanduser('~/.generador_paletas'), 'cache_render')
+        self.directorio_cache = directorio_cache
+        
         # Configuración para diferentes plataformas
         self.tamanos = {
             'instagram_cuadrado': (1080, 1080),
@@ -25,41 +98,106 @@ class VisualizadorRedesSociales:
             'secundario': '#f72585'
         }
     
-    def crear_banner_proyecto(self, plataforma='instagram_cuadrado'):
-        """Crea un banner atractivo para presentar el proyecto"""
+    def crear_banner_proyecto(self, plataforma='instagram_cuadrado', backend=None, usar_cache=True):
+        """Crea un banner atractivo para presentar el proyecto
+        
+        El banner solo depende de la marca, el tamaño, los textos y la fuente,
+        así que si ya se renderizó con esos datos se enlaza desde la caché.
+        """
         ancho, alto = self.tamanos[plataforma]
+        backend = backend or self.backend
+        os.makedirs('redes_sociales', exist_ok=True)
+        filename = f"redes_sociales/banner_proyecto_{plataforma}.png"
+        
+        huella = self._huella_banner(plataforma, backend)
+        cacheado = os.path.join(self.directorio_cache, f"banner_{huella}.png")
+        
+        if usar_cache and os.path.exists(cacheado):
+            self._enlazar_o_copiar(cacheado, filename)
+            print(f"♻️ Banner reutilizado: {filename}")
+            return filename
+        
+        # El destino puede ser un enlace duro a la caché: nunca se sobrescribe en sitio
+        if os.path.exists(filename):
+            os.remove(filename)
+        
+        if backend == 'pillow':
+            self._pil_banner_proyecto(plataforma, ancho, alto)
+        else:
+            self._mpl_banner_proyecto(plataforma, ancho, alto)
+        
+        if usar_cache:
+            self._guardar_en_cache_render(filename, cacheado)
         
+        print(f"✅ Banner creado: {filename}")
+        return filename
+    
+    def _huella_banner(self, plataforma, backend):
+        """Hash de todo lo que interviene en el aspecto de un banner"""
+        if backend == 'pillow':
+            fuente = FUENTES
+        else:
+            fuente = [plt.rcParams['font.family'], plt.rcParams['font.sans-serif'][:3]]
+        
+        datos = json.dumps({
+            'version': self.VERSION_BANNER,
+            'backend': backend,
+            'marca': self.colores_marca,
+            'tamano': self.tamanos[plataforma],
+            'textos': [self.TITULO_BANNER, self.SUBTITULO_BANNER, self.PIE_BANNER,
+                       self.CARACTERISTICAS],
+            'fuente': fuente
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(datos.encode('utf-8')).hexdigest()[:32]
+    
+    @staticmethod
+    def _enlazar_o_copiar(origen, destino):
+        """Crea ``destino`` como enlace duro de ``origen`` o, si no se puede, como copia"""
+        if os.path.exists(destino):
+            os.remove(destino)
+        try:
+            os.link(origen, destino)
+        except OSError:
+            shutil.copyfile(origen, destino)
+    
+    def _guardar_en_cache_render(self, filename, cacheado):
+        try:
+            os.makedirs(self.directorio_cache, exist_ok=True)
+            # Copia a un temporal y rename atómico: varios trabajadores del
+            # kit pueden estar guardando el mismo banner a la vez
+            temporal = f"{cacheado}.{os.getpid()}.tmp"
+            shutil.copyfile(filename, temporal)
+            os.replace(temporal, cacheado)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el banner en caché: {e}")
+    
+    @instrumentado('render.mpl_banner_proyecto')
+    def _mpl_banner_proyecto(self, plataforma, ancho, alto):
+        """Banner del proyecto con el motor matplotlib"""
         fig, ax = plt.subplots(figsize=(ancho/100, alto/100), dpi=100)
         fig.patch.set_facecolor(self.colores_marca['fondo'])
         ax.set_facecolor(self.colores_marca['fondo'])
         
         # Título principal
-        ax.text(0.5, 0.7, 'GENERADOR DE\nPALETAS CON IA', 
+        ax.text(0.5, 0.7, self.TITULO_BANNER, 
                 transform=ax.transAxes, ha='center', va='center',
                 fontsize=48, fontweight='bold', color=self.colores_marca['texto'],
                 linespacing=1.2)
         
         # Subtítulo
-        ax.text(0.5, 0.5, 'Python + Machine Learning + Creatividad',
+        ax.text(0.5, 0.5, self.SUBTITULO_BANNER,
                 transform=ax.transAxes, ha='center', va='center',
                 fontsize=24, color=self.colores_marca['acento'],
                 style='italic')
         
         # Características
-        caracteristicas = [
-            "🎨 Paletas únicas desde cualquier tema",
-            "🤖 Algoritmos de color HSL + K-means", 
-            "💻 100% código Python",
-            "🚀 Listo para redes sociales"
-        ]
-        
-        for i, caracteristica in enumerate(caracteristicas):
+        for i, caracteristica in enumerate(self.CARACTERISTICAS):
             ax.text(0.5, 0.35 - i*0.08, caracteristica,
                     transform=ax.transAxes, ha='center', va='center',
                     fontsize=18, color=self.colores_marca['texto'])
         
         # Footer
-        ax.text(0.5, 0.1, '@TuUsuario • #ArteGenerativo #Python #IA',
+        ax.text(0.5, 0.1, self.PIE_BANNER,
                 transform=ax.transAxes, ha='center', va='center',
                 fontsize=14, color=self.colores_marca['secundario'])
         
@@ -68,39 +206,46 @@ class VisualizadorRedesSociales:
         ax.axis('off')
         
         # Guardar
-        os.makedirs('redes_sociales', exist_ok=True)
         filename = f"redes_sociales/banner_proyecto_{plataforma}.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight', 
-                   facecolor=self.colores_marca['fondo'])
+        with tramo('render.savefig'):
+            plt.savefig(filename, dpi=300, bbox_inches='tight', 
+                       facecolor=self.colores_marca['fondo'])
         plt.close()
         
-        print(f"✅ Banner creado: {filename}")
         return filename
     
-    def crear_carousel_paleta(self, paleta_data, plataforma='instagram_cuadrado'):
+    def crear_carousel_paleta(self, paleta_data, plataforma='instagram_cuadrado', backend=None):
         """Crea un carousel para mostrar una paleta específica"""
+        return [getattr(self, metodo)(*args)
+                for metodo, args in self._tareas_carousel(paleta_data, plataforma, backend)]
+    
+    def _tareas_carousel(self, paleta_data, plataforma='instagram_cuadrado', backend=None):
+        """Lista de (método, argumentos) que renderizan cada slide del carousel"""
         ancho, alto = self.tamanos[plataforma]
         tema = paleta_data['tema']
         colores = paleta_data['colores']
-        
-        # Crear múltiples slides para el carousel
-        slides = []
-        
-        # Slide 1: Presentación de la paleta
-        slides.append(self._crear_slide_presentacion(tema, colores, ancho, alto))
-        
-        # Slide 2: Colores individuales
-        slides.append(self._crear_slide_colores_detalle(tema, colores, ancho, alto))
-        
-        # Slide 3: Aplicaciones prácticas
-        slides.append(self._crear_slide_aplicaciones(tema, colores, ancho, alto))
-        
-        # Slide 4: Código y tecnología
-        slides.append(self._crear_slide_tecnologia(tema, ancho, alto))
-        
-        return slides
+        if (backend or self.backend) == 'pillow':
+            prefijo = '_pil_slide_'
+            extra = ()
+        else:
+            prefijo = '_crear_slide_'
+            # Los colores en 0-1 para matplotlib se calculan una vez por paleta
+            # y los comparten los tres slides que los usan
+            extra = (modulo_paleta.Paleta.desde_colores(colores).normalizado,)
+        
+        return [
+            # Slide 1: Presentación de la paleta
+            (prefijo + 'presentacion', (tema, colores, ancho, alto) + extra),
+            # Slide 2: Colores individuales
+            (prefijo + 'colores_detalle', (tema, colores, ancho, alto) + extra),
+            # Slide 3: Aplicaciones prácticas
+            (prefijo + 'aplicaciones', (tema, colores, ancho, alto) + extra),
+            # Slide 4: Código y tecnología
+            (prefijo + 'tecnologia', (tema, ancho, alto))
+        ]
     
-    def _crear_slide_presentacion(self, tema, colores, ancho, alto):
+    @instrumentado('render.crear_slide_presentacion')
+    def _crear_slide_presentacion(self, tema, colores, ancho, alto, normalizados):
         """Slide 1: Presentación principal de la paleta"""
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(ancho/100, alto/100), 
                                       gridspec_kw={'height_ratios': [2, 1]})
@@ -117,7 +262,7 @@ class VisualizadorRedesSociales:
         for i, color_info in enumerate(colores):
             color = color_info['rgb']
             rect = patches.Rectangle((i/len(colores), 0.3), 1/len(colores), 0.4,
-                                   facecolor=np.array(color)/255.0)
+                                   facecolor=normalizados[i])
             ax1.add_patch(rect)
             
             # Texto del color
@@ -145,13 +290,15 @@ class VisualizadorRedesSociales:
             ax.axis('off')
         
         filename = f"redes_sociales/carousel_{tema.replace(' ', '_')}_slide1.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight', 
-                   facecolor=self.colores_marca['fondo'])
+        with tramo('render.savefig'):
+            plt.savefig(filename, dpi=300, bbox_inches='tight', 
+                       facecolor=self.colores_marca['fondo'])
         plt.close()
         
         return filename
     
-    def _crear_slide_colores_detalle(self, tema, colores, ancho, alto):
+    @instrumentado('render.crear_slide_colores_detalle')
+    def _crear_slide_colores_detalle(self, tema, colores, ancho, alto, normalizados):
         """Slide 2: Detalle de cada color"""
         fig, ax = plt.subplots(figsize=(ancho/100, alto/100))
         fig.patch.set_facecolor(self.colores_marca['fondo'])
@@ -168,7 +315,7 @@ class VisualizadorRedesSociales:
             
             # Cuadrado de color
             rect = patches.Rectangle((0.1, y_pos - 0.04), 0.1, 0.08,
-                                   facecolor=np.array(color)/255.0)
+                                   facecolor=normalizados[i])
             ax.add_patch(rect)
             
             # Información del color
@@ -191,13 +338,15 @@ class VisualizadorRedesSociales:
         ax.axis('off')
         
         filename = f"redes_sociales/carousel_{tema.replace(' ', '_')}_slide2.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight', 
-                   facecolor=self.colores_marca['fondo'])
+        with tramo('render.savefig'):
+            plt.savefig(filename, dpi=300, bbox_inches='tight', 
+                       facecolor=self.colores_marca['fondo'])
         plt.close()
         
         return filename
     
-    def _crear_slide_aplicaciones(self, tema, colores, ancho, alto):
+    @instrumentado('render.crear_slide_aplicaciones')
+    def _crear_slide_aplicaciones(self, tema, colores, ancho, alto, normalizados):
         """Slide 3: Aplicaciones prácticas de la paleta"""
         fig, ax = plt.subplots(figsize=(ancho/100, alto/100))
         fig.patch.set_facecolor(self.colores_marca['fondo'])
@@ -207,25 +356,16 @@ class VisualizadorRedesSociales:
                 transform=ax.transAxes, ha='center', va='center',
                 fontsize=28, fontweight='bold', color=self.colores_marca['texto'])
         
-        aplicaciones = [
-            "🎨 Diseño gráfico y branding",
-            "🌐 Diseño web y UI/UX",
-            "📱 Redes sociales y marketing",
-            "🎭 Arte digital e ilustración",
-            "🏠 Decoración de interiores",
-            "👗 Diseño de moda y textiles"
-        ]
-        
-        for i, aplicacion in enumerate(aplicaciones):
+        for i, aplicacion in enumerate(self.APLICACIONES):
             y_pos = 0.75 - i * 0.1
             ax.text(0.1, y_pos, aplicacion,
                     transform=ax.transAxes, ha='left', va='center',
                     fontsize=16, color=self.colores_marca['texto'])
         
         # Mini paleta de referencia
-        for i, color_info in enumerate(colores[:3]):
+        for i in range(min(3, len(normalizados))):
             rect = patches.Rectangle((0.7 + i*0.08, 0.2), 0.07, 0.1,
-                                   facecolor=np.array(color_info['rgb'])/255.0)
+                                   facecolor=normalizados[i])
             ax.add_patch(rect)
         
         ax.text(0.5, 0.1, "¿Para qué usarías esta paleta? 👇",
@@ -237,12 +377,14 @@ class VisualizadorRedesSociales:
         ax.axis('off')
         
         filename = f"redes_sociales/carousel_{tema.replace(' ', '_')}_slide3.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight', 
-                   facecolor=self.colores_marca['fondo'])
+        with tramo('render.savefig'):
+            plt.savefig(filename, dpi=300, bbox_inches='tight', 
+                       facecolor=self.colores_marca['fondo'])
         plt.close()
         
         return filename
     
+    @instrumentado('render.crear_slide_tecnologia')
     def _crear_slide_tecnologia(self, tema, ancho, alto):
         """Slide 4: Tecnología utilizada"""
         fig, ax = plt.subplots(figsize=(ancho/100, alto/100))
@@ -253,16 +395,7 @@ class VisualizadorRedesSociales:
                 transform=ax.transAxes, ha='center', va='center',
                 fontsize=28, fontweight='bold', color=self.colores_marca['texto'])
         
-        tecnologias = [
-            "🐍 Python 3.x",
-            "🤖 Algoritmo K-means clustering", 
-            "🎨 Modelo de color HSL",
-            "📊 Matplotlib para visualización",
-            "🖼️ PIL (Pillow) para procesamiento",
-            "📈 Scikit-learn para machine learning"
-        ]
-        
-        for i, tech in enumerate(tecnologias):
+        for i, tech in enumerate(self.TECNOLOGIAS):
             y_pos = 0.75 - i * 0.1
             ax.text(0.1, y_pos, tech,
                     transform=ax.transAxes, ha='left', va='center',
@@ -281,12 +414,152 @@ class VisualizadorRedesSociales:
         ax.axis('off')
         
         filename = f"redes_sociales/carousel_{tema.replace(' ', '_')}_slide4.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight', 
-                   facecolor=self.colores_marca['fondo'])
+        with tramo('render.savefig'):
+            plt.savefig(filename, dpi=300, bbox_inches='tight', 
+                       facecolor=self.colores_marca['fondo'])
         plt.close()
         
         return filename
     
+    # ===== MOTOR PILLOW =====
+    # Mismos diseños que los métodos de matplotlib, dibujados directamente a la
+    # resolución de self.tamanos sin figura intermedia ni dpi=300
+    
+    def _nuevo_lienzo(self, ancho, alto):
+        return LienzoPillow(ancho, alto, self.colores_marca['fondo'])
+    
+    def _clave_plantilla(self, tipo, ancho, alto):
+        return (tipo, ancho, alto, tuple(sorted(self.colores_marca.items())))
+    
+    def _plantilla(self, tipo, ancho, alto):
+        """Capa estática de un slide, rasterizada una sola vez por proceso
+        
+        El lienzo devuelto es compartido: hay que copiarlo antes de dibujar
+        encima la parte propia de cada paleta.
+        """
+        clave = self._clave_plantilla(tipo, ancho, alto)
+        if clave not in _PLANTILLAS:
+            lienzo = self._nuevo_lienzo(ancho, alto)
+            getattr(self, f'_capa_estatica_{tipo}')(lienzo)
+            _PLANTILLAS[clave] = lienzo
+        return _PLANTILLAS[clave]
+    
+    def _png_plantilla(self, tipo, ancho, alto):
+        """Bytes PNG de la plantilla, para slides que no dependen de la paleta"""
+        clave = self._clave_plantilla(tipo, ancho, alto)
+        if clave not in _PNG_PLANTILLAS:
+            _PNG_PLANTILLAS[clave] = self._plantilla(tipo, ancho, alto).a_png()
+        return _PNG_PLANTILLAS[clave]
+    
+    def _capa_estatica_aplicaciones(self, lienzo):
+        lienzo.texto(0.5, 0.9, 'APLICACIONES PRÁCTICAS', 28, self.colores_marca['texto'],
+                     ha='center', estilo='negrita')
+        
+        for i, aplicacion in enumerate(self.APLICACIONES):
+            lienzo.texto(0.1, 0.75 - i * 0.1, aplicacion, 16, self.colores_marca['texto'])
+        
+        lienzo.texto(0.5, 0.1, "¿Para qué usarías esta paleta? 👇", 14,
+                     self.colores_marca['secundario'], ha='center')
+    
+    def _capa_estatica_tecnologia(self, lienzo):
+        lienzo.texto(0.5, 0.9, 'TECNOLOGÍA UTILIZADA', 28, self.colores_marca['texto'],
+                     ha='center', estilo='negrita')
+        
+        for i, tech in enumerate(self.TECNOLOGIAS):
+            lienzo.texto(0.1, 0.75 - i * 0.1, tech, 16, self.colores_marca['texto'])
+        
+        lienzo.texto(0.5, 0.2, "💡 Proyecto 100% código abierto", 18,
+                     self.colores_marca['acento'], ha='center')
+        lienzo.texto(0.5, 0.1, "@TuUsuario • #Python #MachineLearning #IA", 14,
+                     self.colores_marca['secundario'], ha='center')
+    
+    @instrumentado('render.pil_banner_proyecto')
+    def _pil_banner_proyecto(self, plataforma, ancho, alto):
+        """Banner del proyecto con el motor Pillow"""
+        lienzo = self._nuevo_lienzo(ancho, alto)
+        
+        lienzo.texto(0.5, 0.7, self.TITULO_BANNER, 48, self.colores_marca['texto'],
+                     ha='center', estilo='negrita')
+        lienzo.texto(0.5, 0.5, self.SUBTITULO_BANNER, 24,
+                     self.colores_marca['acento'], ha='center', estilo='cursiva')
+        
+        for i, caracteristica in enumerate(self.CARACTERISTICAS):
+            lienzo.texto(0.5, 0.35 - i*0.08, caracteristica, 18, self.colores_marca['texto'],
+                         ha='center')
+        
+        lienzo.texto(0.5, 0.1, self.PIE_BANNER, 14,
+                     self.colores_marca['secundario'], ha='center')
+        
+        return lienzo.guardar(f"redes_sociales/banner_proyecto_{plataforma}.png")
+    
+    @instrumentado('render.pil_slide_presentacion')
+    def _pil_slide_presentacion(self, tema, colores, ancho, alto):
+        """Slide 1 con el motor Pillow"""
+        lienzo = self._nuevo_lienzo(ancho, alto)
+        
+        # Zona superior (2/3 del alto, como height_ratios=[2, 1])
+        lienzo.usar_zona(0, 1/3, 1, 1)
+        lienzo.texto(0.5, 0.8, f'PALETA: {tema.upper()}', 32, self.colores_marca['texto'],
+                     ha='center', estilo='negrita')
+        
+        for i, color_info in enumerate(colores):
+            color = color_info['rgb']
+            lienzo.rectangulo(i/len(colores), 0.3, 1/len(colores), 0.4, color)
+            lienzo.texto((i + 0.5)/len(colores), 0.2, color_info['hex'], 14,
+                         'white' if sum(color) < 450 else 'black', ha='center', estilo='negrita')
+        
+        # Zona inferior
+        lienzo.usar_zona(0, 0, 1, 1/3)
+        lienzo.texto(0.05, 0.8, "🎨 Paleta generada automáticamente con IA", 16,
+                     self.colores_marca['texto'])
+        lienzo.texto(0.05, 0.5, f"🌈 {len(colores)} colores únicos", 14,
+                     self.colores_marca['acento'])
+        lienzo.texto(0.05, 0.2, "👉 Desliza para más detalles", 12,
+                     self.colores_marca['secundario'])
+        
+        return lienzo.guardar(f"redes_sociales/carousel_{tema.replace(' ', '_')}_slide1.png")
+    
+    @instrumentado('render.pil_slide_colores_detalle')
+    def _pil_slide_colores_detalle(self, tema, colores, ancho, alto):
+        """Slide 2 con el motor Pillow"""
+        lienzo = self._nuevo_lienzo(ancho, alto)
+        
+        lienzo.texto(0.5, 0.9, 'DETALLE DE COLORES', 28, self.colores_marca['texto'],
+                     ha='center', estilo='negrita')
+        
+        for i, color_info in enumerate(colores):
+            y_pos = 0.75 - i * 0.12
+            color = color_info['rgb']
+            
+            lienzo.rectangulo(0.1, y_pos - 0.04, 0.1, 0.08, color)
+            lienzo.texto(0.25, y_pos, color_info['nombre'], 16, self.colores_marca['texto'])
+            lienzo.texto(0.25, y_pos - 0.03, color_info['hex'], 14,
+                         self.colores_marca['acento'], estilo='mono')
+            lienzo.texto(0.6, y_pos - 0.03, f"RGB{tuple(color)}", 12,
+                         self.colores_marca['texto'], estilo='mono')
+        
+        return lienzo.guardar(f"redes_sociales/carousel_{tema.replace(' ', '_')}_slide2.png")
+    
+    @instrumentado('render.pil_slide_aplicaciones')
+    def _pil_slide_aplicaciones(self, tema, colores, ancho, alto):
+        """Slide 3 con el motor Pillow: plantilla fija + mini paleta"""
+        lienzo = self._plantilla('aplicaciones', ancho, alto).copia()
+        
+        for i, color_info in enumerate(colores[:3]):
+            lienzo.rectangulo(0.7 + i*0.08, 0.2, 0.07, 0.1, color_info['rgb'])
+        
+        return lienzo.guardar(f"redes_sociales/carousel_{tema.replace(' ', '_')}_slide3.png")
+    
+    @instrumentado('render.pil_slide_tecnologia')
+    def _pil_slide_tecnologia(self, tema, ancho, alto):
+        """Slide 4 con el motor Pillow: no depende de la paleta, se escribe la plantilla"""
+        png = self._png_plantilla('tecnologia', ancho, alto)
+        
+        filename = f"redes_sociales/carousel_{tema.replace(' ', '_')}_slide4.png"
+        with open(filename, 'wb') as f:
+            f.write(png)
+        return filename
+    
     def crear_video_presentacion(self, paletas_generadas):
         """Crea un script para video presentación (Reels/TikTok)"""
         script = {
@@ -335,29 +608,68 @@ class VisualizadorRedesSociales:
         print("✅ Script de video creado: redes_sociales/script_video_presentacion.json")
         return script
 
-    def generar_kit_redes(self, paletas_generadas):
-        """Genera un kit completo para redes sociales"""
+    def generar_kit_redes(self, paletas_generadas, backend=None, workers=None):
+        """Genera un kit completo para redes sociales
+        
+        ``paletas_generadas`` puede ser una lista o un iterador: las paletas se
+        consumen de una en una y solo se retienen las que usan los carousels y
+        el guión de vídeo. ``backend`` elige el motor de render para esta
+        llamada. Los banners y slides se renderizan en paralelo en ``workers``
+        procesos (por defecto uno por núcleo), cada uno con su propio pyplot.
+        Devuelve cuántas paletas se han consumido.
+        """
         print("🚀 GENERANDO KIT COMPLETO PARA REDES SOCIALES...")
+        os.makedirs('redes_sociales', exist_ok=True)
         
-        # Crear banners para diferentes plataformas
-        plataformas = ['instagram_cuadrado', 'instagram_historia', 'twitter', 'linkedin']
-        
-        for plataforma in plataformas:
-            self.crear_banner_proyecto(plataforma)
-        
-        # Crear carousels para las primeras 3 paletas
-        for i, paleta in enumerate(paletas_generadas[:3]):
-            print(f"📱 Creando carousel para: {paleta['tema']}")
-            self.crear_carousel_paleta(paleta)
+        if workers is None:
+            workers = os.cpu_count() or 1
         
-        # Crear script de video
-        self.crear_video_presentacion(paletas_generadas)
+        # Banners para diferentes plataformas
+        plataformas = ['instagram_cuadrado', 'instagram_historia', 'twitter', 'linkedin']
+        tareas_banner = [('crear_banner_proyecto', (plataforma, backend)) for plataforma in plataformas]
+        
+        paletas_kit = []
+        total_paletas = 0
+        
+        if workers <= 1:
+            # Crear carousels para las primeras 3 paletas según van llegando
+            for paleta in paletas_generadas:
+                total_paletas += 1
+                if len(paletas_kit) < 3:
+                    paletas_kit.append(paleta)
+                    print(f"📱 Creando carousel para: {paleta['tema']}")
+                    self.crear_carousel_paleta(paleta, backend=backend)
+            
+            for metodo, args in tareas_banner:
+                getattr(self, metodo)(*args)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_render) as executor:
+                # Los banners no dependen de las paletas: se lanzan primero
+                futuros = [executor.submit(_ejecutar_render, self, metodo, args)
+                           for metodo, args in tareas_banner]
+                
+                for paleta in paletas_generadas:
+                    total_paletas += 1
+                    if len(paletas_kit) < 3:
+                        paletas_kit.append(paleta)
+                        print(f"📱 Creando carousel para: {paleta['tema']}")
+                        futuros.extend(executor.submit(_ejecutar_render, self, metodo, args)
+                                       for metodo, args in self._tareas_carousel(paleta, backend=backend))
+                
+                # Propaga el primer error de render, si lo hay
+                for futuro in futuros:
+                    _, metricas = futuro.result()
+                    instrumentacion.fusionar(metricas)
+        
+        # Crear script de video (solo usa las primeras paletas)
+        self.crear_video_presentacion(paletas_kit)
         
         # Crear archivo README para el kit
         self._crear_readme_kit()
         
         print("🎉 ¡Kit de redes sociales generado exitosamente!")
         print("📍 Revisa la carpeta 'redes_sociales'")
+        return total_paletas
     
     def _crear_readme_kit(self):
         """Crea un archivo README con instrucciones"""
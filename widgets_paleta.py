@@ -0,0 +1,429 @@
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk, scrolledtext
+
+FONDO_OSCURO = '#2c3e50'
+FONDO_CLARO = '#f8f9fa'
+
+
+class TarjetaColor:
+    """Tarjeta de un color (muestra, nombre, hex, RGB y botón de copiar)
+
+    Los widgets se crean una vez; ``actualizar`` solo reconfigura lo que ha
+    cambiado respecto al color mostrado antes.
+    """
+
+    def __init__(self, parent, al_copiar):
+        self.al_copiar = al_copiar
+        self.hex = None
+        self._mostrado = None
+
+        self.frame = ttk.Frame(parent, relief='solid', borderwidth=1, padding="10")
+
+        # Muestra de color grande
+        self.muestra = tk.Canvas(self.frame, width=120, height=80, highlightthickness=0)
+        self.muestra.grid(row=0, column=0, columnspan=2, pady=(0, 10), sticky=(tk.W, tk.E))
+
+        # Información del color
+        self.nombre_label = ttk.Label(self.frame, font=('Arial', 11, 'bold'))
+        self.nombre_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+
+        self.hex_label = ttk.Label(self.frame, font=('Courier', 10, 'bold'))
+        self.hex_label.grid(row=2, column=0, sticky=tk.W, pady=(0, 2))
+
+        self.rgb_label = ttk.Label(self.frame, font=('Courier', 8))
+        self.rgb_label.grid(row=3, column=0, sticky=tk.W, pady=(0, 10))
+
+        # Botones de acción
+        btn_frame = ttk.Frame(self.frame)
+        btn_frame.grid(row=2, column=1, rowspan=2, sticky=(tk.E, tk.S))
+        ttk.Button(btn_frame, text="📋", width=3,
+                   command=lambda: self.al_copiar(self.hex)).pack(side=tk.LEFT, padx=(5, 0))
+
+    def actualizar(self, color_info):
+        datos = (color_info['hex'], color_info.get('nombre', ''), tuple(color_info['rgb']))
+        if datos == self._mostrado:
+            return
+        anterior = self._mostrado or (None, None, None)
+        hex_color, nombre, rgb = datos
+
+        if hex_color != anterior[0]:
+            self.muestra.configure(bg=hex_color)
+            self.hex_label.configure(text=hex_color)
+        if nombre != anterior[1]:
+            self.nombre_label.configure(text=nombre)
+        if rgb != anterior[2]:
+            self.rgb_label.configure(text=f"RGB{rgb}")
+
+        self.hex = hex_color
+        self._mostrado = datos
+
+    def mostrar(self, fila, columna):
+        self.frame.grid(row=fila, column=columna, sticky=(tk.W, tk.E, tk.N, tk.S),
+                        padx=8, pady=8, ipadx=5, ipady=5)
+
+    def ocultar(self):
+        self.frame.grid_remove()
+
+
+class RejillaColores:
+    """Rejilla desplazable de tarjetas de color con un pool reutilizable
+
+    Las tarjetas sobrantes se ocultan en lugar de destruirse, así que cambiar
+    de paleta solo reconfigura widgets existentes.
+    """
+
+    def __init__(self, parent, al_copiar, columnas=3, fondo=FONDO_OSCURO):
+        self.al_copiar = al_copiar
+        self.columnas = columnas
+        self.tarjetas = []
+
+        self.contenedor = ttk.Frame(parent)
+        self.contenedor.pack(fill=tk.BOTH, expand=True)
+
+        self.canvas = tk.Canvas(self.contenedor, bg=fondo)
+        scrollbar = ttk.Scrollbar(self.contenedor, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.interior = ttk.Frame(self.canvas)
+        self.interior.bind(
+            "<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        )
+        self.canvas.create_window((0, 0), window=self.interior, anchor="nw")
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        for columna in range(columnas):
+            self.interior.columnconfigure(columna, weight=1)
+
+        self.mensaje = ttk.Label(self.interior, font=('Arial', 12))
+
+    def actualizar(self, colores, fondo=None):
+        if fondo is not None:
+            self.canvas.configure(bg=fondo)
+
+        if not colores:
+            self.vaciar("No hay colores para mostrar")
+            return
+        self.mensaje.grid_remove()
+
+        while len(self.tarjetas) < len(colores):
+            self.tarjetas.append(TarjetaColor(self.interior, self.al_copiar))
+
+        for i, tarjeta in enumerate(self.tarjetas):
+            if i < len(colores):
+                tarjeta.actualizar(colores[i])
+                tarjeta.mostrar(i // self.columnas, i % self.columnas)
+            else:
+                tarjeta.ocultar()
+        self.canvas.yview_moveto(0)
+
+    def vaciar(self, mensaje=""):
+        for tarjeta in self.tarjetas:
+            tarjeta.ocultar()
+        self.mensaje.configure(text=mensaje)
+        self.mensaje.grid(row=0, column=0, columnspan=self.columnas, pady=50)
+
+
+class PanelTexto:
+    """Área de texto de solo lectura que se reescribe sin recrearse"""
+
+    def __init__(self, parent, **opciones):
+        self.texto = None
+        self._visible = False
+
+        self.frame = ttk.Frame(parent)
+        self.frame.pack(fill=tk.BOTH, expand=True)
+
+        self.widget = scrolledtext.ScrolledText(self.frame, **opciones)
+        self.widget.config(state=tk.DISABLED)
+        self.mensaje = ttk.Label(self.frame, font=('Arial', 12))
+
+    def actualizar(self, texto):
+        if not self._visible:
+            self.mensaje.pack_forget()
+            self.widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+            self._visible = True
+        if texto == self.texto:
+            return
+
+        self.widget.config(state=tk.NORMAL)
+        self.widget.delete('1.0', tk.END)
+        self.widget.insert(tk.INSERT, texto)
+        self.widget.config(state=tk.DISABLED)
+        self.widget.yview_moveto(0)
+        self.texto = texto
+
+    def vaciar(self, mensaje=""):
+        self.widget.pack_forget()
+        self._visible = False
+        self.mensaje.configure(text=mensaje)
+        self.mensaje.pack(pady=50)
+
+
+class LienzoPaleta:
+    """Canvas único de la pestaña de visualización
+
+    Muestra la imagen de la paleta o, si no la hay, un dibujo de barras. Los
+    elementos del canvas (imagen, barras y textos) se crean una vez y se
+    mueven, recolorean u ocultan en cada actualización.
+    """
+
+    ANCHO_BARRAS = 600
+    ALTO_BARRAS = 300
+
+    def __init__(self, parent, fondo=FONDO_OSCURO):
+        self.fondo = fondo
+        self.photo = None
+
+        self.frame = ttk.Frame(parent)
+        self.frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(self.frame, bg=fondo, highlightthickness=0)
+        self.canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        self.h_scroll = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        self.v_scroll = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(xscrollcommand=self.h_scroll.set, yscrollcommand=self.v_scroll.set)
+
+        self.imagen = self.canvas.create_image(0, 0, anchor=tk.NW, state='hidden')
+
+        # Dibujo de barras: fondo blanco, título y un pool de barras con textos
+        self.panel = self.canvas.create_rectangle(
+            0, 0, self.ANCHO_BARRAS, self.ALTO_BARRAS, fill='white', outline='', state='hidden')
+        self.titulo = self.canvas.create_text(
+            self.ANCHO_BARRAS / 2, 30, font=('Arial', 16, 'bold'), fill='#333333', state='hidden')
+        self.aviso = self.canvas.create_text(
+            self.ANCHO_BARRAS / 2, 150, font=('Arial', 14), fill='gray', state='hidden')
+        self.barras = []
+
+    def _barra(self, i):
+        while len(self.barras) <= i:
+            self.barras.append((
+                self.canvas.create_rectangle(0, 0, 0, 0, outline='', state='hidden'),
+                self.canvas.create_text(0, 0, font=('Arial', 9, 'bold'), fill='#333333', state='hidden'),
+                self.canvas.create_text(0, 0, font=('Arial', 8), fill='#666666', state='hidden'),
+            ))
+        return self.barras[i]
+
+    def _ocultar_todo(self):
+        for item in (self.imagen, self.panel, self.titulo, self.aviso):
+            self.canvas.itemconfigure(item, state='hidden')
+        for barra in self.barras:
+            for item in barra:
+                self.canvas.itemconfigure(item, state='hidden')
+
+    def _scrollbars(self, visibles):
+        if visibles:
+            self.h_scroll.grid(row=1, column=0, sticky=(tk.W, tk.E))
+            self.v_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        else:
+            self.h_scroll.grid_remove()
+            self.v_scroll.grid_remove()
+
+    def cambiar_fondo(self, fondo):
+        self.fondo = fondo
+        self.canvas.configure(bg=fondo)
+
+    def mostrar_imagen(self, photo, desbordada=False, fondo=None):
+        """Muestra una ``PhotoImage`` ya escalada; ``desbordada`` activa el scroll"""
+        self._ocultar_todo()
+        self.canvas.configure(bg=fondo or self.fondo)
+        self.photo = photo  # Mantener referencia
+        self.canvas.itemconfigure(self.imagen, image=photo, state='normal')
+        self.canvas.configure(scrollregion=(0, 0, photo.width(), photo.height()))
+        self._scrollbars(desbordada)
+
+    def mostrar_barras(self, paleta, fondo=None):
+        """Dibuja la paleta como barras de color con su hex y nombre"""
+        self._ocultar_todo()
+        self._scrollbars(False)
+        self.photo = None
+        self.canvas.configure(bg=fondo or self.fondo, scrollregion=(0, 0, self.ANCHO_BARRAS, self.ALTO_BARRAS))
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self.canvas.itemconfigure(self.panel, state='normal')
+
+        colores = (paleta or {}).get('colores') or []
+        if not paleta or not colores:
+            texto = "No hay paleta para mostrar" if not paleta else "No hay colores en la paleta"
+            self.canvas.itemconfigure(self.aviso, text=texto, state='normal')
+            return
+
+        ancho_barra = (self.ANCHO_BARRAS - 20) / len(colores)
+        x = 10
+        for i, color_info in enumerate(colores):
+            rectangulo, texto_hex, texto_nombre = self._barra(i)
+            centro = x + ancho_barra / 2
+            self.canvas.coords(rectangulo, x, 50, x + ancho_barra, 200)
+            self.canvas.itemconfigure(rectangulo, fill=color_info['hex'], state='normal')
+            self.canvas.coords(texto_hex, centro, 220)
+            self.canvas.itemconfigure(texto_hex, text=color_info['hex'], state='normal')
+            self.canvas.coords(texto_nombre, centro, 240)
+            self.canvas.itemconfigure(texto_nombre, text=color_info.get('nombre', f'Color {i+1}'),
+                                      state='normal')
+            x += ancho_barra
+
+        self.canvas.itemconfigure(self.titulo, text=paleta.get('tema', 'Paleta de colores'),
+                                  state='normal')
+
+    def vaciar(self):
+        self._ocultar_todo()
+        self._scrollbars(False)
+        self.photo = None
+
+
+class ExploradorPaletas:
+    """Lista virtualizada de las paletas del historial o de favoritos
+
+    Todo se dibuja en un único Canvas con un pool de filas del tamaño de lo
+    visible: al desplazarse, las filas se recolocan y se rellenan con otras
+    paletas, de modo que el coste no depende del tamaño de la biblioteca.
+    Las paletas se piden al ``almacen`` por páginas bajo demanda y se guardan
+    unas pocas páginas en una LRU.
+    """
+
+    ALTO_FILA = 36
+    MAX_MUESTRAS = 12
+    TAMANO_PAGINA = 100
+    MAX_PAGINAS = 20
+
+    def __init__(self, parent, almacen, al_elegir=None, fondo=FONDO_OSCURO):
+        self.almacen = almacen
+        self.al_elegir = al_elegir
+        self.tipo = tk.StringVar(value='historial')
+        self.total = 0
+        self.posicion = 0.0
+        self.filas = []
+        self._paginas = OrderedDict()
+
+        self.frame = ttk.Frame(parent)
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(1, weight=1)
+
+        selector = ttk.Frame(self.frame)
+        selector.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        for texto, valor in (("🕘 Historial", 'historial'), ("⭐ Favoritos", 'favorito')):
+            ttk.Radiobutton(selector, text=texto, value=valor, variable=self.tipo,
+                            command=self.refrescar).pack(side=tk.LEFT, padx=(0, 10))
+        self.total_label = ttk.Label(selector)
+        self.total_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        self.canvas = tk.Canvas(self.frame, bg=fondo, highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._desplazar)
+        self.scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+
+        self.canvas.bind('<Configure>', lambda e: self._dibujar())
+        self.canvas.bind('<MouseWheel>', self._rueda)
+        self.canvas.bind('<Button-4>', lambda e: self._mover(-3 * self.ALTO_FILA))
+        self.canvas.bind('<Button-5>', lambda e: self._mover(3 * self.ALTO_FILA))
+        self.canvas.bind('<Double-Button-1>', self._doble_click)
+
+    # ===== DATOS =====
+
+    def refrescar(self):
+        """Vuelve a contar y descarta las páginas leídas (p. ej. tras añadir paletas)"""
+        self._paginas.clear()
+        self.total = self.almacen.contar(self.tipo.get())
+        self.total_label.configure(text=f"{self.total} paletas")
+        self._mover(0)
+
+    def _paleta(self, indice):
+        pagina, resto = divmod(indice, self.TAMANO_PAGINA)
+        filas = self._paginas.get(pagina)
+        if filas is None:
+            filas = self.almacen.listar(self.tipo.get(), self.TAMANO_PAGINA,
+                                        pagina * self.TAMANO_PAGINA)
+            self._paginas[pagina] = filas
+            if len(self._paginas) > self.MAX_PAGINAS:
+                self._paginas.popitem(last=False)
+        else:
+            self._paginas.move_to_end(pagina)
+        return filas[resto][1] if resto < len(filas) else None
+
+    # ===== DESPLAZAMIENTO =====
+
+    def _alto_visible(self):
+        return max(self.canvas.winfo_height(), 1)
+
+    def _mover(self, delta_px):
+        maximo = max(self.total * self.ALTO_FILA - self._alto_visible(), 0)
+        self.posicion = min(max(self.posicion + delta_px, 0), maximo)
+        self._dibujar()
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la scrollbar: ``moveto fracción`` o ``scroll n units|pages``"""
+        if accion == 'moveto':
+            self._mover(float(cantidad) * self.total * self.ALTO_FILA - self.posicion)
+        elif unidad == 'pages':
+            self._mover(int(cantidad) * self._alto_visible())
+        else:
+            self._mover(int(cantidad) * self.ALTO_FILA)
+
+    def _rueda(self, evento):
+        self._mover(-evento.delta / 120 * 3 * self.ALTO_FILA)
+
+    def _doble_click(self, evento):
+        indice = int((self.posicion + evento.y) // self.ALTO_FILA)
+        if self.al_elegir and 0 <= indice < self.total:
+            paleta = self._paleta(indice)
+            if paleta:
+                self.al_elegir(paleta)
+
+    # ===== DIBUJO =====
+
+    def _fila(self, i):
+        while len(self.filas) <= i:
+            self.filas.append({
+                'fondo': self.canvas.create_rectangle(0, 0, 0, 0, outline='', state='hidden'),
+                'titulo': self.canvas.create_text(0, 0, anchor=tk.W, fill='white',
+                                                  font=('Arial', 10), state='hidden'),
+                'muestras': [self.canvas.create_rectangle(0, 0, 0, 0, outline='', state='hidden')
+                             for _ in range(self.MAX_MUESTRAS)],
+            })
+        return self.filas[i]
+
+    def _dibujar(self):
+        ancho = max(self.canvas.winfo_width(), 1)
+        alto = self._alto_visible()
+        primera = int(self.posicion // self.ALTO_FILA)
+        desfase = self.posicion - primera * self.ALTO_FILA
+        num_filas = alto // self.ALTO_FILA + 2
+
+        ancho_titulo = min(260, ancho // 3)
+        ancho_muestra = max((ancho - ancho_titulo - 20) / self.MAX_MUESTRAS, 4)
+
+        for i in range(max(num_filas, len(self.filas))):
+            fila = self._fila(i) if i < num_filas else self.filas[i]
+            indice = primera + i
+            paleta = self._paleta(indice) if i < num_filas and indice < self.total else None
+            if paleta is None:
+                for item in [fila['fondo'], fila['titulo']] + fila['muestras']:
+                    self.canvas.itemconfigure(item, state='hidden')
+                continue
+
+            y = i * self.ALTO_FILA - desfase
+            self.canvas.coords(fila['fondo'], 0, y, ancho, y + self.ALTO_FILA - 2)
+            self.canvas.itemconfigure(fila['fondo'], state='normal',
+                                      fill='#34495e' if indice % 2 else '#2c3e50')
+            self.canvas.coords(fila['titulo'], 8, y + self.ALTO_FILA / 2 - 1)
+            self.canvas.itemconfigure(fila['titulo'], state='normal',
+                                      text=f"{indice + 1}. {paleta.get('tema') or 'Sin tema'}"[:40])
+
+            colores = paleta.get('colores') or []
+            for j, muestra in enumerate(fila['muestras']):
+                if j >= len(colores):
+                    self.canvas.itemconfigure(muestra, state='hidden')
+                    continue
+                x = ancho_titulo + 10 + j * ancho_muestra
+                self.canvas.coords(muestra, x, y + 4, x + ancho_muestra - 2, y + self.ALTO_FILA - 6)
+                self.canvas.itemconfigure(muestra, state='normal', fill=colores[j]['hex'])
+
+        # La scrollbar refleja la fracción visible de la lista completa
+        total_px = max(self.total * self.ALTO_FILA, 1)
+        self.scrollbar.set(self.posicion / total_px, min((self.posicion + alto) / total_px, 1.0))